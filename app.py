@@ -1,239 +1,56 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
+from flask import Flask, Response, g, render_template, request, jsonify, session, redirect, url_for, flash, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
-import json
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from datetime import date, datetime, timedelta
+import asyncio
+import base64
+import csv
+import hashlib
+import hmac
+import io
+import math
 import os
-
-# OpenAI is optional. Guard the import to avoid runtime errors when the package
-# is missing or its API surface changes.
-try:
-    import openai  # type: ignore
-except Exception:  # pragma: no cover - best effort import guard
-    openai = None  # fall back to heuristic insights when not available
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import re
+import click
+from sqlalchemy import event, inspect, text
 
 from config import Config
-
-# Simple i18n dictionary (English, Hindi, Gujarati)
-TRANSLATIONS = {
-    'en': {
-        'app_name': 'AI Finance Assistant',
-        'welcome_title': 'Welcome - AI Finance Assistant',
-        'smart_analysis': 'Smart Analysis',
-        'smart_analysis_desc': 'AI analyzes your financial data to provide personalized insights and recommendations.',
-        'natural_conversations': 'Natural Conversations',
-        'natural_conversations_desc': 'Ask questions in plain English and get clear, actionable answers about your finances.',
-        'privacy_control': 'Privacy Control',
-        'privacy_control_desc': 'You control what data the AI can access. Grant or revoke permissions anytime.',
-        'login': 'Login',
-        'signup': 'Sign Up',
-        'dashboard': 'Dashboard',
-        'privacy': 'Privacy',
-        'logout': 'Logout',
-        'create_account': 'Create Account',
-        'username': 'Username',
-        'email': 'Email',
-        'password': 'Password',
-        'dont_have_account': "Don't have an account?",
-        'already_have_account': 'Already have an account?',
-        'signup_here': 'Sign up here',
-        'login_here': 'Login here',
-        'chat_with_ai': 'Chat with AI Assistant',
-        'ai_intro': "Hello! I'm your personal finance assistant. I can help you understand your financial situation, answer questions about your money, and provide insights. What would you like to know?",
-        'ask_placeholder': 'Ask me anything about your finances...',
-        'financial_overview': 'Financial Overview',
-        'total_assets': 'Total Assets',
-        'total_liabilities': 'Total Liabilities',
-        'credit_score': 'Credit Score',
-        'investments': 'Investments',
-        'data_access': 'Data Access',
-        'you_control_data': 'You control what data I can access:',
-        'manage_privacy': 'Manage Privacy',
-        'privacy_settings': 'Privacy Settings',
-        'privacy_settings_desc': 'Control what financial data the AI assistant can access and analyze.',
-        'assets': 'Assets',
-        'assets_desc': 'Cash, bank balances, property values',
-        'liabilities': 'Liabilities',
-        'liabilities_desc': 'Loans, credit card debt, mortgages',
-        'transactions': 'Transactions',
-        'transactions_desc': 'Income, expenses, transfers',
-        'epf_balance': 'EPF/Retirement Balance',
-        'epf_balance_desc': 'Retirement contributions and balances',
-        'credit_score_desc': 'Credit rating and score information',
-        'investments_desc': 'Stocks, mutual funds, bonds',
-        'net_worth_label': 'Net Worth',
-        'net_worth_formula': 'Total Assets - Total Liabilities',
-        'stocks': 'Stocks',
-        'mutual_funds': 'Mutual Funds',
-        'good': 'Good',
-        'clear_chat': 'Clear Chat',
-        'try_asking': 'Try asking:',
-        'note': 'Note:',
-        'privacy_note': "The AI assistant will only analyze data from categories you've granted access to. You can change these settings anytime, and the changes will take effect immediately.",
-        'back_to_dashboard': 'Back to Dashboard',
-        'save_settings': 'Save Settings',
-        'language': 'Language',
-        'english': 'English',
-        'hindi': 'Hindi',
-        'gujarati': 'Gujarati',
-        'invalid_credentials': 'Invalid username or password',
-        'username_exists': 'Username already exists',
-        'email_exists': 'Email already exists',
-        'privacy_updated': 'Privacy settings updated successfully!',
-        'theme': 'Theme',
-        'light': 'Light',
-        'dark': 'Dark',
-        'system_default': 'System Default'
-    },
-    'hi': {
-        'app_name': 'एआई वित्त सहायक',
-        'welcome_title': 'स्वागत है - एआई वित्त सहायक',
-        'smart_analysis': 'स्मार्ट विश्लेषण',
-        'smart_analysis_desc': 'एआई आपके वित्तीय डेटा का विश्लेषण करके व्यक्तिगत अंतर्दृष्टि और सिफारिशें देता है।',
-        'natural_conversations': 'स्वाभाविक बातचीत',
-        'natural_conversations_desc': 'साधारण हिंदी/अंग्रेज़ी में सवाल पूछें और स्पष्ट, उपयोगी जवाब पाएं।',
-        'privacy_control': 'गोपनीयता नियंत्रण',
-        'privacy_control_desc': 'आप नियंत्रित करते हैं कि एआई किस डेटा तक पहुँच सकता है।',
-        'login': 'लॉगिन',
-        'signup': 'साइन अप',
-        'dashboard': 'डैशबोर्ड',
-        'privacy': 'गोपनीयता',
-        'logout': 'लॉगआउट',
-        'create_account': 'खाता बनाएँ',
-        'username': 'उपयोगकर्ता नाम',
-        'email': 'ईमेल',
-        'password': 'पासवर्ड',
-        'dont_have_account': 'खाता नहीं है?',
-        'already_have_account': 'पहले से खाता है?',
-        'signup_here': 'यहाँ साइन अप करें',
-        'login_here': 'यहाँ लॉगिन करें',
-        'chat_with_ai': 'एआई सहायक से बात करें',
-        'ai_intro': 'नमस्ते! मैं आपका व्यक्तिगत वित्त सहायक हूँ। मैं आपकी वित्तीय स्थिति समझने, प्रश्नों के उत्तर देने और सुझाव देने में मदद कर सकता हूँ। आप क्या जानना चाहेंगे?',
-        'ask_placeholder': 'अपनी वित्तीय स्थिति के बारे में कुछ भी पूछें...',
-        'financial_overview': 'वित्तीय सारांश',
-        'total_assets': 'कुल संपत्तियाँ',
-        'total_liabilities': 'कुल देनदारियाँ',
-        'credit_score': 'क्रेडिट स्कोर',
-        'investments': 'निवेश',
-        'data_access': 'डेटा एक्सेस',
-        'you_control_data': 'आप नियंत्रित करते हैं कि मैं किस डेटा तक पहुँच सकता हूँ:',
-        'manage_privacy': 'गोपनीयता प्रबंधित करें',
-        'privacy_settings': 'गोपनीयता सेटिंग्स',
-        'privacy_settings_desc': 'नियंत्रित करें कि एआई सहायक किस वित्तीय डेटा तक पहुँच सकता है।',
-        'assets': 'संपत्तियाँ',
-        'assets_desc': 'नकद, बैंक बैलेंस, संपत्ति मूल्य',
-        'liabilities': 'देनदारियाँ',
-        'liabilities_desc': 'ऋण, क्रेडिट कार्ड कर्ज, बंधक',
-        'transactions': 'लेन-देन',
-        'transactions_desc': 'आय, खर्च, ट्रांसफर',
-        'epf_balance': 'ईपीएफ/सेवानिवृत्ति शेष',
-        'epf_balance_desc': 'सेवानिवृत्ति योगदान और शेष',
-        'credit_score_desc': 'क्रेडिट रेटिंग और स्कोर जानकारी',
-        'investments_desc': 'शेयर, म्यूचुअल फंड, बांड',
-        'net_worth_label': 'कुल संपत्ति (नेट वर्थ)',
-        'net_worth_formula': 'कुल संपत्तियाँ - कुल देनदारियाँ',
-        'stocks': 'शेयर',
-        'mutual_funds': 'म्यूचुअल फंड',
-        'good': 'अच्छा',
-        'clear_chat': 'चैट साफ़ करें',
-        'try_asking': 'कोशिश करें:',
-        'note': 'नोट:',
-        'privacy_note': 'एआई केवल उन्हीं श्रेणियों का डेटा विश्लेषित करेगा जिनकी आपने अनुमति दी है। आप कभी भी ये सेटिंग्स बदल सकते हैं और बदलाव तुरंत लागू होंगे।',
-        'back_to_dashboard': 'डैशबोर्ड पर वापस',
-        'save_settings': 'सेटिंग्स सहेजें',
-        'language': 'भाषा',
-        'english': 'अंग्रेज़ी',
-        'hindi': 'हिंदी',
-        'gujarati': 'गुजराती',
-        'invalid_credentials': 'अमान्य उपयोगकर्ता नाम या पासवर्ड',
-        'username_exists': 'उपयोगकर्ता नाम पहले से मौजूद है',
-        'email_exists': 'ईमेल पहले से मौजूद है',
-        'privacy_updated': 'गोपनीयता सेटिंग्स सफलतापूर्वक अपडेट की गईं!',
-        'theme': 'थीम',
-        'light': 'लाइट',
-        'dark': 'डार्क',
-        'system_default': 'सिस्टम डिफॉल्ट'
-    },
-    'gu': {
-        'app_name': 'એઆઈ ફાઇનાન્સ સહાયક',
-        'welcome_title': 'સ્વાગત છે - એઆઈ ફાઇનાન્સ સહાયક',
-        'smart_analysis': 'સ્માર્ટ વિશ્લેષણ',
-        'smart_analysis_desc': 'એઆઈ તમારા નાણાકીય ડેટાનું વિશ્લેષણ કરીને વ્યક્તિગત સૂચનો આપે છે.',
-        'natural_conversations': 'સ્વાભાવિક વાતચીત',
-        'natural_conversations_desc': 'સરળ ગુજરાતી/અંગ્રેજીમાં પૂછો અને સ્પષ્ટ, ઉપયોગી જવાબ મેળવો.',
-        'privacy_control': 'ગોપનીયતા નિયંત્રણ',
-        'privacy_control_desc': 'તમે નિયંત્રિત કરો છો કે એઆઈ કયા ડેટા સુધી પહોંચે.',
-        'login': 'લૉગિન',
-        'signup': 'સાઇન અપ',
-        'dashboard': 'ડેશબોર્ડ',
-        'privacy': 'ગોપનીયતા',
-        'logout': 'લૉગઆઉટ',
-        'create_account': 'ખાતું બનાવો',
-        'username': 'વપરાશકર્તા નામ',
-        'email': 'ઇમેઇલ',
-        'password': 'પાસવર્ડ',
-        'dont_have_account': 'ખાતું નથી?',
-        'already_have_account': 'પહેલેથી ખાતું છે?',
-        'signup_here': 'અહીં સાઇન અપ કરો',
-        'login_here': 'અહીં લૉગિન કરો',
-        'chat_with_ai': 'એઆઈ સહાયક સાથે વાત કરો',
-        'ai_intro': 'નમસ્તે! હું તમારો વ્યક્તિગત નાણાકીય સહાયક છું. હું તમારી નાણાકીય સ્થિતિ સમજવામાં, પ્રશ્નોના જવાબમાં અને સૂચનો આપવા મદદ કરી શકું છું. તમે શું જાણવા ઈચ્છો છો?',
-        'ask_placeholder': 'તમારા નાણાં વિશે કંઈપણ પૂછો...',
-        'financial_overview': 'નાણાકીય સમીક્ષા',
-        'total_assets': 'કુલ સંપત્તિ',
-        'total_liabilities': 'કુલ બાકીદારી',
-        'credit_score': 'ક્રેડિટ સ્કોર',
-        'investments': 'નિવેશ',
-        'data_access': 'ડેટા ઍક્સેસ',
-        'you_control_data': 'તમે નિયંત્રિત કરો છો કે હું કયા ડેટા સુધી પહોંચી શકું:',
-        'manage_privacy': 'ગોપનીયતા મેનેજ કરો',
-        'privacy_settings': 'ગોપનીયતા સેટિંગ્સ',
-        'privacy_settings_desc': 'એઆઈ સહાયક કયા નાણાકીય ડેટા સુધી પહોંચી શકે તે નિયંત્રિત કરો.',
-        'assets': 'સંપત્તિ',
-        'assets_desc': 'નકદ, બેંક બેલેન્સ, મિલકત મૂલ્ય',
-        'liabilities': 'બાકીદારી',
-        'liabilities_desc': 'લોન, ક્રેડિટ કાર્ડ દેવું, મોર્ગેજ',
-        'transactions': 'લેણદેણ',
-        'transactions_desc': 'આવક, ખર્ચ, લેવડદેવડ',
-        'epf_balance': 'EPF/નિવૃત્તિ બેલેન્સ',
-        'epf_balance_desc': 'નિવૃત્તિ યોગદાન અને બેલેન્સ',
-        'credit_score_desc': 'ક્રેડિટ રેટિંગ અને સ્કોર માહિતી',
-        'investments_desc': 'શેર, મ્યુચ્યુઅલ ફંડ, બોન્ડ',
-        'net_worth_label': 'નેટ વર્થ',
-        'net_worth_formula': 'કુલ સંપત્તિ - કુલ બાકીદારી',
-        'stocks': 'શેર',
-        'mutual_funds': 'મ્યુચ્યુઅલ ફંડ',
-        'good': 'સારો',
-        'clear_chat': 'ચેટ સાફ કરો',
-        'try_asking': 'પ્રયાસ કરો:',
-        'note': 'નોંધ:',
-        'privacy_note': 'એઆઈ ફક્ત તે જ કેટેગરીઝનું ડેટા વિશ્લેષિત કરશે જેને તમે મંજૂરી આપી છે. તમે ક્યારેય આ સેટિંગ્સ બદલી શકો છો અને બદલાવ તરત લાગૂ થશે.',
-        'back_to_dashboard': 'ડેશબોર્ડ પર પાછા જાઓ',
-        'save_settings': 'સેટિંગ્સ સેવ કરો',
-        'language': 'ભાષા',
-        'english': 'અંગ્રેજી',
-        'hindi': 'હિન્દી',
-        'gujarati': 'ગુજરાતી',
-        'invalid_credentials': 'અમાન્ય વપરાશકર્તા નામ અથવા પાસવર્ડ',
-        'username_exists': 'વપરાશકર્તા નામ પહેલેથી જ હાજર છે',
-        'email_exists': 'ઇમેઇલ પહેલેથી જ હાજર છે',
-        'privacy_updated': 'ગોપનીયતા સેટિંગ્સ સફળતાપૂર્વક અપડેટ થઈ!',
-        'theme': 'થીમ',
-        'light': 'લાઇટ',
-        'dark': 'ડાર્ક',
-        'system_default': 'સિસ્ટમ ડિફોલ્ટ'
-    }
-}
+from caching import LRUCache, SingleFlight, SnapshotCache, StreamFlights
+from txn_engine import TransactionColumns
+from importers import ImportFormatError, PARSERS, batched, detect_format
+from intent_engine import IntentMatcher
+from fallback_templates import render, template
+from i18n import Catalogs
+from fast_path import GreetingMatcher, HitCounter, LookupMatcher
+import datagen
+import jsoncodec
+import prompt_builder
+import snapshot_format
+from llm_client import CircuitBreaker, LLMClient, LLMError
 
 def get_locale():
-    lang = session.get('lang')
+    return request_catalog().lang
+
+def request_catalog():
+    """Translation catalog of the current request, resolved once per request."""
+    catalog = g.get('catalog')
+    if catalog is None:
+        catalog = g.catalog = catalogs.get(session_locale(session))
+    return catalog
+
+def session_locale(session_data):
+    lang = session_data.get('lang')
     if lang in app.config.get('LANGUAGES', ['en']):
         return lang
     return 'en'
 
 def t(key):
-    return TRANSLATIONS.get(get_locale(), TRANSLATIONS['en']).get(key, TRANSLATIONS['en'].get(key, key))
+    return request_catalog().gettext(key)
 
 # Language names for prompts
 LANGUAGE_NAMES = {
@@ -242,125 +59,27 @@ LANGUAGE_NAMES = {
     'gu': 'Gujarati'
 }
 
-# Greeting tokens and localized replies for instant responses
+# Greeting tokens for instant responses
 GREETING_TOKENS = {
     'en': ['hi', 'hello', 'hey', 'good morning', 'good afternoon', 'good evening'],
     'hi': ['नमस्ते', 'हाय', 'हेलो', 'नमस्कार', 'सुप्रभात', 'शुभ संध्या', 'शुभ दोपहर'],
     'gu': ['નમસ્તે', 'હેલો', 'હાય', 'સુપ્રભાત', 'શુભ સાંજ', 'શુભ બપોર']
 }
 
-GREETING_RESPONSES = {
-    'en': ['Hi there! 👋 How can I help you today?', 'Hello! 😊', 'Hey! How can I help you today?'],
-    'hi': ['नमस्ते! 👋 आज मैं आपकी कैसे मदद कर सकता हूँ?', 'हेलो! 😊', 'हाय! मैं आपकी कैसे मदद कर सकता हूँ?'],
-    'gu': ['નમસ્તે! 👋 આજે હું તમારી કેવી રીતે મદદ કરી શકું?', 'હેલો! 😊', 'હાય! હું કેવી રીતે મદદ કરી શકું?']
+# Words a greeting may contain besides the greeting itself
+GREETING_FILLERS = {
+    'en': ['there', 'all', 'everyone', 'team', 'friend', 'sir', 'madam', 'assistant', 'again', 'and',
+           'how', 'are', 'you', 'doing', 'very'],
+    'hi': ['जी', 'सर', 'आप', 'कैसे', 'कैसी', 'हैं', 'हो', 'और'],
+    'gu': ['જી', 'સર', 'તમે', 'કેમ', 'છો', 'અને']
 }
 
+# Compiled once; greetings as whole words
+GREETING_MATCHER = GreetingMatcher(GREETING_TOKENS, GREETING_FILLERS)
+
 def is_greeting(text_lower: str, lang: str) -> bool:
-    tokens = GREETING_TOKENS.get(lang, []) + GREETING_TOKENS.get('en', [])
-    return any(tok in text_lower for tok in tokens)
-
-# AI fallback message templates
-AI_MSG = {
-    'en': {
-        'info_na': 'The requested information is not available in your financial data.',
-        'assets_total': 'Your total assets are ${:,}.',
-        'cash': 'Your cash is ${:,}.',
-        'bank': 'Your bank balance is ${:,}.',
-        'property': 'Your property value is ${:,}.',
-        'assets_list': 'Assets: Cash ${cash:,}, Bank ${bank:,}, Property ${property:,}, Total ${total:,}.',
-        'liab_total': 'Your total liabilities are ${:,}.',
-        'liab_cc': 'Your credit card debt is ${:,}.',
-        'liab_pl': 'Your personal loan is ${:,}.',
-        'liab_mortgage': 'Your mortgage is ${:,}.',
-        'liab_list': 'Liabilities: Credit Card ${cc:,}, Personal Loan ${pl:,}, Mortgage ${mortgage:,}, Total ${total:,}.',
-        'credit_score': 'Your credit score is {score} ({rating}).',
-        'epf_total': 'Your EPF total balance is ${:,}.',
-        'epf_contrib': 'Employee contribution: ${emp:,}, Employer contribution: ${er:,}.',
-        'epf_balance': 'Your EPF balance is ${:,}.',
-        'invest_total': 'Your total investment value is ${:,}.',
-        'invest_gl': 'Your investment gain/loss is ${:,}.',
-        'tx_exp_total': 'Your total expenses are ${:,}.',
-        'tx_inc_total': 'Your total income is ${:,}.',
-        'tx_summary': 'Your total income is ${income:,} and total expenses are ${expenses:,}.',
-        'net_worth': 'Your net worth is ${:,}.',
-        'budget_income': 'Your monthly income is ${:,}.',
-        'budget_exp': 'Your monthly expenses are ${:,}.',
-        'budget_summary': 'Monthly income: ${income:,}, Monthly expenses: ${expenses:,}.',
-        'vacation_title': 'Vacation affordability summary:',
-        'vacation_yes': 'Yes, you can afford a vacation next month.',
-        'vacation_liquid': 'Liquid Funds: ${:,}.',
-        'vacation_surplus': 'Monthly Surplus: ${:,}.',
-        'vacation_safe': 'Safe Budget: ${:,}.',
-        'vacation_comfy': 'Comfortable Budget: ${:,}.',
-        'vacation_lux': 'Luxury Budget: ${:,}.'
-    },
-    'hi': {
-        'info_na': 'अनुरोधित जानकारी आपके वित्तीय डेटा में उपलब्ध नहीं है।',
-        'assets_total': 'आपकी कुल संपत्तियाँ ${:,} हैं।',
-        'cash': 'आपके पास नकद ${:,} है।',
-        'bank': 'आपका बैंक बैलेंस ${:,} है।',
-        'property': 'आपकी संपत्ति का मूल्य ${:,} है।',
-        'assets_list': 'संपत्तियाँ: नकद ${cash:,}, बैंक ${bank:,}, संपत्ति ${property:,}, कुल ${total:,}।',
-        'liab_total': 'आपकी कुल देनदारियाँ ${:,} हैं।',
-        'liab_cc': 'आपका क्रेडिट कार्ड कर्ज ${:,} है।',
-        'liab_pl': 'आपका व्यक्तिगत ऋण ${:,} है।',
-        'liab_mortgage': 'आपका मॉर्गेज ${:,} है।',
-        'liab_list': 'देनदारियाँ: क्रेडिट कार्ड ${cc:,}, व्यक्तिगत ऋण ${pl:,}, मॉर्गेज ${mortgage:,}, कुल ${total:,}।',
-        'credit_score': 'आपका क्रेडिट स्कोर {score} ({rating}) है।',
-        'epf_total': 'आपका EPF कुल शेष ${:,} है।',
-        'epf_contrib': 'कर्मचारी अंशदान: ${emp:,}, नियोक्ता अंशदान: ${er:,}।',
-        'epf_balance': 'आपका EPF बैलेंस ${:,} है।',
-        'invest_total': 'आपका कुल निवेश मूल्य ${:,} है।',
-        'invest_gl': 'आपका निवेश लाभ/हानि ${:,} है।',
-        'tx_exp_total': 'आपका कुल खर्च ${:,} है।',
-        'tx_inc_total': 'आपकी कुल आय ${:,} है।',
-        'tx_summary': 'आपकी कुल आय ${income:,} और कुल खर्च ${expenses:,} है।',
-        'net_worth': 'आपकी कुल संपत्ति (नेट वर्थ) ${:,} है।',
-        'budget_income': 'आपकी मासिक आय ${:,} है।',
-        'budget_exp': 'आपका मासिक खर्च ${:,} है।',
-        'budget_summary': 'मासिक आय: ${income:,}, मासिक खर्च: ${expenses:,}।',
-        'vacation_title': 'छुट्टी वहन क्षमता सारांश:',
-        'vacation_yes': 'हाँ, आप अगले महीने छुट्टी पर जा सकते हैं।',
-        'vacation_liquid': 'लिक्विड फंड: ${:,}।',
-        'vacation_surplus': 'मासिक अधिशेष: ${:,}।',
-        'vacation_safe': 'सुरक्षित बजट: ${:,}।',
-        'vacation_comfy': 'आरामदायक बजट: ${:,}।',
-        'vacation_lux': 'लक्ज़री बजट: ${:,}।'
-    },
-    'gu': {
-        'info_na': 'વિનંતી કરેલી માહિતી તમારા નાણાકીય ડેટામાં ઉપલબ્ધ નથી.',
-        'assets_total': 'તમારી કુલ સંપત્તિ ${:,} છે.',
-        'cash': 'તમારી પાસે રોકડ ${:,} છે.',
-        'bank': 'તમારો બેંક બેલેન્સ ${:,} છે.',
-        'property': 'તમારી મિલકતનું મૂલ્ય ${:,} છે.',
-        'assets_list': 'સંપત્તિ: રોકડ ${cash:,}, બેંક ${bank:,}, મિલકત ${property:,}, કુલ ${total:,}.',
-        'liab_total': 'તમારી કુલ બાકીદારી ${:,} છે.',
-        'liab_cc': 'તમારું ક્રેડિટ કાર્ડ દેવું ${:,} છે.',
-        'liab_pl': 'તમારું પર્સનલ લોન ${:,} છે.',
-        'liab_mortgage': 'તમારો મોર્ગેજ ${:,} છે.',
-        'liab_list': 'બાકીદારી: ક્રેડિટ કાર્ડ ${cc:,}, પર્સનલ લોન ${pl:,}, મોર્ગેજ ${mortgage:,}, કુલ ${total:,}.',
-        'credit_score': 'તમારો ક્રેડિટ સ્કોર {score} ({rating}) છે.',
-        'epf_total': 'તમારો EPF કુલ બેલેન્સ ${:,} છે.',
-        'epf_contrib': 'કર્મચારી યોગદાન: ${emp:,}, નિયામક યોગદાન: ${er:,}.',
-        'epf_balance': 'તમારો EPF બેલેન્સ ${:,} છે.',
-        'invest_total': 'તમારું કુલ રોકાણ મૂલ્ય ${:,} છે.',
-        'invest_gl': 'તમારો રોકાણ નફો/નુકસાન ${:,} છે.',
-        'tx_exp_total': 'તમારો કુલ ખર્ચ ${:,} છે.',
-        'tx_inc_total': 'તમારી કુલ આવક ${:,} છે.',
-        'tx_summary': 'તમારી કુલ આવક ${income:,} અને કુલ ખર્ચ ${expenses:,} છે.',
-        'net_worth': 'તમારું નેટ વર્થ ${:,} છે.',
-        'budget_income': 'તમારી માસિક આવક ${:,} છે.',
-        'budget_exp': 'તમારો માસિક ખર્ચ ${:,} છે.',
-        'budget_summary': 'માસિક આવક: ${income:,}, માસિક ખર્ચ: ${expenses:,}.',
-        'vacation_title': 'રજાની ક્ષમતા સારાંશ:',
-        'vacation_yes': 'હા, તમે આવતા મહિને રજા પર જઈ શકો છો.',
-        'vacation_liquid': 'લિક્વિડ ફંડ: ${:,}.',
-        'vacation_surplus': 'માસિક વધારાની રકમ: ${:,}.',
-        'vacation_safe': 'સેફ બજેટ: ${:,}.',
-        'vacation_comfy': 'કંફર્ટેબલ બજેટ: ${:,}.',
-        'vacation_lux': 'લક્ઝરી બજેટ: ${:,}.'
-    }
-}
+    """A greeting in the user's language or English, with nothing but filler words besides."""
+    return GREETING_MATCHER.match(text_lower, (lang, 'en'))
 
 # Localized keyword tokens for simple intent detection in fallback mode
 KEYWORDS = {
@@ -390,12 +109,12 @@ KEYWORDS = {
         'gu': ['નિવેશ', 'પોર્ટફોલિયો', 'શેર', 'મ્યુચ્યુઅલ ફંડ']
     },
     'transactions': {
-        'en': ['transaction', 'spend', 'expense', 'income'],
+        'en': ['transaction', 'spend', 'overspend', 'expense', 'income'],
         'hi': ['लेन-देन', 'खर्च', 'व्यय', 'आय'],
         'gu': ['વ્યવહાર', 'ખર્ચ', 'આવક']
     },
     'net_worth': {
-        'en': ['net worth', 'worth'],
+        'en': ['net worth', 'networth', 'worth'],
         'hi': ['नेट वर्थ', 'शुद्ध संपत्ति'],
         'gu': ['નેટ વર્થ']
     },
@@ -430,12 +149,59 @@ KEYWORDS = {
         'gu': ['આવક']
     },
     'expense': {
-        'en': ['expense', 'spend'],
+        'en': ['expense', 'spend', 'overspend'],
         'hi': ['खर्च', 'व्यय'],
         'gu': ['ખર્ચ']
     }
 }
 
+# English terms the fallback router checks besides the KEYWORDS intents
+ROUTER_TERMS = {
+    'analysis': {'en': ['insight', 'analyze', 'predict']},
+    'payoff': {'en': ['loan', 'pay', 'prepay', 'repay', 'faster']},
+    'credit_card': {'en': ['credit card']},
+    'personal_loan': {'en': ['personal loan']},
+    'mortgage': {'en': ['mortgage']},
+    'contribution': {'en': ['contribution']},
+    'gain_loss': {'en': ['gain', 'loss']},
+    'trend': {'en': ['increase', 'quarter']},
+    'vacation': {'en': ['vacation', 'holiday', 'travel', 'trip']}
+}
+
+# Compiled once; classifies a query in a single pass
+INTENT_MATCHER = IntentMatcher({**KEYWORDS, **ROUTER_TERMS})
+
+# Figures the fast path reads straight from the snapshot, by the phrases that ask for them
+LOOKUP_PHRASES = {
+    'credit_score': {
+        'en': ['credit score', 'cibil score'],
+        'hi': ['क्रेडिट स्कोर', 'सिबिल स्कोर'],
+        'gu': ['ક્રેડિટ સ્કોર', 'સિબિલ સ્કોર']
+    },
+    'total_assets': {
+        'en': ['total assets', 'total asset'],
+        'hi': ['कुल संपत्ति', 'कुल संपत्तियाँ', 'कुल एसेट्स'],
+        'gu': ['કુલ સંપત્તિ', 'કુલ સંપત્તિઓ', 'કુલ એસેટ્સ']
+    },
+    'net_worth': {
+        'en': ['net worth', 'networth'],
+        'hi': ['नेट वर्थ', 'शुद्ध संपत्ति'],
+        'gu': ['નેટ વર્થ', 'ચોખ્ખી સંપત્તિ']
+    }
+}
+
+# Words a lookup question may contain besides the phrase
+LOOKUP_FILLERS = {
+    'en': ['what', 'whats', 's', 'is', 'are', 'my', 'me', 'the', 'current', 'currently', 'now', 'today',
+           'tell', 'show', 'give', 'please', 'how', 'much', 'can', 'you', 'i', 'know', 'check'],
+    'hi': ['मेरा', 'मेरी', 'मेरे', 'क्या', 'है', 'हैं', 'कितना', 'कितनी', 'कितने', 'मुझे', 'बताओ', 'बताइए',
+           'बताएं', 'दिखाओ', 'अभी', 'कृपया', 'का', 'की', 'के'],
+    'gu': ['મારો', 'મારી', 'મારું', 'મારા', 'શું', 'છે', 'કેટલો', 'કેટલી', 'કેટલું', 'મને', 'કહો', 'બતાવો',
+           'હવે', 'કૃપા', 'કરીને', 'નો', 'ની', 'નું']
+}
+
+LOOKUP_MATCHER = LookupMatcher(LOOKUP_PHRASES, LOOKUP_FILLERS)
+
 def detect_language_from_query(query: str) -> str:
     for ch in query:
         code = ord(ch)
@@ -445,10 +211,21 @@ def detect_language_from_query(query: str) -> str:
             return 'gu'
     return get_locale()
 
-def contains_any(text: str, tokens: list[str]) -> bool:
-    return any(tok in text for tok in tokens)
+class CodecJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by jsoncodec (jsonify, request.json, session cookie)."""
+
+    def dumps(self, obj, **kwargs):
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return jsoncodec.dumps(obj, default=kwargs['default'], indent=bool(kwargs.get('indent')),
+                               sort_keys=kwargs['sort_keys'])
+
+    def loads(self, s, **kwargs):
+        return jsoncodec.loads(s)
 
 app = Flask(__name__)
+app.json_provider_class = CodecJSONProvider
+app.json = CodecJSONProvider(app)
 app.config.from_object(Config)
 
 # Initialize extensions
@@ -457,19 +234,62 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
-# OpenAI configuration (only if the SDK is available)
-if openai is not None:
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the configured storage profile (Config.SQLITE_PRAGMAS) to a new connection."""
+    cursor = dbapi_connection.cursor()
     try:
-        openai.api_key = app.config['OPENAI_API_KEY']
-    except Exception:
-        pass
+        for name, value in app.config.get('SQLITE_PRAGMAS', {}).items():
+            if re.fullmatch(r'\w+', name) and re.fullmatch(r'-?\w+', str(value)):
+                cursor.execute(f"PRAGMA {name}={value}")
+            else:
+                app.logger.warning(f"Ignoring invalid SQLite pragma {name}={value!r}")
+    finally:
+        cursor.close()
+
+with app.app_context():
+    if db.engine.dialect.name == 'sqlite':
+        event.listen(db.engine, 'connect', apply_sqlite_pragmas)
+
+# Decoded financial data per user, shared by all routes of this worker
+snapshot_cache = SnapshotCache(app.config.get('SNAPSHOT_CACHE_SIZE', 1024))
+# Threads that run database work for the async chat server
+db_executor = ThreadPoolExecutor(max_workers=app.config.get('ASYNC_DB_WORKERS', 8), thread_name_prefix='async-db')
+# Assistant answers keyed by question, language, visible data and recent context
+response_cache = LRUCache(app.config.get('RESPONSE_CACHE_SIZE', 4096), app.config.get('RESPONSE_CACHE_TTL', 600))
+# Answers being computed, so identical concurrent questions share one call
+insight_flights = SingleFlight()
+# Answers and chat turns being streamed, followed by overlapping identical requests
+stream_flights = StreamFlights()
+# Finished chat turns keyed by (user id, Idempotency-Key) for retried requests
+idempotency_cache = LRUCache(app.config.get('IDEMPOTENCY_CACHE_SIZE', 4096), app.config.get('IDEMPOTENCY_TTL', 3600))
+# Prompt fact lines keyed by snapshot version and visible categories
+prompt_facts_cache = LRUCache(app.config.get('SNAPSHOT_CACHE_SIZE', 1024))
+# Questions answered by the fast path, and those passed on to the full pipeline
+fast_path_stats = HitCounter()
+# UI and assistant strings, read from disk the first time each language is used
+catalogs = Catalogs(app.config.get('LOCALE_DIR', 'locales'), app.config.get('LANGUAGES', ['en']))
+
+# This worker's connection to the chat completions API
+llm_client = LLMClient(
+    'stub' if app.config.get('LLM_BACKEND') == 'stub' else app.config['OPENAI_API_KEY'],
+    api_base=app.config.get('LLM_API_BASE', 'https://api.openai.com/v1'),
+    model=app.config.get('LLM_MODEL', 'gpt-3.5-turbo'),
+    timeout=app.config.get('LLM_TIMEOUT', 8),
+    max_retries=app.config.get('LLM_MAX_RETRIES', 2),
+    backoff_base=app.config.get('LLM_BACKOFF_BASE', 0.25),
+    backoff_max=app.config.get('LLM_BACKOFF_MAX', 4.0),
+    pool_size=app.config.get('LLM_POOL_SIZE', 10),
+    deadline=app.config.get('LLM_DEADLINE', 12),
+    breaker=CircuitBreaker(app.config.get('LLM_BREAKER_THRESHOLD', 3), app.config.get('LLM_BREAKER_COOLDOWN', 30))
+)
 
 # Make translation helper available in templates
 @app.context_processor
 def inject_globals():
+    catalog = request_catalog()
     return {
-        't': t,
-        'current_lang': get_locale(),
+        't': catalog.gettext,
+        'current_lang': catalog.lang,
         'available_languages': app.config.get('LANGUAGES', ['en']),
         'current_theme': session.get('theme', 'system')  # 'system' | 'light' | 'dark'
     }
@@ -496,17 +316,682 @@ def load_user(user_id):
 
 # Financial data models
 class FinancialData(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'data_type', name='uq_financial_data_user_type'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     data_type = db.Column(db.String(50), nullable=False)  # assets, liabilities, transactions, etc.
     data = db.Column(db.Text, nullable=False)  # JSON data
+    version = db.Column(db.Integer, nullable=False, default=1)  # bumped on every rewrite
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Transaction(db.Model):
+    __table_args__ = (
+        db.Index('ix_transaction_user_date', 'user_id', 'date'),
+        db.Index('ix_transaction_user_category', 'user_id', 'category'),
+        db.Index('ix_transaction_user_hash', 'user_id', 'content_hash', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    type = db.Column(db.String(20), nullable=False)  # income, expense
+    amount = db.Column(db.Float, nullable=False, default=0)
+    description = db.Column(db.String(255), nullable=False, default='')
+    category = db.Column(db.String(50), nullable=False, default='other')
+    content_hash = db.Column(db.String(40))  # set for imported statement rows
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class MonthlyRollup(db.Model):
+    """Income and expense totals per user, month, type and category.
+
+    Maintained incrementally by add_transactions() and update_transaction()
+    so monthly figures never require scanning the transactions themselves.
+    """
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'month', 'type', 'category', name='uq_monthly_rollup_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    month = db.Column(db.String(7), nullable=False)  # YYYY-MM
+    type = db.Column(db.String(20), nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    total = db.Column(db.Float, nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class DataVersion(db.Model):
+    """Version of a user's financial data, one row per user.
+
+    Bumped by bump_data_version() in the same transaction as every write to
+    the user's FinancialData, Transaction or MonthlyRollup rows, so checking
+    a cached snapshot is a single primary key lookup.
+    """
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+def upgrade_schema(engine=None):
+    """Bring tables created by older versions of the app up to the current models.
+
+    db.create_all() only creates missing tables, so databases such as the
+    shipped finance_assistant.db keep their old columns. Every step checks
+    the live schema first, so running this on each start is safe.
+    """
+    engine = engine or db.engine
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    datetime_type = db.DateTime().compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        if 'financial_data' in tables:
+            columns = {column['name'] for column in inspector.get_columns('financial_data')}
+            if 'version' not in columns:
+                conn.execute(text("ALTER TABLE financial_data ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+            if 'updated_at' not in columns:
+                conn.execute(text(f"ALTER TABLE financial_data ADD COLUMN updated_at {datetime_type}"))
+                conn.execute(text("UPDATE financial_data SET updated_at = created_at"))
+            unique = {index['name'] for index in inspector.get_indexes('financial_data')}
+            unique |= {constraint['name'] for constraint in inspector.get_unique_constraints('financial_data')}
+            if 'uq_financial_data_user_type' not in unique:
+                # Older versions could store a category twice; the newest row is the one that was read
+                conn.execute(text("DELETE FROM financial_data WHERE id NOT IN "
+                                  "(SELECT MAX(id) FROM financial_data GROUP BY user_id, data_type)"))
+                conn.execute(text("CREATE UNIQUE INDEX uq_financial_data_user_type "
+                                  "ON financial_data (user_id, data_type)"))
+        if 'transaction' in tables:
+            columns = {column['name'] for column in inspector.get_columns('transaction')}
+            if 'content_hash' not in columns:
+                conn.execute(text('ALTER TABLE "transaction" ADD COLUMN content_hash VARCHAR(40)'))
+            if 'updated_at' not in columns:
+                conn.execute(text(f'ALTER TABLE "transaction" ADD COLUMN updated_at {datetime_type}'))
+                conn.execute(text('UPDATE "transaction" SET updated_at = created_at'))
+            if 'ix_transaction_user_hash' not in {index['name'] for index in inspector.get_indexes('transaction')}:
+                conn.execute(text('CREATE UNIQUE INDEX ix_transaction_user_hash '
+                                  'ON "transaction" (user_id, content_hash)'))
+        if 'user' in tables and 'data_version' not in tables:
+            # Existing users start at a fresh version, so no old snapshot file matches it
+            DataVersion.__table__.create(conn)
+            conn.execute(text('INSERT INTO data_version (user_id, version, updated_at) '
+                              'SELECT id, 1, :now FROM "user"'), {'now': datetime.utcnow()})
+
+def upsert_statement(model):
+    """INSERT supporting ON CONFLICT for the current database, if it has one."""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(model)
+
+def bump_data_version(user_id):
+    """Move a user's data version on, in the current transaction (caller commits)."""
+    now = datetime.utcnow()
+    stmt = upsert_statement(DataVersion)
+    if stmt is not None:
+        stmt = stmt.values(user_id=user_id, version=1, updated_at=now).on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={'version': DataVersion.version + 1, 'updated_at': now}
+        )
+        db.session.execute(stmt)
+        return
+    current = db.session.get(DataVersion, user_id)
+    if current is None:
+        db.session.add(DataVersion(user_id=user_id, version=1, updated_at=now))
+    else:
+        current.version += 1
+        current.updated_at = now
+
+def upsert_financial_data(user_id, items):
+    """Insert or replace several data categories of a user in one statement.
+
+    ``items`` maps data_type to its JSON-serializable payload. Existing rows
+    keep their id and get their version bumped, so re-seeding never creates
+    duplicates. Returns the number of categories written.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {'user_id': user_id, 'data_type': data_type, 'data': jsoncodec.dumps(payload),
+         'version': 1, 'created_at': now, 'updated_at': now}
+        for data_type, payload in items.items()
+    ]
+    if not rows:
+        return 0
+    stmt = upsert_statement(FinancialData)
+    if stmt is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'data_type'],
+            set_={
+                'data': stmt.excluded.data,
+                'version': FinancialData.version + 1,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.session.execute(stmt, rows)
+    else:
+        existing = {
+            row.data_type: row
+            for row in FinancialData.query.filter(
+                FinancialData.user_id == user_id,
+                FinancialData.data_type.in_(list(items))
+            )
+        }
+        for row in rows:
+            current = existing.get(row['data_type'])
+            if current is None:
+                db.session.add(FinancialData(**row))
+            else:
+                current.data = row['data']
+                current.version = current.version + 1
+                current.updated_at = now
+    bump_data_version(user_id)
+    return len(rows)
+
+# Transaction storage and aggregation
+def _whole(value):
+    """Return floats coming back from SQL as ints when whole, else rounded to cents."""
+    if isinstance(value, float):
+        value = round(value, 2)
+        if value.is_integer():
+            return int(value)
+    return value
+
+def parse_transaction_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+def transaction_to_row(user_id, transaction):
+    """Map a transaction dict (mock_data.json schema) to Transaction columns."""
+    return {
+        'user_id': user_id,
+        'date': parse_transaction_date(transaction['date']),
+        'type': transaction.get('type', 'expense'),
+        'amount': transaction.get('amount', 0),
+        'description': transaction.get('description', ''),
+        'category': transaction.get('category', 'other'),
+        'content_hash': transaction.get('content_hash')
+    }
+
+def _add_rollup_delta(deltas, row, sign=1):
+    key = (row['date'].strftime('%Y-%m'), row['type'], row['category'])
+    delta = deltas.setdefault(key, [0, 0])
+    delta[0] += sign * (row['amount'] or 0)
+    delta[1] += sign
+
+def apply_rollup_deltas(user_id, deltas):
+    """Add {(month, type, category): [amount, count]} deltas to a user's rollups."""
+    rows = [
+        {'user_id': user_id, 'month': month, 'type': ttype, 'category': category,
+         'total': total, 'count': count}
+        for (month, ttype, category), (total, count) in deltas.items()
+        if total or count
+    ]
+    if not rows:
+        return
+    stmt = upsert_statement(MonthlyRollup)
+    if stmt is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'month', 'type', 'category'],
+            set_={
+                'total': MonthlyRollup.total + stmt.excluded.total,
+                'count': MonthlyRollup.count + stmt.excluded.count
+            }
+        )
+        db.session.execute(stmt, rows)
+        return
+    for row in rows:
+        current = MonthlyRollup.query.filter_by(
+            user_id=user_id, month=row['month'], type=row['type'], category=row['category']
+        ).first()
+        if current is None:
+            db.session.add(MonthlyRollup(**row))
+        else:
+            current.total += row['total']
+            current.count += row['count']
+
+def take_legacy_transactions(user_id):
+    """Remove a user's legacy JSON transaction list, returning it as Transaction rows.
+
+    Users created before the Transaction table kept their transactions in
+    a 'transactions' FinancialData row, which load_financial_snapshot only
+    reads while they have no Transaction rows. Returns None if the user has
+    no such list, or if a concurrent request has just taken it.
+    """
+    legacy = db.session.execute(
+        db.select(FinancialData.id, FinancialData.data)
+        .where(FinancialData.user_id == user_id, FinancialData.data_type == 'transactions')
+    ).first()
+    if legacy is None:
+        return None
+    deleted = db.session.execute(db.delete(FinancialData).where(FinancialData.id == legacy.id))
+    if not deleted.rowcount:
+        return None
+    return [transaction_to_row(user_id, t) for t in jsoncodec.loads(legacy.data)]
+
+def _insert_transaction_rows(user_id, rows):
+    if rows:
+        db.session.execute(db.insert(Transaction), rows)
+        deltas = {}
+        for row in rows:
+            _add_rollup_delta(deltas, row)
+        apply_rollup_deltas(user_id, deltas)
+    bump_data_version(user_id)
+
+def add_transactions(user_id, transactions):
+    """Insert transaction dicts for a user with a single executemany.
+
+    The user's monthly rollups are updated from the same batch. A legacy
+    transaction list of the user is moved into the table along with them,
+    so it still counts once the user has Transaction rows.
+    """
+    rows = [transaction_to_row(user_id, t) for t in transactions]
+    if rows:
+        _insert_transaction_rows(user_id, (take_legacy_transactions(user_id) or []) + rows)
+    return len(rows)
+
+def migrate_legacy_transactions():
+    """Move every legacy transaction list into the Transaction table.
+
+    Runs on start; lists left because the tables did not exist yet are
+    moved by the user's next add_transactions(). Returns the number of
+    users whose list was moved.
+    """
+    if not {'transaction', 'monthly_rollup', 'data_version'} <= set(inspect(db.engine).get_table_names()):
+        return 0
+    user_ids = db.session.execute(
+        db.select(FinancialData.user_id).where(FinancialData.data_type == 'transactions')
+    ).scalars().all()
+    moved = 0
+    for user_id in user_ids:
+        try:
+            rows = take_legacy_transactions(user_id)
+            if rows is not None:
+                _insert_transaction_rows(user_id, rows)
+                moved += 1
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            app.logger.warning(f"Could not move the legacy transactions of user {user_id}: {e}")
+    return moved
+
+with app.app_context():
+    upgrade_schema()
+    migrate_legacy_transactions()
+
+def import_transactions(user_id, transactions, batch_size=None):
+    """Insert a stream of parsed statement rows in batches, skipping duplicates.
+
+    Rows whose content_hash the user already has (overlapping statement
+    periods) are dropped. Each batch is one lookup, one executemany and one
+    rollup upsert, committed on its own so large files never hold a long
+    write lock. The snapshot cache is invalidated once, at the end.
+    """
+    batch_size = batch_size or app.config.get('IMPORT_BATCH_SIZE', 500)
+    stats = {'inserted': 0, 'duplicates': 0}
+    try:
+        for batch in batched(transactions, batch_size):
+            seen = set(db.session.execute(
+                db.select(Transaction.content_hash).where(
+                    Transaction.user_id == user_id,
+                    Transaction.content_hash.in_([t['content_hash'] for t in batch])
+                )
+            ).scalars())
+            fresh = []
+            for transaction in batch:
+                if transaction['content_hash'] in seen:
+                    stats['duplicates'] += 1
+                    continue
+                seen.add(transaction['content_hash'])
+                fresh.append(transaction)
+            stats['inserted'] += add_transactions(user_id, fresh)
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        invalidate_financial_data(user_id)
+    return stats
+
+def update_transaction(user_id, transaction_id, changes):
+    """Change fields of one transaction and move its amount between rollups.
+
+    Returns the updated Transaction, or None if the user has no such row.
+    """
+    transaction = Transaction.query.filter_by(id=transaction_id, user_id=user_id).first()
+    if transaction is None:
+        return None
+    old = {'date': transaction.date, 'type': transaction.type,
+           'amount': transaction.amount, 'category': transaction.category}
+    new = dict(old)
+    for field in ('date', 'type', 'amount', 'description', 'category'):
+        if field in changes:
+            value = parse_transaction_date(changes[field]) if field == 'date' else changes[field]
+            setattr(transaction, field, value)
+            new[field] = value
+    deltas = {}
+    _add_rollup_delta(deltas, old, -1)
+    _add_rollup_delta(deltas, new)
+    apply_rollup_deltas(user_id, deltas)
+    bump_data_version(user_id)
+    return transaction
+
+def rebuild_monthly_rollups(user_id):
+    """Recompute a user's rollups from scratch, e.g. after a backfill."""
+    MonthlyRollup.query.filter_by(user_id=user_id).delete()
+    columns = TransactionColumns.from_transactions(load_transactions(user_id))
+    rows = [
+        {'user_id': user_id, 'month': month, 'type': ttype, 'category': category,
+         'total': total, 'count': count}
+        for month, ttype, category, total, count in columns.monthly_groups()
+    ]
+    if rows:
+        db.session.execute(db.insert(MonthlyRollup), rows)
+    bump_data_version(user_id)
+
+def load_monthly_rollups(user_id):
+    """Rollup rows of a user folded by month (see build_monthly_rollups)."""
+    groups = db.session.execute(
+        db.select(MonthlyRollup.month, MonthlyRollup.type, MonthlyRollup.category,
+                  MonthlyRollup.total, MonthlyRollup.count)
+        .where(MonthlyRollup.user_id == user_id, MonthlyRollup.count > 0)
+        .order_by(MonthlyRollup.month)
+    )
+    return build_monthly_rollups(groups)
+
+def build_monthly_rollups(groups):
+    """Fold (month, type, category, total, count) groups into per-month totals."""
+    months = {}
+    for month, ttype, category, total, count in groups:
+        entry = months.get(month)
+        if entry is None:
+            entry = months[month] = {'income': 0, 'expenses': 0, 'expenses_by_category': {}}
+        if ttype == 'income':
+            entry['income'] = _whole(entry['income'] + total)
+        elif ttype == 'expense':
+            entry['expenses'] = _whole(entry['expenses'] + total)
+            entry['expenses_by_category'][category] = _whole(total)
+    return dict(sorted(months.items()))
+
+def load_transactions(user_id, limit=None):
+    """Transactions of a user, newest first, as dicts (at most ``limit`` if given)."""
+    rows = db.session.execute(
+        db.select(Transaction.date, Transaction.type, Transaction.amount,
+                  Transaction.description, Transaction.category)
+        .where(Transaction.user_id == user_id)
+        .order_by(Transaction.date.desc(), Transaction.id.desc())
+        .limit(limit)
+    ).all()
+    return [
+        {'date': d.isoformat(), 'type': ttype, 'amount': _whole(amount),
+         'description': description, 'category': category}
+        for d, ttype, amount, description, category in rows
+    ]
+
+def build_transaction_summary(groups):
+    """Fold (type, category, total, count, max) groups into a summary dict."""
+    summary = {
+        'transaction_count': 0,
+        'total_income': 0,
+        'total_expenses': 0,
+        'expenses_by_category': {}
+    }
+    for ttype, category, total, count, max_amount in groups:
+        summary['transaction_count'] += count
+        if ttype == 'income':
+            summary['total_income'] += total
+        elif ttype == 'expense':
+            summary['total_expenses'] += total
+            summary['expenses_by_category'][category] = {
+                'total': _whole(total),
+                'count': count,
+                'max': _whole(max_amount)
+            }
+    summary['total_income'] = _whole(summary['total_income'])
+    summary['total_expenses'] = _whole(summary['total_expenses'])
+    return summary
+
+def aggregate_transactions(user_id):
+    """Per-type and per-category sums computed by the database."""
+    groups = db.session.execute(
+        db.select(Transaction.type, Transaction.category,
+                  db.func.sum(Transaction.amount), db.func.count(Transaction.id),
+                  db.func.max(Transaction.amount))
+        .where(Transaction.user_id == user_id)
+        .group_by(Transaction.type, Transaction.category)
+        .order_by(db.func.sum(Transaction.amount).desc())
+    ).all()
+    return build_transaction_summary(groups)
+
+def summarize_transactions(transactions):
+    """Same summary as aggregate_transactions for a list of transaction dicts."""
+    return build_transaction_summary(TransactionColumns.from_transactions(transactions).groups())
+
+def get_transaction_columns(data):
+    """Columnar transactions of a snapshot, building them if absent.
+
+    Snapshots loaded from the database carry their summary and rollups
+    already aggregated, so this only runs for data without them; binary
+    snapshot files provide the columns for free.
+    """
+    columns = data.get('transaction_columns')
+    if columns is None:
+        columns = TransactionColumns.from_transactions(data.get('transactions', []))
+    return columns
+
+def get_monthly_rollups(data):
+    """Per-month totals of a snapshot, building them if absent."""
+    rollups = data.get('monthly_rollups')
+    if rollups is None:
+        rollups = build_monthly_rollups(get_transaction_columns(data).monthly_groups())
+    return rollups
+
+def get_monthly_averages(data):
+    """Average monthly income and expenses over the months with transactions.
+
+    Returns None when there are no transactions.
+    """
+    rollups = get_monthly_rollups(data)
+    if not rollups:
+        return None
+    months = len(rollups)
+    return {
+        'months': months,
+        'income': _whole(round(sum(m['income'] for m in rollups.values()) / months, 2)),
+        'expenses': _whole(round(sum(m['expenses'] for m in rollups.values()) / months, 2))
+    }
+
+def get_monthly_budget(filtered_data):
+    """Monthly (income, expenses) from budget data, else from transaction rollups."""
+    if 'budget' in filtered_data:
+        budget = filtered_data['budget']
+        return budget['monthly_income'], budget['total_budgeted_expenses']
+    if has_transactions(filtered_data):
+        averages = get_monthly_averages(filtered_data)
+        if averages:
+            return averages['income'], averages['expenses']
+    return None
+
+def has_transactions(data):
+    """Whether a snapshot, or the part of it the assistant may see, has transactions.
+
+    Snapshots loaded from the Transaction table only carry the summary,
+    the rollups and the most recent rows, not a full 'transactions' list.
+    """
+    return 'transactions' in data or 'transaction_summary' in data
+
+def get_transaction_summary(data):
+    """Pre-aggregated transaction summary of a snapshot, computing it if absent."""
+    summary = data.get('transaction_summary')
+    if summary is None:
+        summary = build_transaction_summary(get_transaction_columns(data).groups())
+    return summary
+
+# Snapshot keys derived from a privacy category, shared only when it is granted
+DERIVED_DATA = {
+    'recent_transactions': 'transactions',
+    'transaction_summary': 'transactions',
+    'transaction_columns': 'transactions',
+    'monthly_rollups': 'transactions'
+}
+
+# Derived snapshot keys holding in-memory objects rather than JSON data
+NON_SERIALIZABLE_DATA = ('transaction_columns',)
+
+def filter_accessible_data(user_data, accessible_data):
+    """Subset of a snapshot the user allows the assistant to see."""
+    filtered_data = {}
+    for category, has_access in accessible_data.items():
+        if has_access and category in user_data:
+            filtered_data[category] = user_data[category]
+    for key, category in DERIVED_DATA.items():
+        if accessible_data.get(category) and key in user_data:
+            filtered_data[key] = user_data[key]
+    return filtered_data
+
+# Per-user financial snapshot
+def get_financial_data_version(user_id):
+    """Version of a user's stored financial rows, read from their DataVersion row.
+
+    Every write bumps the counter in its own transaction, so this is one
+    primary key lookup however much data the user has. The time of the
+    last bump is part of the version, so a recreated database never
+    matches snapshot files written for an older one.
+    """
+    row = db.session.execute(
+        db.select(DataVersion.version, DataVersion.updated_at).where(DataVersion.user_id == user_id)
+    ).first()
+    return tuple(row) if row else (0, None)
+
+def load_financial_snapshot(user_id):
+    """Read and decode every financial row of a user (uncached).
+
+    Transactions come from the Transaction table when the user has any,
+    summarized and rolled up by the database; only the most recent
+    SNAPSHOT_RECENT_TRANSACTIONS rows are loaded, as 'recent_transactions',
+    and there is no 'transactions' list. A legacy JSON list not yet moved
+    into the table (see migrate_legacy_transactions) is returned as
+    'transactions', aggregated here in columnar form.
+    """
+    financial_data = {}
+    for data in FinancialData.query.filter_by(user_id=user_id).all():
+        financial_data[data.data_type] = jsoncodec.loads(data.data)
+    summary = aggregate_transactions(user_id)
+    if summary['transaction_count']:
+        financial_data['recent_transactions'] = load_transactions(
+            user_id, app.config.get('SNAPSHOT_RECENT_TRANSACTIONS', 50))
+        rollups = load_monthly_rollups(user_id)
+    elif 'transactions' in financial_data:
+        columns = TransactionColumns.from_transactions(financial_data['transactions'])
+        summary = build_transaction_summary(columns.groups())
+        rollups = build_monthly_rollups(columns.monthly_groups())
+    else:
+        return financial_data
+    financial_data['transaction_summary'] = summary
+    financial_data['monthly_rollups'] = rollups
+    return financial_data
+
+def snapshot_file_path(user_id, version):
+    """Binary snapshot file of a user at a data version, or None if disabled."""
+    snapshot_dir = app.config.get('SNAPSHOT_DIR')
+    if not snapshot_dir:
+        return None
+    tag = hashlib.sha1(repr(version).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(snapshot_dir, f"user-{user_id}-{tag}.snap")
+
+def load_snapshot_file(user_id, version):
+    """Open the user's binary snapshot, writing it from the database on a miss.
+
+    Other workers then open the same file after one version lookup instead
+    of querying and decoding the rows themselves. Users whose transactions
+    are in the Transaction table get no transaction columns in the file,
+    only the summary, rollups and recent rows load_financial_snapshot
+    builds; only files of SNAPSHOT_MMAP_MIN_BYTES or more are
+    memory-mapped, so cached small snapshots hold no mapping or descriptor.
+    Files of older versions are removed, retrying ones that could not be
+    removed before.
+    """
+    path = snapshot_file_path(user_id, version)
+    if path is None:
+        return load_financial_snapshot(user_id)
+    try:
+        return snapshot_format.load(path, app.config.get('SNAPSHOT_MMAP_MIN_BYTES', 0))
+    except FileNotFoundError:
+        pass
+    except (OSError, snapshot_format.SnapshotFormatError) as e:
+        app.logger.warning(f"Rebuilding unreadable snapshot {path}: {e}")
+    financial_data = load_financial_snapshot(user_id)
+    try:
+        snapshot_format.write(path, financial_data)
+    except OSError as e:
+        app.logger.warning(f"Could not write snapshot {path}: {e}")
+    try:
+        left = snapshot_format.prune(os.path.dirname(path), f"user-{user_id}-", os.path.basename(path))
+        if left:
+            app.logger.info(f"{left} old snapshot files of user {user_id} are still in use")
+    except OSError as e:
+        app.logger.warning(f"Could not remove old snapshots of user {user_id}: {e}")
+    return financial_data
+
+def get_financial_data(user_id):
+    """Return the user's decoded financial data through the snapshot cache.
+
+    The returned dict is shared with other requests and must not be mutated.
+    """
+    version = get_financial_data_version(user_id)
+
+    def load():
+        financial_data = load_snapshot_file(user_id, version)
+        financial_data['data_fingerprint'] = hashlib.sha1(repr((user_id, version)).encode('utf-8')).hexdigest()
+        return financial_data
+
+    return snapshot_cache.get_or_load(user_id, version, load)
+
+def load_chat_context(user_id):
+    """Financial data and privacy settings of a user, or None if the user is gone."""
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    return get_financial_data(user_id), get_accessible_data(user)
+
+def _in_app_context(fn, *args):
+    with app.app_context():
+        return fn(*args)
+
+async def run_db(fn, *args):
+    """Run blocking database work for an async handler on db_executor.
+
+    Each call gets its own app context and therefore its own session, so
+    the event loop never waits on SQLite or the connection pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(_in_app_context, fn, *args))
+
+def invalidate_financial_data(user_id):
+    """Drop the cached snapshot after writing a user's financial data."""
+    snapshot_cache.invalidate(user_id)
+
+def get_accessible_data(user):
+    """Privacy settings of a user keyed by financial data category."""
+    return {
+        'assets': user.assets_access,
+        'liabilities': user.liabilities_access,
+        'transactions': user.transactions_access,
+        'epf_balance': user.epf_access,
+        'credit_score': user.credit_score_access,
+        'investments': user.investments_access
+    }
 
 # Load mock financial data
 def load_mock_data():
     try:
-        with open('mock_data.json', 'r') as f:
-            return json.load(f)
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_data.json'), 'rb') as f:
+            return jsoncodec.loads(f.read())
     except FileNotFoundError:
         # Fallback data if file doesn't exist
         return {
@@ -549,55 +1034,206 @@ def load_mock_data():
             }
         }
 
-# AI-powered financial insights with conversation context
-def get_ai_insights(query, user_data, accessible_data, conversation_history=None, force_lang=None):
-    try:
-        # Filter data based on user permissions
-        filtered_data = {}
-        for category, has_access in accessible_data.items():
-            if has_access and category in user_data:
-                filtered_data[category] = user_data[category]
-        
-        # Use forced language if provided, otherwise auto-detect
-        lang = force_lang if force_lang else detect_language_from_query(query)
-
-        # Quick localized greeting without calling external APIs
-        if is_greeting(query.lower(), lang):
-            return GREETING_RESPONSES.get(lang, GREETING_RESPONSES['en'])[0]
-
-        # Check if OpenAI API key is configured and SDK available
-        openai_api_key = app.config['OPENAI_API_KEY']
-        sdk_ready = (openai is not None) and bool(openai_api_key) and openai_api_key != 'your-openai-api-key-here'
-        app.logger.info(f"OpenAI availability: {'Ready' if sdk_ready else 'Unavailable'}")
-        if not sdk_ready:
-            app.logger.warning("OpenAI not available or not configured, using heuristic fallback response")
-            return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history)
-        
-        # Set the API key for OpenAI (best effort)
-        try:
-            openai.api_key = openai_api_key
-        except Exception:
-            pass
-        
-        language_name = LANGUAGE_NAMES.get(lang, 'English')
-        
-        # Build conversation context
-        context_messages = []
-        if conversation_history:
-            for entry in conversation_history[-6:]:  # Keep last 6 exchanges for context
-                context_messages.append({"role": "user", "content": entry.get('user', '')})
-                context_messages.append({"role": "assistant", "content": entry.get('assistant', '')})
-        
-        # Add current query
-        context_messages.append({"role": "user", "content": query})
-        
-        # Enhanced system prompt with comprehensive instructions
-        system_prompt = f"""You are an expert AI Finance Assistant. Respond in {language_name}.
-
-Available financial data:
-{json.dumps(filtered_data, indent=2, ensure_ascii=False)}
+_seed_data = None
+
+def get_seed_data():
+    """Mock data for new users, parsed from disk once per process.
+
+    The returned dict is shared and must not be mutated.
+    """
+    global _seed_data
+    if _seed_data is None:
+        _seed_data = load_mock_data()
+    return _seed_data
+
+def seed_user_data(user_id):
+    """Give a newly created user the demo financial data (caller commits)."""
+    seed = get_seed_data()
+    add_transactions(user_id, seed.get('transactions', []))
+    upsert_financial_data(user_id, {k: v for k, v in seed.items() if k != 'transactions'})
+
+def prepare_seed_rows(seed):
+    """Pre-serialize seed data into row dicts that only lack a user_id."""
+    now = datetime.utcnow()
+    financial = [
+        {'data_type': data_type, 'data': jsoncodec.dumps(payload), 'version': 1,
+         'created_at': now, 'updated_at': now}
+        for data_type, payload in seed.items() if data_type != 'transactions'
+    ]
+    transactions = [transaction_to_row(None, t) for t in seed.get('transactions', [])]
+    columns = TransactionColumns.from_transactions(seed.get('transactions', []))
+    rollups = [
+        {'month': month, 'type': ttype, 'category': category, 'total': total, 'count': count}
+        for month, ttype, category, total, count in columns.monthly_groups()
+    ]
+    return financial, transactions, rollups
+
+def provision_users(accounts, hash_method=None, batch_size=None, workers=None):
+    """Create many users with demo data using bulk inserts.
+
+    ``accounts`` is an iterable of dicts with username, email and password.
+    Passwords are hashed on a thread pool (PBKDF2 releases the GIL), seed
+    data is parsed and serialized once, and each batch of users plus their
+    financial rows is written in a single transaction. Accounts whose
+    username or email already exists are skipped.
+    """
+    batch_size = batch_size or app.config.get('PROVISION_BATCH_SIZE', 500)
+    workers = workers or app.config.get('PROVISION_HASH_WORKERS') or None
+    hash_password = partial(generate_password_hash, method=hash_method) if hash_method else generate_password_hash
+    financial_rows, transaction_rows, rollup_rows = prepare_seed_rows(get_seed_data())
+    stats = {'created': 0, 'skipped': 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(accounts, batch_size):
+            taken = db.session.execute(
+                db.select(User.username, User.email).where(db.or_(
+                    User.username.in_([a['username'] for a in batch]),
+                    User.email.in_([a['email'] for a in batch])
+                ))
+            ).all()
+            taken_names = {username for username, _ in taken}
+            taken_emails = {email for _, email in taken}
+            fresh = []
+            for account in batch:
+                if account['username'] in taken_names or account['email'] in taken_emails:
+                    stats['skipped'] += 1
+                    continue
+                taken_names.add(account['username'])
+                taken_emails.add(account['email'])
+                fresh.append(account)
+            if not fresh:
+                continue
+            hashes = list(pool.map(hash_password, [a['password'] for a in fresh]))
+            now = datetime.utcnow()
+            try:
+                user_ids = db.session.execute(
+                    db.insert(User).returning(User.id, sort_by_parameter_order=True),
+                    [{'username': a['username'], 'email': a['email'], 'password_hash': h, 'created_at': now}
+                     for a, h in zip(fresh, hashes)]
+                ).scalars().all()
+                version_rows = [{'version': 1, 'updated_at': now}]
+                for model, rows in ((FinancialData, financial_rows), (Transaction, transaction_rows),
+                                    (MonthlyRollup, rollup_rows), (DataVersion, version_rows)):
+                    if rows:
+                        db.session.execute(db.insert(model), [
+                            {**row, 'user_id': user_id} for user_id in user_ids for row in rows
+                        ])
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+            stats['created'] += len(user_ids)
+    return stats
 
-CORE RESPONSE STRUCTURE:
+# AI-powered financial insights with conversation context
+def normalize_query(query):
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return ' '.join(query.lower().split()).rstrip('?!.।॥ ')
+
+def data_fingerprint(user_data, filtered_data):
+    """Identity of the data the assistant may see for this request.
+
+    Snapshots from get_financial_data carry a fingerprint of their version,
+    so only the visible categories need to be added; other data is hashed.
+    """
+    visible = ','.join(sorted(filtered_data))
+    base = user_data.get('data_fingerprint')
+    if base is None:
+        prompt_data = {k: v for k, v in filtered_data.items() if k not in NON_SERIALIZABLE_DATA}
+        return hashlib.sha1(jsoncodec.dumps_bytes(prompt_data, sort_keys=True)).hexdigest()
+    return f"{base}:{visible}"
+
+def context_fingerprint(conversation_history, turns=6):
+    """Hash of the conversation turns that go into the prompt."""
+    if not conversation_history:
+        return ''
+    recent = [(entry.get('user', ''), entry.get('assistant', '')) for entry in conversation_history[-turns:]]
+    return hashlib.sha1(jsoncodec.dumps_bytes(recent)).hexdigest()
+
+def _fact_pairs(values):
+    """'name value' pairs of the scalar entries of a dict."""
+    return ', '.join(f"{key} {_whole(value)}" for key, value in values.items()
+                     if isinstance(value, (int, float, str)) and not isinstance(value, bool))
+
+def build_prompt_facts(filtered_data, top_n=5):
+    """Compact fact lines about the visible data, most important first.
+
+    Transactions are reduced to totals, per-category sums, recent monthly
+    totals and the latest few entries, and holdings to the largest ones, so
+    the lines stay short however much history the user has.
+    """
+    facts = []
+    assets = filtered_data.get('assets')
+    liabilities = filtered_data.get('liabilities')
+    if assets:
+        facts.append(f"Assets: {_fact_pairs(assets)}")
+    if liabilities:
+        facts.append(f"Liabilities: {_fact_pairs(liabilities)}")
+    if assets and liabilities:
+        net_worth = assets.get('total_assets', 0) - liabilities.get('total_liabilities', 0)
+        facts.append(f"Net worth: {_whole(net_worth)}")
+    credit = filtered_data.get('credit_score')
+    if credit:
+        line = f"Credit score: {credit.get('score')} ({credit.get('rating', 'unrated')})"
+        if isinstance(credit.get('factors'), dict):
+            line += f"; factors: {_fact_pairs(credit['factors'])}"
+        facts.append(line)
+    if has_transactions(filtered_data):
+        summary = get_transaction_summary(filtered_data)
+        facts.append(f"Transactions: {summary['transaction_count']} recorded, total income "
+                     f"{summary['total_income']}, total expenses {summary['total_expenses']}")
+        categories = list(summary['expenses_by_category'].items())[:top_n * 2]
+        if categories:
+            facts.append("Expenses by category (total/count/largest): " + ', '.join(
+                f"{name} {c['total']}/{c['count']}/{c['max']}" for name, c in categories))
+        averages = get_monthly_averages(filtered_data)
+        if averages:
+            facts.append(f"Monthly average over {averages['months']} months: income {averages['income']}, "
+                         f"expenses {averages['expenses']}")
+    investments = filtered_data.get('investments')
+    if investments:
+        facts.append(f"Investments: total value {investments.get('total_investment_value', 0)}, "
+                     f"gain/loss {investments.get('total_gain_loss', 0)}")
+        holdings = [(h.get('symbol') or h.get('name'), h.get('total_value', 0), h.get('gain_loss'))
+                    for kind in ('stocks', 'mutual_funds') for h in investments.get(kind) or ()]
+        holdings.sort(key=lambda holding: holding[1], reverse=True)
+        if holdings:
+            facts.append("Top holdings (value, gain/loss): " + ', '.join(
+                f"{name} {_whole(value)}" + (f" ({gain:+})" if gain is not None else '')
+                for name, value, gain in holdings[:top_n]))
+    epf = filtered_data.get('epf_balance')
+    if epf:
+        facts.append(f"EPF: {_fact_pairs(epf)}")
+    budget = filtered_data.get('budget')
+    if budget:
+        facts.append(f"Budget: {_fact_pairs(budget)}")
+        if isinstance(budget.get('monthly_expenses'), dict):
+            facts.append(f"Budgeted monthly expenses: {_fact_pairs(budget['monthly_expenses'])}")
+    if has_transactions(filtered_data):
+        rollups = list(get_monthly_rollups(filtered_data).items())[-top_n:]
+        if rollups:
+            facts.append("Recent months (income/expenses): " + ', '.join(
+                f"{month} {m['income']}/{m['expenses']}" for month, m in rollups))
+        recent = filtered_data.get('recent_transactions', filtered_data.get('transactions', []))[:top_n]
+        if recent:
+            facts.append("Latest transactions: " + '; '.join(
+                f"{t.get('date')} {t.get('type')} {t.get('amount')} {t.get('description', '')}".rstrip()
+                for t in recent))
+    return facts
+
+def prompt_facts(filtered_data, data_key=None):
+    """Fact lines and their token counts, cached per data version when keyed."""
+    if data_key is None:
+        facts = build_prompt_facts(filtered_data)
+        return facts, [prompt_builder.estimate_tokens(line) + 1 for line in facts]
+    cached = prompt_facts_cache.get(data_key)
+    if cached is None:
+        facts = build_prompt_facts(filtered_data)
+        cached = (facts, [prompt_builder.estimate_tokens(line) + 1 for line in facts])
+        prompt_facts_cache.set(data_key, cached)
+    return cached
+
+# Instructions always sent with the question
+PROMPT_CORE_INSTRUCTIONS = """CORE RESPONSE STRUCTURE:
 1. DIRECT ANSWER: Start with a clear, direct answer to the user's question
 2. CONTEXTUAL EXPLANATION: Provide detailed context and reasoning
 3. ACTIONABLE RECOMMENDATIONS: Always include 2-3 specific, actionable steps
@@ -612,15 +1248,21 @@ ENHANCED INSTRUCTIONS:
 - Suggest timelines for implementation
 - Offer multiple options when appropriate
 
-SPECIALIZED RESPONSES:
+ERROR HANDLING:
+- If data is missing, explain what's needed and how to provide it
+- If permissions are required, guide users to grant access
+- Always offer alternative solutions when primary data isn't available"""
+
+# Further guidance, added in this order while the token budget allows
+PROMPT_EXTRA_INSTRUCTIONS = (
+    """SPECIALIZED RESPONSES:
 - BUDGET CREATION: Provide detailed budget templates and allocation strategies
 - DEBT MANAGEMENT: Offer specific repayment strategies with calculations
 - INVESTMENT ADVICE: Suggest portfolio diversification with percentages
 - SAVINGS GOALS: Create realistic timelines and contribution amounts
 - EXPENSE TRACKING: Recommend specific tools and methodologies
-- EMERGENCY FUNDS: Calculate exact amounts needed based on expenses
-
-EXAMPLE RESPONSES:
+- EMERGENCY FUNDS: Calculate exact amounts needed based on expenses""",
+    """EXAMPLE RESPONSES:
 For "creating a budget":
 "DIRECT ANSWER: Yes, I can help you create a comprehensive budget based on your financial data.
 
@@ -643,400 +1285,316 @@ ACTIONABLE RECOMMENDATIONS:
 2. Pay minimum on all except the highest interest debt
 3. Put every extra dollar toward the highest interest debt
 
-FOLLOW-UP SUGGESTIONS: Would you like me to calculate your exact payoff timeline and total interest savings?"
+FOLLOW-UP SUGGESTIONS: Would you like me to calculate your exact payoff timeline and total interest savings?\""""
+)
+PROMPT_CORE_TOKENS = prompt_builder.estimate_tokens(PROMPT_CORE_INSTRUCTIONS)
+PROMPT_EXTRA_TOKENS = [prompt_builder.estimate_tokens(block) + 1 for block in PROMPT_EXTRA_INSTRUCTIONS]
+
+def build_chat_messages(query, filtered_data, conversation_history, lang, data_key=None):
+    """System prompt with facts about the visible data, recent turns and the new question.
+
+    Everything shares the PROMPT_TOKEN_BUDGET: the core instructions and the
+    question are always sent; fact lines, older turns and the extra guidance
+    blocks are left out once they no longer fit. ``data_key`` (the data
+    fingerprint of the request) lets the fact lines be reused across requests.
+    """
+    language_name = LANGUAGE_NAMES.get(lang, 'English')
+    facts, fact_tokens = prompt_facts(filtered_data, data_key)
+    turns = (conversation_history or [])[-app.config.get('PROMPT_HISTORY_TURNS', 6):]
+    turn_tokens = [prompt_builder.message_tokens(entry.get('user', '')) +
+                   prompt_builder.message_tokens(entry.get('assistant', '')) for entry in turns]
+    header = f"You are an expert AI Finance Assistant. Respond in {language_name}.\n\nFinancial facts:"
+    required = (prompt_builder.message_tokens(header) + PROMPT_CORE_TOKENS
+                + prompt_builder.message_tokens(query))
+    n_facts, n_turns, n_extras, _ = prompt_builder.fit_prompt(
+        app.config.get('PROMPT_TOKEN_BUDGET', 1500), required, fact_tokens, turn_tokens, PROMPT_EXTRA_TOKENS)
+
+    fact_text = '\n'.join(f"- {line}" for line in facts[:n_facts]) or "- No financial data shared"
+    sections = [header + '\n' + fact_text, PROMPT_CORE_INSTRUCTIONS, *PROMPT_EXTRA_INSTRUCTIONS[:n_extras]]
+    messages = [{"role": "system", "content": '\n\n'.join(sections)}]
+    for entry in turns[len(turns) - n_turns:]:
+        messages.append({"role": "user", "content": entry.get('user', '')})
+        messages.append({"role": "assistant", "content": entry.get('assistant', '')})
+    messages.append({"role": "user", "content": query})
+    return messages
+
+# Provider settings of the chat call, shared by the sync and async pipelines
+CHAT_COMPLETION_OPTIONS = {
+    'max_tokens': 300,
+    'temperature': 0.7
+}
 
-ERROR HANDLING:
-- If data is missing, explain what's needed and how to provide it
-- If permissions are required, guide users to grant access
-- Always offer alternative solutions when primary data isn't available"""
+def llm_ready():
+    if app.config.get('LLM_BACKEND') == 'stub':
+        return llm_client.available
+    openai_api_key = app.config['OPENAI_API_KEY']
+    return llm_client.available and bool(openai_api_key) and openai_api_key != 'your-openai-api-key-here'
+
+def prepare_insights(query, user_data, accessible_data, conversation_history, force_lang):
+    """Visible data, language, model availability and response cache key of a question."""
+    filtered_data = filter_accessible_data(user_data, accessible_data)
+    lang = force_lang if force_lang else detect_language_from_query(query)
+    sdk_ready = llm_ready()
+    # Fallback answers ignore the conversation, so they are shared across it
+    key = (normalize_query(query), lang, data_fingerprint(user_data, filtered_data),
+           context_fingerprint(conversation_history, app.config.get('PROMPT_HISTORY_TURNS', 6)) if sdk_ready else '')
+    return filtered_data, lang, sdk_ready, key
+
+def lookup_answer(figure, filtered_data, lang):
+    """Answer to a one-figure question from the visible data, worded as the fallback engine does."""
+    M = catalogs.get(lang).messages
+    if figure == 'credit_score' and 'credit_score' in filtered_data:
+        credit = filtered_data['credit_score']
+        return M['credit_score'].format(score=credit['score'], rating=credit['rating'])
+    if figure == 'total_assets' and 'assets' in filtered_data:
+        return M['assets_total'].format(filtered_data['assets']['total_assets']) + template('advice.assets', lang)
+    if figure == 'net_worth' and 'assets' in filtered_data and 'liabilities' in filtered_data:
+        net_worth = filtered_data['assets']['total_assets'] - filtered_data['liabilities']['total_liabilities']
+        return M['net_worth'].format(net_worth)
+    return None
+
+def fast_answer(query, filtered_data, lang):
+    """First-tier answer to a greeting or a one-figure question, or None.
+
+    These need neither the model nor the fallback cascade, so they are
+    answered before the response cache is consulted and are not cached.
+    """
+    text = query.lower()
+    if is_greeting(text, lang):
+        fast_path_stats.hit('greeting')
+        return catalogs.get(lang).greetings[0]
+    figure = LOOKUP_MATCHER.match(text, (lang, 'en'))
+    answer = lookup_answer(figure, filtered_data, lang) if figure else None
+    if answer is None:
+        fast_path_stats.miss()
+    else:
+        fast_path_stats.hit(figure)
+    return answer
+
+def get_ai_insights(query, user_data, accessible_data, conversation_history=None, force_lang=None):
+    """Answer a question, serving repeats against unchanged data from response_cache.
+
+    Identical questions arriving while one is being answered (same user and
+    data version, language and recent context) wait for that answer instead
+    of calling the model again.
+    """
+    filtered_data, lang, sdk_ready, key = prepare_insights(
+        query, user_data, accessible_data, conversation_history, force_lang)
+    response = fast_answer(query, filtered_data, lang) or response_cache.get(key)
+    if response is None:
+        response = insight_flights.do(key, _answer_and_cache, key, query, filtered_data,
+                                      accessible_data, conversation_history, lang, sdk_ready)
+    return response
+
+async def get_ai_insights_async(query, user_data, accessible_data, conversation_history=None, force_lang=None):
+    """get_ai_insights for the event loop: the provider call is awaited, not blocked on."""
+    filtered_data, lang, sdk_ready, key = prepare_insights(
+        query, user_data, accessible_data, conversation_history, force_lang)
+    response = fast_answer(query, filtered_data, lang) or response_cache.get(key)
+    if response is None:
+        response = await insight_flights.ado(key, _answer_and_cache_async, key, query, filtered_data,
+                                             accessible_data, conversation_history, lang, sdk_ready)
+    return response
+
+def _answer_and_cache(key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready):
+    response, cacheable = _get_ai_insights(
+        query, filtered_data, accessible_data, conversation_history, lang, sdk_ready, key[2])
+    if cacheable:
+        response_cache.set(key, response)
+    return response
+
+async def _answer_and_cache_async(key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready):
+    response, cacheable = await _get_ai_insights_async(
+        query, filtered_data, accessible_data, conversation_history, lang, sdk_ready, key[2])
+    if cacheable:
+        response_cache.set(key, response)
+    return response
+
+def _local_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready):
+    """Answer that needs no provider call, as (response, cacheable), or None."""
+    app.logger.info(f"OpenAI availability: {'Ready' if sdk_ready else 'Unavailable'}")
+    if not sdk_ready:
+        app.logger.warning("OpenAI not available or not configured, using heuristic fallback response")
+        return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history), True
+    return None
+
+def _fallback_after_error(e, query, filtered_data, accessible_data, conversation_history, lang):
+    if isinstance(e, LLMError) and e.kind == 'circuit_open':
+        app.logger.info(f"OpenAI skipped, serving fallback: {e}")
+    elif isinstance(e, LLMError) and e.kind in ('quota', 'rate_limit', 'timeout'):
+        app.logger.warning(f"OpenAI quick-fail fallback due to {e.kind} error: {e}")
+    else:
+        app.logger.error(f"OpenAI call failed: {e}")
+    return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history), False
+
+def _get_ai_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready, data_key=None):
+    """Uncached answer plus whether it may be cached.
+
+    Answers produced after an API failure are not cached, so the assistant
+    goes back to the model as soon as it recovers.
+    """
+    try:
+        local = _local_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready)
+        if local is not None:
+            return local
         
-        messages = [{"role": "system", "content": system_prompt}] + context_messages
+        messages = build_chat_messages(query, filtered_data, conversation_history, lang, data_key)
         
         try:
-            # Support legacy SDKs where ChatCompletion exists. If not, fall back.
-            if hasattr(openai, 'ChatCompletion'):
-                response = openai.ChatCompletion.create(  # type: ignore[attr-defined]
-                    model="gpt-3.5-turbo",
-                    messages=messages,
-                    max_tokens=300,
-                    temperature=0.7,
-                    request_timeout=8
-                )
-                app.logger.info("OpenAI ChatCompletion call successful")
-                return response.choices[0].message.content
-            else:
-                app.logger.warning("OpenAI SDK does not support ChatCompletion; using fallback")
-                return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history)
+            response = llm_client.chat(messages, **CHAT_COMPLETION_OPTIONS)
+            app.logger.info("OpenAI chat completion successful")
+            return response, True
         except Exception as e:
-            err_text = str(e).lower()
-            if 'quota' in err_text or 'rate limit' in err_text or 'timeout' in err_text:
-                app.logger.warning(f"OpenAI quick-fail fallback due to error: {e}")
-                return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history)
-            app.logger.error(f"OpenAI call failed: {e}")
-            return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history)
+            return _fallback_after_error(e, query, filtered_data, accessible_data, conversation_history, lang)
     except Exception as e:
         app.logger.error(f"Error in get_ai_insights: {e}")
-        return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history)
+        return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history), False
+
+async def _get_ai_insights_async(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready,
+                                 data_key=None):
+    """_get_ai_insights awaiting the provider on the event loop."""
+    try:
+        local = _local_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready)
+        if local is not None:
+            return local
+
+        messages = build_chat_messages(query, filtered_data, conversation_history, lang, data_key)
+
+        try:
+            response = await llm_client.achat(messages, **CHAT_COMPLETION_OPTIONS)
+            app.logger.info("OpenAI chat completion successful")
+            return response, True
+        except Exception as e:
+            return _fallback_after_error(e, query, filtered_data, accessible_data, conversation_history, lang)
+    except Exception as e:
+        app.logger.error(f"Error in get_ai_insights_async: {e}")
+        return get_fallback_response(query, filtered_data, accessible_data, lang, conversation_history), False
+
+# Blank-line boundaries between the sections of a prepared answer
+SECTION_BREAK = re.compile(r'(?<=\n\n)(?=\S)')
+
+def answer_sections(text):
+    """Split a prepared answer into sections that concatenate back to it."""
+    return [part for part in SECTION_BREAK.split(text) if part]
+
+def stream_ai_insights(query, user_data, accessible_data, conversation_history=None, force_lang=None):
+    """Yield the answer of get_ai_insights in pieces as soon as they exist.
+
+    Model answers are relayed token by token; cached, greeting and fallback
+    answers are already complete and are yielded section by section. A
+    fully streamed model answer is cached like get_ai_insights would, and
+    identical questions asked while it streams follow the same stream.
+    """
+    filtered_data, lang, sdk_ready, key = prepare_insights(
+        query, user_data, accessible_data, conversation_history, force_lang)
+    response = fast_answer(query, filtered_data, lang) or response_cache.get(key)
+    if response is None:
+        yield from stream_flights.stream(('answer',) + key, partial(
+            _stream_answer, key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready))
+        return
+    yield from answer_sections(response)
+
+def _stream_answer(key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready):
+    local = _local_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready)
+    if local is None:
+        parts = []
+        try:
+            messages = build_chat_messages(query, filtered_data, conversation_history, lang, key[2])
+            for text in llm_client.stream(messages, **CHAT_COMPLETION_OPTIONS):
+                parts.append(text)
+                yield text
+        except Exception as e:
+            if parts:
+                app.logger.error(f"OpenAI stream interrupted: {e}")
+                return
+            local = _fallback_after_error(e, query, filtered_data, accessible_data, conversation_history, lang)
+        else:
+            response_cache.set(key, ''.join(parts))
+            return
+    response, cacheable = local
+    if cacheable:
+        response_cache.set(key, response)
+    yield from answer_sections(response)
+
+async def stream_ai_insights_async(query, user_data, accessible_data, conversation_history=None, force_lang=None):
+    """stream_ai_insights for the event loop."""
+    filtered_data, lang, sdk_ready, key = prepare_insights(
+        query, user_data, accessible_data, conversation_history, force_lang)
+    response = fast_answer(query, filtered_data, lang) or response_cache.get(key)
+    if response is None:
+        broadcast = stream_flights.astart(('answer',) + key, partial(
+            _stream_answer_async, key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready))
+        async for text in broadcast.afollow():
+            yield text
+        return
+    for section in answer_sections(response):
+        yield section
+
+async def _stream_answer_async(key, query, filtered_data, accessible_data, conversation_history, lang, sdk_ready,
+                               publish):
+    local = _local_insights(query, filtered_data, accessible_data, conversation_history, lang, sdk_ready)
+    if local is None:
+        parts = []
+        try:
+            messages = build_chat_messages(query, filtered_data, conversation_history, lang, key[2])
+            async for text in llm_client.astream(messages, **CHAT_COMPLETION_OPTIONS):
+                parts.append(text)
+                publish(text)
+        except Exception as e:
+            if parts:
+                app.logger.error(f"OpenAI stream interrupted: {e}")
+                return
+            local = _fallback_after_error(e, query, filtered_data, accessible_data, conversation_history, lang)
+        else:
+            response_cache.set(key, ''.join(parts))
+            return
+    response, cacheable = local
+    if cacheable:
+        response_cache.set(key, response)
+    for section in answer_sections(response):
+        publish(section)
+
+def sse_event(event, data):
+    """One Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {jsoncodec.dumps(data)}\n\n"
+
+def chat_turn_serializer():
+    return URLSafeTimedSerializer(app.secret_key, salt='chat-turn')
+
+def sign_chat_turn(user_id, query, response, timestamp=None):
+    """Token the client returns to /chat/commit once a stream has completed.
+
+    Streamed responses cannot update the session cookie after the headers
+    are sent, so the finished exchange is signed here and written to the
+    session by the follow-up request.
+    """
+    return chat_turn_serializer().dumps({
+        'user_id': user_id, 'user': query, 'assistant': response,
+        'timestamp': timestamp or datetime.utcnow().isoformat()
+    })
+
+def chat_turn_done_event(user_id, turn):
+    """Final SSE event of a streamed turn, carrying its /chat/commit token."""
+    commit = sign_chat_turn(user_id, turn['user'], turn['assistant'], turn['timestamp'])
+    return sse_event('done', {'lang': turn['lang'], 'commit': commit})
+
+def replay_chat_turn(user_id, turn):
+    """SSE events of an already answered turn; committing it again is a no-op."""
+    for section in answer_sections(turn['assistant']):
+        yield sse_event('token', {'text': section})
+    yield chat_turn_done_event(user_id, turn)
 
 def get_fallback_response(query, filtered_data, accessible_data, lang_override: str | None = None, conversation_history=None):
     """Enhanced AI Finance Assistant with structured responses and actionable recommendations"""
     query_lower = query.lower()
     lang = lang_override or get_locale()
-    M = AI_MSG.get(lang, AI_MSG['en'])
-    
-    def any_in(key: str) -> bool:
-        return contains_any(query_lower, KEYWORDS.get(key, {}).get(lang, [])) or contains_any(query_lower, KEYWORDS.get(key, {}).get('en', []))
-    
-    def format_structured_response(direct_answer, explanation, recommendations, follow_up=""):
-        """Format response with clear structure"""
-        response = f"🎯 DIRECT ANSWER: {direct_answer}\n\n"
-        response += f"📋 CONTEXTUAL EXPLANATION: {explanation}\n\n"
-        response += f"✅ ACTIONABLE RECOMMENDATIONS:\n{recommendations}\n"
-        if follow_up:
-            response += f"\n🔄 FOLLOW-UP SUGGESTIONS: {follow_up}"
-        return response
+    M = catalogs.get(lang).messages
     
-    def get_recommendations(category: str, lang: str) -> str:
-        """Get strong, comprehensive financial recommendations based on category and language"""
-        recommendations = {
-            'en': {
-                'assets': """
-🚀 STRONG FINANCIAL RECOMMENDATIONS:
-
-💰 ASSET OPTIMIZATION:
-• Diversify across 4 asset classes: Stocks (40%), Bonds (30%), Real Estate (20%), Cash (10%)
-• Build emergency fund: 6 months of expenses in high-yield savings account
-• Invest excess cash: Consider index funds for 7-10% annual returns
-• Review asset allocation quarterly and rebalance when needed
-
-📈 GROWTH STRATEGIES:
-• Use dollar-cost averaging for consistent investing
-• Consider tax-advantaged accounts (401k, IRA) for retirement
-• Explore REITs for real estate exposure without property management
-• Automate investments to remove emotional decision-making
-
-⚠️ RISK MANAGEMENT:
-• Never invest more than you can afford to lose
-• Keep 3-6 months expenses in liquid assets
-• Consider insurance for major assets (home, car, health)
-• Review and update beneficiaries annually""",
-                'liabilities': """
-🔥 DEBT ELIMINATION STRATEGY:
-
-⚡ IMMEDIATE ACTIONS:
-• List all debts by interest rate (highest first)
-• Pay minimum on all debts except the highest interest one
-• Put every extra dollar toward the highest interest debt
-• Consider balance transfer cards for 0% introductory rates
-
-💳 CREDIT CARD DEBT:
-• Stop using credit cards until debt-free
-• Negotiate lower interest rates with creditors
-• Consider debt consolidation loan if rate is lower
-• Use cash or debit cards to prevent new debt
-
-🏠 MORTGAGE OPTIMIZATION:
-• Make bi-weekly payments to save thousands in interest
-• Consider refinancing if rates drop 0.5% or more
-• Pay extra principal when possible
-• Avoid cash-out refinancing unless absolutely necessary
-
-📊 DEBT TRACKING:
-• Use debt payoff calculator to see timeline
-• Celebrate small wins to stay motivated
-• Consider debt snowball method for psychological wins
-• Set up automatic payments to avoid late fees""",
-                'investments': """
-🎯 INVESTMENT MASTERY PLAN:
-
-📊 PORTFOLIO CONSTRUCTION:
-• 60% Stocks (40% US, 20% International)
-• 30% Bonds (Government and Corporate)
-• 10% Alternative investments (REITs, Commodities)
-• Rebalance quarterly to maintain target allocation
-
-💡 INVESTMENT STRATEGIES:
-• Start with low-cost index funds (VTI, VXUS, BND)
-• Use tax-loss harvesting to reduce tax burden
-• Consider robo-advisors for automated management
-• Invest in tax-advantaged accounts first (401k, IRA)
-
-🚀 GROWTH ACCELERATION:
-• Increase contributions by 1% every 6 months
-• Take advantage of employer 401k matching
-• Consider Roth IRA for tax-free growth
-• Use catch-up contributions if over 50
-
-⚠️ RISK MANAGEMENT:
-• Never time the market - stay invested
-• Diversify across sectors and geographies
-• Keep 3-6 months expenses in emergency fund
-• Review and rebalance portfolio quarterly""",
-                'spending': """
-💸 SPENDING OPTIMIZATION BLUEPRINT:
-
-📋 BUDGET MASTERY:
-• Use 50/30/20 rule: 50% needs, 30% wants, 20% savings
-• Track every expense for 30 days to identify patterns
-• Use envelope method for discretionary spending
-• Set up automatic transfers to savings accounts
-
-🔍 EXPENSE AUDIT:
-• Cancel unused subscriptions and memberships
-• Negotiate bills (cable, internet, insurance)
-• Shop around for better rates on services
-• Use cashback apps and credit card rewards
-
-💡 SMART SPENDING:
-• Wait 24-48 hours before making purchases over $100
-• Use shopping lists to avoid impulse buys
-• Buy generic brands for non-essential items
-• Cook at home more often to save on dining out
-
-📊 TRACKING TOOLS:
-• Use budgeting apps (Mint, YNAB, Personal Capital)
-• Review bank statements monthly
-• Set spending alerts on credit cards
-• Create monthly spending reports""",
-                'savings': """
-🏦 SAVINGS ACCELERATION STRATEGY:
-
-💰 EMERGENCY FUND:
-• Build 6 months of expenses in high-yield savings
-• Use separate account to avoid temptation
-• Start with $1,000, then build to full amount
-• Consider money market accounts for better rates
-
-🚀 SAVINGS BOOSTERS:
-• Automate transfers on payday
-• Use round-up apps to save spare change
-• Save windfalls (tax refunds, bonuses, gifts)
-• Increase savings by 1% every 6 months
-
-📈 HIGH-YIELD OPTIONS:
-• High-yield savings accounts (3-4% APY)
-• Money market accounts for better rates
-• CDs for guaranteed returns
-• Treasury bills for government-backed security
-
-💡 SAVINGS HACKS:
-• Save first, spend what's left
-• Use multiple accounts for different goals
-• Set up automatic transfers to investment accounts
-• Review and optimize savings rates quarterly""",
-                'credit_score': """
-📊 CREDIT SCORE OPTIMIZATION:
-
-⚡ IMMEDIATE IMPROVEMENTS:
-• Pay all bills on time (35% of score)
-• Keep credit utilization under 30% (30% of score)
-• Don't close old credit accounts
-• Avoid opening new credit accounts frequently
-
-🔧 CREDIT REPAIR:
-• Dispute errors on credit reports
-• Request credit limit increases
-• Become authorized user on good accounts
-• Consider secured credit cards if rebuilding
-
-📈 SCORE BUILDING:
-• Use credit cards responsibly and pay in full
-• Keep oldest accounts open
-• Mix of credit types (cards, loans, mortgage)
-• Monitor credit reports regularly
-
-⚠️ AVOID THESE MISTAKES:
-• Don't max out credit cards
-• Don't apply for multiple credit accounts
-• Don't close accounts with long history
-• Don't ignore credit report errors"""
-            },
-            'hi': {
-                'assets': """
-🚀 मजबूत वित्तीय सुझाव:
-
-💰 संपत्ति अनुकूलन:
-• 4 परिसंपत्ति वर्गों में विविधता: स्टॉक (40%), बॉन्ड (30%), रियल एस्टेट (20%), नकद (10%)
-• आपातकालीन फंड बनाएं: उच्च-उपज बचत खाते में 6 महीने का खर्च
-• अतिरिक्त नकदी का निवेश: 7-10% वार्षिक रिटर्न के लिए इंडेक्स फंड
-• त्रैमासिक रूप से संपत्ति आवंटन की समीक्षा करें
-
-📈 वृद्धि रणनीतियां:
-• निरंतर निवेश के लिए डॉलर-कॉस्ट एवरेजिंग
-• सेवानिवृत्ति के लिए कर-लाभ खाते (401k, IRA)
-• संपत्ति प्रबंधन के बिना रियल एस्टेट एक्सपोजर के लिए REITs
-• भावनात्मक निर्णय लेने से बचने के लिए निवेश को स्वचालित करें
-
-⚠️ जोखिम प्रबंधन:
-• जितना खो सकते हैं उससे अधिक कभी निवेश न करें
-• तरल संपत्ति में 3-6 महीने का खर्च रखें
-• प्रमुख संपत्तियों के लिए बीमा पर विचार करें""",
-                'liabilities': """
-🔥 कर्ज उन्मूलन रणनीति:
-
-⚡ तत्काल कार्य:
-• सभी कर्ज को ब्याज दर के अनुसार सूचीबद्ध करें (उच्चतम पहले)
-• सबसे उच्च ब्याज वाले को छोड़कर सभी कर्ज पर न्यूनतम भुगतान
-• हर अतिरिक्त डॉलर को सबसे उच्च ब्याज वाले कर्ज पर लगाएं
-• 0% प्रारंभिक दरों के लिए बैलेंस ट्रांसफर कार्ड पर विचार करें
-
-💳 क्रेडिट कार्ड कर्ज:
-• कर्ज-मुक्त होने तक क्रेडिट कार्ड का उपयोग बंद करें
-• कर्जदाताओं के साथ कम ब्याज दरों पर बातचीत करें
-• यदि दर कम है तो कर्ज समेकन ऋण पर विचार करें
-• नए कर्ज को रोकने के लिए नकद या डेबिट कार्ड का उपयोग करें
-
-🏠 मॉर्गेज अनुकूलन:
-• ब्याज में हजारों बचाने के लिए साप्ताहिक भुगतान करें
-• यदि दरें 0.5% या अधिक गिरती हैं तो पुनर्वित्त पर विचार करें
-• जब संभव हो तो अतिरिक्त मूलधन का भुगतान करें""",
-                'investments': """
-🎯 निवेश महारत योजना:
-
-📊 पोर्टफोलियो निर्माण:
-• 60% स्टॉक (40% US, 20% अंतर्राष्ट्रीय)
-• 30% बॉन्ड (सरकारी और कॉर्पोरेट)
-• 10% वैकल्पिक निवेश (REITs, कमोडिटीज)
-• लक्ष्य आवंटन बनाए रखने के लिए त्रैमासिक रूप से पुनः संतुलित करें
-
-💡 निवेश रणनीतियां:
-• कम लागत वाले इंडेक्स फंड (VTI, VXUS, BND) से शुरुआत करें
-• कर बोझ कम करने के लिए टैक्स-लॉस हार्वेस्टिंग का उपयोग करें
-• स्वचालित प्रबंधन के लिए रोबो-सलाहकारों पर विचार करें
-• पहले कर-लाभ खातों में निवेश करें (401k, IRA)
-
-🚀 वृद्धि त्वरण:
-• हर 6 महीने में योगदान 1% बढ़ाएं
-• नियोक्ता 401k मिलान का लाभ उठाएं
-• कर-मुक्त वृद्धि के लिए रोथ IRA पर विचार करें""",
-                'spending': """
-💸 खर्च अनुकूलन खाका:
-
-📋 बजट महारत:
-• 50/30/20 नियम का उपयोग करें: 50% जरूरतें, 30% चाहतें, 20% बचत
-• पैटर्न की पहचान के लिए 30 दिनों तक हर खर्च को ट्रैक करें
-• विवेकाधीन खर्च के लिए लिफाफा विधि का उपयोग करें
-• बचत खातों में स्वचालित ट्रांसफर सेट करें
-
-🔍 खर्च ऑडिट:
-• अनुपयोगी सब्सक्रिप्शन और सदस्यताएं रद्द करें
-• बिलों पर बातचीत करें (केबल, इंटरनेट, बीमा)
-• सेवाओं के लिए बेहतर दरों की तलाश करें
-• कैशबैक ऐप्स और क्रेडिट कार्ड रिवार्ड्स का उपयोग करें""",
-                'savings': """
-🏦 बचत त्वरण रणनीति:
-
-💰 आपातकालीन फंड:
-• उच्च-उपज बचत में 6 महीने का खर्च बनाएं
-• प्रलोभन से बचने के लिए अलग खाते का उपयोग करें
-• $1,000 से शुरुआत करें, फिर पूरी राशि तक बनाएं
-• बेहतर दरों के लिए मनी मार्केट खातों पर विचार करें
-
-🚀 बचत बूस्टर:
-• वेतन दिवस पर स्वचालित ट्रांसफर
-• स्पेयर चेंज बचाने के लिए राउंड-अप ऐप्स
-• विंडफॉल्स बचाएं (टैक्स रिफंड, बोनस, उपहार)
-• हर 6 महीने में बचत 1% बढ़ाएं""",
-                'credit_score': """
-📊 क्रेडिट स्कोर अनुकूलन:
-
-⚡ तत्काल सुधार:
-• सभी बिल समय पर भुगतान करें (स्कोर का 35%)
-• क्रेडिट उपयोग 30% से कम रखें (स्कोर का 30%)
-• पुराने क्रेडिट खाते बंद न करें
-• नए क्रेडिट खाते बार-बार न खोलें
-
-🔧 क्रेडिट मरम्मत:
-• क्रेडिट रिपोर्ट में त्रुटियों का विवाद करें
-• क्रेडिट सीमा बढ़ाने का अनुरोध करें
-• अच्छे खातों पर अधिकृत उपयोगकर्ता बनें
-• यदि पुनर्निर्माण कर रहे हैं तो सुरक्षित क्रेडिट कार्ड पर विचार करें"""
-            },
-            'gu': {
-                'assets': """
-🚀 મજબૂત નાણાકીય સૂચનો:
-
-💰 સંપત્તિ ઑપ્ટિમાઇઝેશન:
-• 4 સંપત્તિ વર્ગોમાં વિવિધતા: સ્ટોક (40%), બોન્ડ (30%), રિયલ એસ્ટેટ (20%), રોકડ (10%)
-• આપત્તિકાળીન ફંડ બનાવો: ઉચ્ચ-ઉપજ બચત ખાતામાં 6 મહિના ખર્ચ
-• વધારાના રોકડનું રોકાણ: 7-10% વાર્ષિક રિટર્ન માટે ઇન્ડેક્સ ફંડ
-• ત્રૈમાસિક રીતે સંપત્તિ ફાળવણીની સમીક્ષા કરો
-
-📈 વૃદ્ધિ વ્યૂહરચના:
-• સતત રોકાણ માટે ડોલર-કોસ્ટ એવરેજિંગ
-• નિવૃત્તિ માટે કર-લાભ ખાતા (401k, IRA)
-• મિલકત વ્યવસ્થાપન વગર રિયલ એસ્ટેટ એક્સપોઝર માટે REITs
-• ભાવનાત્મક નિર્ણય લેવાથી બચવા માટે રોકાણને સ્વચાલિત કરો""",
-                'liabilities': """
-🔥 દેવું ઉન્મૂલન વ્યૂહરચના:
-
-⚡ તાત્કાલિક ક્રિયાઓ:
-• બધા દેવા ને વ્યાજ દર અનુસાર યાદી બનાવો (સૌથી વધુ પહેલા)
-• સૌથી વધુ વ્યાજવાળા સિવાય બધા દેવા પર લઘુત્તમ ચૂકવણી
-• દરેક વધારાના ડોલરને સૌથી વધુ વ્યાજવાળા દેવા પર મૂકો
-• 0% પ્રારંભિક દરો માટે બેલેન્સ ટ્રાન્સફર કાર્ડ પર વિચાર કરો
-
-💳 ક્રેડિટ કાર્ડ દેવું:
-• દેવું-મુક્ત થાય ત્યાં સુધી ક્રેડિટ કાર્ડનો ઉપયોગ બંધ કરો
-• લેન્ડર્સ સાથે ઓછા વ્યાજ દરો પર વાટાઘાટ કરો
-• જો દર ઓછો હોય તો દેવું એકીકરણ લોન પર વિચાર કરો
-• નવા દેવુંને રોકવા માટે રોકડ અથવા ડેબિટ કાર્ડનો ઉપયોગ કરો""",
-                'investments': """
-🎯 રોકાણ મહારત યોજના:
-
-📊 પોર્ટફોલિયો નિર્માણ:
-• 60% સ્ટોક (40% US, 20% આંતરરાષ્ટ્રીય)
-• 30% બોન્ડ (સરકારી અને કોર્પોરેટ)
-• 10% વૈકલ્પિક રોકાણ (REITs, કમોડિટીઝ)
-• લક્ષ્ય ફાળવણી જાળવવા માટે ત્રૈમાસિક રીતે પુનઃસંતુલિત કરો
-
-💡 રોકાણ વ્યૂહરચના:
-• ઓછા ખર્ચાળ ઇન્ડેક્સ ફંડ (VTI, VXUS, BND) થી શરૂઆત કરો
-• કર બોજ ઘટાડવા માટે ટેક્સ-લોસ હાર્વેસ્ટિંગનો ઉપયોગ કરો
-• સ્વચાલિત વ્યવસ્થાપન માટે રોબો-સલાહકારો પર વિચાર કરો
-• પહેલા કર-લાભ ખાતાઓમાં રોકાણ કરો (401k, IRA)""",
-                'spending': """
-💸 ખર્ચ ઑપ્ટિમાઇઝેશન બ્લુપ્રિન્ટ:
-
-📋 બજેટ મહારત:
-• 50/30/20 નિયમનો ઉપયોગ કરો: 50% જરૂરિયાતો, 30% ઇચ્છાઓ, 20% બચત
-• પેટર્ન ઓળખવા માટે 30 દિવસ સુધી દરેક ખર્ચને ટ્રેક કરો
-• વિવેકાધિન ખર્ચ માટે લિફાફો પદ્ધતિનો ઉપયોગ કરો
-• બચત ખાતાઓમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
-
-🔍 ખર્ચ ઓડિટ:
-• અનુપયોગી સબ્સ્ક્રિપ્શન અને સભ્યતાઓ રદ્દ કરો
-• બિલો પર વાટાઘાટ કરો (કેબલ, ઇન્ટરનેટ, વીમો)
-• સેવાઓ માટે વધુ સારા દરો શોધો
-• કેશબેક એપ્સ અને ક્રેડિટ કાર્ડ રિવાર્ડ્સનો ઉપયોગ કરો""",
-                'savings': """
-🏦 બચત ત્વરણ વ્યૂહરચના:
-
-💰 આપત્તિકાળીન ફંડ:
-• ઉચ્ચ-ઉપજ બચતમાં 6 મહિના ખર્ચ બનાવો
-• પ્રલોભનથી બચવા માટે અલગ ખાતાનો ઉપયોગ કરો
-• $1,000 થી શરૂઆત કરો, પછી સંપૂર્ણ રકમ સુધી બનાવો
-• વધુ સારા દરો માટે મની માર્કેટ ખાતાઓ પર વિચાર કરો""",
-                'credit_score': """
-📊 ક્રેડિટ સ્કોર ઑપ્ટિમાઇઝેશન:
-
-⚡ તાત્કાલિક સુધારા:
-• બધા બિલ સમયસર ચૂકવો (સ્કોરનો 35%)
-• ક્રેડિટ ઉપયોગ 30% થી ઓછો રાખો (સ્કોરનો 30%)
-• જૂના ક્રેડિટ ખાતા બંધ ન કરો
-• નવા ક્રેડિટ ખાતા વારંવાર ન ખોલો
-
-🔧 ક્રેડિટ મરમ્મત:
-• ક્રેડિટ રિપોર્ટમાં ભૂલોનો વિવાદ કરો
-• ક્રેડિટ મર્યાદા વધારવાની વિનંતી કરો
-• સારા ખાતાઓ પર અધિકૃત વપરાશકર્તા બનો
-• જો પુનઃનિર્માણ કરી રહ્યા છો તો સુરક્ષિત ક્રેડિટ કાર્ડ પર વિચાર કરો"""
-            }
-        }
-        return recommendations.get(lang, recommendations['en']).get(category, "")
+    # Every intent of the query in one pass, from tokens of its language or English
+    intents = INTENT_MATCHER.intents(query_lower, (lang, 'en'))
     
     # Generate insights for the current query if it's an insights request
-    if "insight" in query_lower or "analyze" in query_lower or "predict" in query_lower:
+    if 'analysis' in intents:
         insights = generate_insights(filtered_data, accessible_data, lang)
         if insights:
             insight_text = "\n\n🔍 AI INSIGHTS:\n\n"
@@ -1048,27 +1606,27 @@ def get_fallback_response(query, filtered_data, accessible_data, lang_override:
             return M['info_na'] + "\n\nNo insights available based on your current data access permissions."
     
     # Assets queries
-    if any_in('assets'):
+    if 'assets' in intents:
         if 'assets' in filtered_data:
             assets = filtered_data['assets']
             base_response = ""
-            if any_in('total'):
+            if 'total' in intents:
                 base_response = M['assets_total'].format(assets['total_assets'])
-            elif any_in('cash'):
+            elif 'cash' in intents:
                 base_response = M['cash'].format(assets['cash'])
-            elif any_in('bank'):
+            elif 'bank' in intents:
                 base_response = M['bank'].format(assets['bank_balance'])
-            elif any_in('property'):
+            elif 'property' in intents:
                 base_response = M['property'].format(assets['property_value'])
             else:
                 base_response = M['assets_list'].format(cash=assets['cash'], bank=assets['bank_balance'], property=assets['property_value'], total=assets['total_assets'])
             
-            return base_response + get_recommendations('assets', lang)
+            return base_response + template('advice.assets', lang)
         else:
             return M['info_na']
     
     # Debt repayment strategy (What's my best option for repaying my loan faster?)
-    elif ("loan" in query_lower or "pay" in query_lower or "faster" in query_lower or any_in('liabilities')):
+    elif 'payoff' in intents or 'liabilities' in intents:
         if 'liabilities' in filtered_data:
             # Get debt information
             credit_card_debt = filtered_data['liabilities']['credit_card_debt']
@@ -1077,9 +1635,12 @@ def get_fallback_response(query, filtered_data, accessible_data, lang_override:
             total_high_priority_debt = credit_card_debt + personal_loan
             
             # Calculate available funds for debt payment
-            if 'budget' in filtered_data:
-                monthly_income = filtered_data['budget']['monthly_income']
-                monthly_expenses = filtered_data['budget']['total_budgeted_expenses']
+            # Without a surplus (expenses at or above income) the plan below would
+            # divide by zero or come out in negative months, so such budgets get
+            # the default estimate as well
+            monthly_budget = get_monthly_budget(filtered_data)
+            if monthly_budget and monthly_budget[0] > monthly_budget[1]:
+                monthly_income, monthly_expenses = monthly_budget
                 monthly_surplus = monthly_income - monthly_expenses
             else:
                 # Fallback: estimate based on typical ratios
@@ -1098,207 +1659,37 @@ def get_fallback_response(query, filtered_data, accessible_data, lang_override:
             alt_phase2 = personal_loan / monthly_surplus
             alt_total = alt_phase1 + alt_phase2
             
-            if lang == 'hi':
-                return f"""💳 कर्ज चुकौती रणनीति विश्लेषण:
-
-📊 वर्तमान कर्ज स्थिति:
-• क्रेडिट कार्ड कर्ज: ${credit_card_debt:,}
-• पर्सनल लोन: ${personal_loan:,}
-• मॉर्गेज: ${mortgage:,} (दीर्घकालिक, कम प्राथमिकता)
-• कुल उच्च-प्राथमिकता कर्ज: ${total_high_priority_debt:,}
-
-💰 उपलब्ध मासिक भुगतान: ${monthly_surplus:,}
-
-🎯 अनुशंसित रणनीति: उन्नत स्नोबॉल विधि
-
-चरण 1 (महीने 1–{phase1_months:.1f}):
-• क्रेडिट कार्ड पर ${monthly_surplus + 250:,}/माह चुकाएँ
-• अस्थायी रूप से आपातकालीन फंड से $250 उपयोग करें
-• ${credit_card_debt:,} क्रेडिट कार्ड कर्ज समाप्त करें
-
-चरण 2 (महीने {phase1_months:.1f}–{total_months:.1f}):
-• पर्सनल लोन पर ${monthly_surplus:,}/माह चुकाएँ
-• ${personal_loan:,} पर्सनल लोन समाप्त करें
-
-⏱️ कर्ज-मुक्त कुल समय: {total_months:.1f} महीने
-
-💡 यह क्यों काम करता है:
-1) त्वरित मनोवैज्ञानिक जीत (पहले क्रेडिट कार्ड) 2) उच्च ब्याज की बचत 3) निरंतर कमी के लिए गति 4) आपातकालीन फंड सुरक्षित रहता है
-
-🚀 वैकल्पिक: संयमित तरीका
-• क्रेडिट कार्ड पर ${monthly_surplus:,}/माह: {alt_phase1:.1f} महीने
-• फिर पर्सनल लोन पर ${monthly_surplus:,}/माह: {alt_phase2:.1f} महीने
-• कुल समय: {alt_total:.1f} महीने"""
-            elif lang == 'gu':
-                return f"""💳 દેવું ચુકવણી વ્યૂહરચના વિશ્લેષણ:
-
-📊 વર્તમાન દેવું સ્થિતિ:
-• ક્રેડિટ કાર્ડ દેવું: ${credit_card_debt:,}
-• પર્સનલ લોન: ${personal_loan:,}
-• મોર્ટગેજ: ${mortgage:,} (દીર્ઘકાલીન, ઓછી પ્રાથમિકતા)
-• કુલ ઉચ્ચ-પ્રાથમિકતા દેવું: ${total_high_priority_debt:,}
-
-💰 ઉપલબ્ધ માસિક ચુકવણી: ${monthly_surplus:,}
-
-🎯 ભલામણ કરેલ વ્યૂહરચના: સુધારેલી સ્નોબોલ પદ્ધતિ
-
-ચરણ 1 (મહિના 1–{phase1_months:.1f}):
-• ક્રેડિટ કાર્ડ પર ${monthly_surplus + 250:,}/મહિનો ચૂકવો
-• તાત્કાલિક રીતે ઈમરજન્સી ફંડમાંથી $250 વાપરો
-• ${credit_card_debt:,} ક્રેડિટ કાર્ડ દેવું ચૂકવી દો
-
-ચરણ 2 (મહિના {phase1_months:.1f}–{total_months:.1f}):
-• પર્સનલ લોન પર ${monthly_surplus:,}/મહિનો ચૂકવો
-• ${personal_loan:,} પર્સનલ લોન ચૂકવી દો
-
-⏱️ દેવું-મુક્ત કુલ સમય: {total_months:.1f} મહિના
-
-💡 કેમ કામ કરે છે:
-1) ઝડપી માનસિક જીત (પહેલાં ક્રેડિટ કાર્ડ) 2) ઉચ્ચ વ્યાજમાં બચત 3) સતત ઘટાડા માટે ગતિ 4) ઈમરજન્સી ફંડ સુરક્ષિત રહે છે
-
-🚀 વિકલ્પ: કન્ઝર્વેટિવ અભિગમ
-• ક્રેડિટ કાર્ડ પર ${monthly_surplus:,}/મહિનો: {alt_phase1:.1f} મહિના
-• પછી પર્સનલ લોન પર ${monthly_surplus:,}/મહિનો: {alt_phase2:.1f} મહિના
-• કુલ સમય: {alt_total:.1f} મહિના"""
-            else:
-                return f"""💳 DEBT REPAYMENT STRATEGY ANALYSIS:
-
-📊 CURRENT DEBT SITUATION:
-• Credit Card Debt: ${credit_card_debt:,}
-• Personal Loan: ${personal_loan:,}
-• Mortgage: ${mortgage:,} (long-term, low priority)
-• Total High-Priority Debt: ${total_high_priority_debt:,}
-
-💰 AVAILABLE MONTHLY PAYMENT: ${monthly_surplus:,}
-
-🎯 RECOMMENDED STRATEGY: Enhanced Snowball Method
-
-PHASE 1 (Months 1-{phase1_months:.1f}):
-• Pay ${monthly_surplus + 250:,}/month on Credit Card
-• Use $250 from emergency fund temporarily
-• Pay off ${credit_card_debt:,} credit card debt
-
-PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
-• Pay ${monthly_surplus:,}/month on Personal Loan
-• Pay off ${personal_loan:,} personal loan
-
-⏱️ TOTAL TIME TO DEBT-FREE: {total_months:.1f} months
-
-💡 WHY THIS WORKS:
-1. Quick psychological win (credit card paid first)
-2. Saves on high-interest credit card charges
-3. Creates momentum for continued debt reduction
-4. Maintains emergency fund for unexpected expenses
-
-🚀 ALTERNATIVE: Conservative Approach
-• Pay ${monthly_surplus:,}/month on credit card: {alt_phase1:.1f} months
-• Then pay ${monthly_surplus:,}/month on personal loan: {alt_phase2:.1f} months
-• Total time: {alt_total:.1f} months"""
+            return render('payoff.plan', lang, credit_card_debt=credit_card_debt, personal_loan=personal_loan,
+                          mortgage=mortgage, total_high_priority_debt=total_high_priority_debt,
+                          monthly_surplus=monthly_surplus, phase1_payment=monthly_surplus + 250,
+                          phase1_months=phase1_months, total_months=total_months,
+                          alt_phase1=alt_phase1, alt_phase2=alt_phase2, alt_total=alt_total)
         else:
             # Provide general loan repayment advice even without specific data
-            if lang == 'hi':
-                return """🔥 कर्ज चुकौती रणनीति (सामान्य मार्गदर्शन):
-
-⚡ तुरंत करें:
-• सभी कर्ज ब्याज दर के अनुसार सूचीबद्ध करें (उच्चतम पहले)
-• सबसे उच्च ब्याज वाले को छोड़कर बाकी पर न्यूनतम भुगतान
-• अतिरिक्त राशि उच्चतम ब्याज वाले कर्ज पर लगाएँ
-• 0% प्रारंभिक दर वाले बैलेंस ट्रांसफर कार्ड पर विचार करें
-
-💳 क्रेडिट कार्ड कर्ज:
-• कर्ज-मुक्त होने तक कार्ड का उपयोग बंद करें
-• उधारदाताओं से कम ब्याज पर बातचीत करें
-• दर कम हो तो कर्ज समेकन ऋण पर विचार करें
-• नया कर्ज रोकने के लिए नकद/डेबिट का उपयोग करें
-
-🏠 मॉर्गेज अनुकूलन:
-• द्वि-साप्ताहिक भुगतान करें
-• दरें 0.5%+ घटें तो रीफाइनेंसिंग पर विचार करें
-• संभव हो तो अतिरिक्त मूलधन चुकाएँ
-
-📊 ट्रैकिंग:
-• कर्ज भुगतान टाइमलाइन कैलकुलेटर का उपयोग करें
-• छोटे मील के पत्थर मनाएँ
-• ऑटो-पे सेट करें ताकि लेट फीस न लगे"""
-            elif lang == 'gu':
-                return """🔥 દેવું ચુકવણી વ્યૂહરચના (સામાન્ય માર્ગદર્શન):
-
-⚡ તરત કરો:
-• બધા દેવા ને વ્યાજદર મુજબ યાદીબદ્ધ કરો (સૌથી વધુ પહેલા)
-• સૌથી વધુ વ્યાજવાળા સિવાય બાકીના પર લઘુત્તમ ચુકવણી
-• વધારાની રકમ સૌથી વધુ વ્યાજવાળા દેવા પર મૂકો
-• 0% ઇન્ટ્રો રેટ ધરાવતા બેલેન્સ ટ્રાન્સફર કાર્ડ વિચારો
-
-💳 ક્રેડિટ કાર્ડ દેવું:
-• દેવું-મુક્ત થાય ત્યાં સુધી કાર્ડનો ઉપયોગ બંધ કરો
-• લેન્ડર્સ સાથે ઓછા વ્યાજ પર વાટાઘાટ કરો
-• દર ઓછો હોય તો દેવું એકીકરણ લોન વિચારો
-• નવું દેવું ટાળવા કેશ/ડેબિટ વાપરો
-
-🏠 મોર્ગેજ ઑપ્ટિમાઇઝેશન:
-• બાય-વીકલી ચુકવણી કરો
-• દરો 0.5%+ ઘટે તો રિફાઇનાન્સ વિચારો
-• શક્ય હોય તો વધારાનો પ્રિન્સિપલ ચૂકવો
-
-📊 ટ્રેકિંગ:
-• દેવું ચુકવણી સમયરેખા કેલ્ક્યુલેટર વાપરો
-• નાના માઈલસ્ટોન ઉજવો
-• મોડ ફી ટાળવા માટે ઑટો-પે સેટ કરો"""
-            else:
-                return """🔥 DEBT REPAYMENT STRATEGY (GENERAL GUIDANCE):
-
-⚡ IMMEDIATE ACTIONS:
-• List all debts by interest rate (highest first)
-• Pay minimum on all debts except the highest interest one
-• Put every extra dollar toward the highest interest debt
-• Consider balance transfer cards for 0% introductory rates
-
-💳 CREDIT CARD DEBT:
-• Stop using credit cards until debt-free
-• Negotiate lower interest rates with creditors
-• Consider debt consolidation loan if rate is lower
-• Use cash or debit cards to prevent new debt
-
-🏠 MORTGAGE OPTIMIZATION:
-• Make bi-weekly payments to save thousands in interest
-• Consider refinancing if rates drop 0.5% or more
-• Pay extra principal when possible
-• Avoid cash-out refinancing unless absolutely necessary
-
-📊 DEBT TRACKING:
-• Use debt payoff calculator to see timeline
-• Celebrate small wins to stay motivated
-• Consider debt snowball method for psychological wins
-• Set up automatic payments to avoid late fees
-
-💡 PRO TIPS:
-• The debt avalanche method saves the most money
-• The debt snowball method provides psychological wins
-• Consider working extra hours or side gigs for extra payments
-• Track progress monthly to stay motivated"""
+            return template('payoff.general', lang)
     
     # Liabilities queries
-    elif any_in('liabilities'):
+    elif 'liabilities' in intents:
         if 'liabilities' in filtered_data:
             liabilities = filtered_data['liabilities']
             base_response = ""
-            if "total" in query_lower:
+            if 'total' in intents:
                 base_response = M['liab_total'].format(liabilities['total_liabilities'])
-            elif "credit card" in query_lower:
+            elif 'credit_card' in intents:
                 base_response = M['liab_cc'].format(liabilities['credit_card_debt'])
-            elif "personal loan" in query_lower:
+            elif 'personal_loan' in intents:
                 base_response = M['liab_pl'].format(liabilities['personal_loan'])
-            elif "mortgage" in query_lower:
+            elif 'mortgage' in intents:
                 base_response = M['liab_mortgage'].format(liabilities['mortgage'])
             else:
                 base_response = M['liab_list'].format(cc=liabilities['credit_card_debt'], pl=liabilities['personal_loan'], mortgage=liabilities['mortgage'], total=liabilities['total_liabilities'])
             
-            return base_response + get_recommendations('liabilities', lang)
+            return base_response + template('advice.liabilities', lang)
         else:
             return M['info_na']
     
     # Credit Score queries
-    elif any_in('credit_score'):
+    elif 'credit_score' in intents:
         if 'credit_score' in filtered_data:
             credit = filtered_data['credit_score']
             return M['credit_score'].format(score=credit['score'], rating=credit['rating'])
@@ -1306,12 +1697,12 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
             return M['info_na']
     
     # EPF Balance queries
-    elif any_in('epf'):
+    elif 'epf' in intents:
         if 'epf_balance' in filtered_data:
             epf = filtered_data['epf_balance']
-            if "total" in query_lower:
+            if 'total' in intents:
                 return M['epf_total'].format(epf['total_balance'])
-            elif "contribution" in query_lower:
+            elif 'contribution' in intents:
                 return M['epf_contrib'].format(emp=epf['employee_contribution'], er=epf['employer_contribution'])
             else:
                 return M['epf_balance'].format(epf['total_balance'])
@@ -1319,13 +1710,13 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
             return M['info_na']
     
     # Investment queries
-    elif any_in('investments'):
+    elif 'investments' in intents:
         if 'investments' in filtered_data:
             investments = filtered_data['investments']
             base_response = ""
-            if "total" in query_lower:
+            if 'total' in intents:
                 base_response = M['invest_total'].format(investments['total_investment_value'])
-            elif "gain" in query_lower or "loss" in query_lower:
+            elif 'gain_loss' in intents:
                 total_gl = investments.get('total_gain_loss')
                 if total_gl is None:
                     return M['info_na']
@@ -1333,26 +1724,20 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
             else:
                 base_response = M['invest_total'].format(investments['total_investment_value'])
             
-            return base_response + get_recommendations('investments', lang)
+            return base_response + template('advice.investments', lang)
         else:
             return M['info_na']
     
     # Expense analysis (Why did expenses increase last quarter?)
-    elif ("expenses" in query_lower or any_in('expense')) and ("increase" in query_lower or "quarter" in query_lower):
-        if 'transactions' in filtered_data:
+    elif 'expense' in intents and 'trend' in intents:
+        if has_transactions(filtered_data):
             # Analyze transaction data
-            expenses_by_category = {}
-            total_expenses = 0
-            
-            for transaction in filtered_data['transactions']:
-                if transaction['type'] == 'expense':
-                    category = transaction['category']
-                    amount = transaction['amount']
-                    total_expenses += amount
-                    
-                    if category not in expenses_by_category:
-                        expenses_by_category[category] = 0
-                    expenses_by_category[category] += amount
+            summary = get_transaction_summary(filtered_data)
+            total_expenses = summary['total_expenses']
+            expenses_by_category = {
+                category: stats['total']
+                for category, stats in summary['expenses_by_category'].items()
+            }
             
             # Sort categories by amount
             sorted_categories = sorted(expenses_by_category.items(), key=lambda x: x[1], reverse=True)
@@ -1363,48 +1748,34 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
                 percentage = (amount / total_expenses) * 100
                 category_analysis.append(f"• {category.title()}: ${amount:,} ({percentage:.1f}%)")
             
-            return f"""📈 EXPENSE ANALYSIS - LAST QUARTER:
-
-💰 TOTAL EXPENSES: ${total_expenses:,}
-
-🔍 TOP EXPENSE CATEGORIES:
-{chr(10).join(category_analysis[:5])}
-
-⚠️ MAJOR CONTRIBUTORS TO HIGH EXPENSES:
-• Housing: ${expenses_by_category.get('housing', 0):,} - Your largest expense
-• Food: ${expenses_by_category.get('food', 0):,} - High dining out costs
-• Transport: ${expenses_by_category.get('transport', 0):,} - Transportation expenses
-
-💡 RECOMMENDATIONS TO REDUCE EXPENSES:
-1. Review dining out costs (currently ${expenses_by_category.get('food', 0):,})
-2. Optimize housing costs if possible
-3. Track transportation expenses more closely
-4. Consider reducing entertainment spending"""
+            return render('spending.trend', lang, total_expenses=total_expenses,
+                          top_categories='\n'.join(category_analysis[:5]),
+                          housing=expenses_by_category.get('housing', 0),
+                          food=expenses_by_category.get('food', 0),
+                          transport=expenses_by_category.get('transport', 0))
         else:
             return "The requested information is not available in your financial data."
     
     # Transaction queries
-    elif any_in('transactions') or any_in('expense') or any_in('income'):
-        if 'transactions' in filtered_data:
-            transactions = filtered_data['transactions']
+    elif intents & {'transactions', 'expense', 'income'}:
+        if has_transactions(filtered_data):
+            summary = get_transaction_summary(filtered_data)
+            total_expenses = summary['total_expenses']
+            total_income = summary['total_income']
             base_response = ""
-            if any_in('total') and any_in('expense'):
-                total_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
+            if 'total' in intents and 'expense' in intents:
                 base_response = M['tx_exp_total'].format(total_expenses)
-            elif any_in('total') and any_in('income'):
-                total_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
+            elif 'total' in intents and 'income' in intents:
                 base_response = M['tx_inc_total'].format(total_income)
             else:
-                total_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
-                total_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
                 base_response = M['tx_summary'].format(income=total_income, expenses=total_expenses)
             
-            return base_response + get_recommendations('spending', lang)
+            return base_response + template('advice.spending', lang)
         else:
             return M['info_na']
     
     # Net worth queries
-    elif any_in('net_worth'):
+    elif 'net_worth' in intents:
         if 'assets' in filtered_data and 'liabilities' in filtered_data:
             net_worth = filtered_data['assets']['total_assets'] - filtered_data['liabilities']['total_liabilities']
             return M['net_worth'].format(net_worth)
@@ -1412,196 +1783,41 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
             return M['info_na']
     
     # Vacation budget planning and affordability (check before budget to avoid conflicts)
-    elif "vacation" in query_lower or "holiday" in query_lower or "travel" in query_lower or "trip" in query_lower:
-        # Calculate vacation budget based on available data
-        vacation_recommendations = {
-            'en': """
-🏖️ VACATION BUDGET PLANNING GUIDE:
-
-💰 BUDGET CALCULATION:
-• Safe Budget: 10% of monthly income
-• Comfortable Budget: 20% of monthly income  
-• Luxury Budget: 30% of monthly income
-• Emergency Fund: Keep 3-6 months expenses untouched
-
-📊 VACATION AFFORDABILITY ANALYSIS:""",
-            'hi': """
-🏖️ छुट्टी बजट योजना गाइड:
-
-💰 बजट गणना:
-• सुरक्षित बजट: मासिक आय का 10%
-• आरामदायक बजट: मासिक आय का 20%
-• लक्ज़री बजट: मासिक आय का 30%
-• आपातकालीन फंड: 3-6 महीने का खर्च अछूता रखें
-
-📊 छुट्टी वहन क्षमता विश्लेषण:""",
-            'gu': """
-🏖️ રજા બજેટ આયોજન ગાઇડ:
-
-💰 બજેટ ગણતરી:
-• સુરક્ષિત બજેટ: માસિક આવકનો 10%
-• આરામદાયક બજેટ: માસિક આવકનો 20%
-• લક્ઝરી બજેટ: માસિક આવકનો 30%
-• આપત્તિકાળીન ફંડ: 3-6 મહિના ખર્ચ અછૂતા રાખો
-
-📊 રજા વહન ક્ષમતા વિશ્લેષણ:"""
-        }
-        
-        base_recommendation = vacation_recommendations.get(lang, vacation_recommendations['en'])
+    elif 'vacation' in intents:
+        base_recommendation = template('vacation.guide', lang)
         
         # Calculate vacation budget based on available data
-        if 'budget' in filtered_data:
-            monthly_income = filtered_data['budget']['monthly_income']
-            monthly_expenses = filtered_data['budget']['total_budgeted_expenses']
+        monthly_budget = get_monthly_budget(filtered_data)
+        if monthly_budget:
+            monthly_income, monthly_expenses = monthly_budget
             monthly_surplus = monthly_income - monthly_expenses
             
             safe_budget = monthly_income * 0.10
             comfortable_budget = monthly_income * 0.20
             luxury_budget = monthly_income * 0.30
             
-            if lang == 'en':
-                budget_analysis = f"""
-• Monthly Income: ${monthly_income:,}
-• Monthly Expenses: ${monthly_expenses:,}
-• Monthly Surplus: ${monthly_surplus:,}
-
-🎯 RECOMMENDED VACATION BUDGETS:
-• Safe Budget: ${safe_budget:,.0f} (10% of income)
-• Comfortable Budget: ${comfortable_budget:,.0f} (20% of income)
-• Luxury Budget: ${luxury_budget:,.0f} (30% of income)
-
-💡 VACATION SAVING STRATEGIES:
-• Start saving 6 months before your trip
-• Set up automatic transfers to vacation fund
-• Cut back on dining out and entertainment
-• Use travel rewards credit cards
-• Book flights and hotels in advance for discounts
-• Consider off-season travel for better deals
-• Look for package deals and group discounts
-
-🚀 MONEY-SAVING TIPS:
-• Use price comparison websites (Kayak, Skyscanner)
-• Book accommodations with kitchen facilities
-• Cook some meals instead of eating out
-• Use public transportation instead of taxis
-• Look for free activities and attractions
-• Consider alternative destinations with lower costs
-
-⚠️ IMPORTANT REMINDERS:
-• Don't use emergency fund for vacation
-• Pay off high-interest debt before vacation
-• Set a strict budget and stick to it
-• Consider travel insurance for expensive trips
-• Have a backup plan for unexpected expenses"""
-            elif lang == 'hi':
-                budget_analysis = f"""
-• मासिक आय: ${monthly_income:,}
-• मासिक खर्च: ${monthly_expenses:,}
-• मासिक अधिशेष: ${monthly_surplus:,}
-
-🎯 अनुशंसित छुट्टी बजट:
-• सुरक्षित बजट: ${safe_budget:,.0f} (आय का 10%)
-• आरामदायक बजट: ${comfortable_budget:,.0f} (आय का 20%)
-• लक्ज़री बजट: ${luxury_budget:,.0f} (आय का 30%)
-
-💡 छुट्टी बचत रणनीतियां:
-• यात्रा से 6 महीने पहले बचत शुरू करें
-• छुट्टी फंड में स्वचालित ट्रांसफर सेट करें
-• बाहर खाने और मनोरंजन में कटौती करें
-• ट्रैवल रिवार्ड्स क्रेडिट कार्ड का उपयोग करें
-• छूट के लिए फ्लाइट और होटल पहले बुक करें"""
-            else:  # Gujarati
-                budget_analysis = f"""
-• માસિક આવક: ${monthly_income:,}
-• માસિક ખર્ચ: ${monthly_expenses:,}
-• માસિક વધારાની રકમ: ${monthly_surplus:,}
-
-🎯 ભલામણ કરેલ રજા બજેટ:
-• સુરક્ષિત બજેટ: ${safe_budget:,.0f} (આવકનો 10%)
-• આરામદાયક બજેટ: ${comfortable_budget:,.0f} (આવકનો 20%)
-• લક્ઝરી બજેટ: ${luxury_budget:,.0f} (આવકનો 30%)
-
-💡 રજા બચત વ્યૂહરચના:
-• તમારી યાત્રાથી 6 મહિના પહેલા બચત શરૂ કરો
-• રજા ફંડમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
-• બહાર ખાવા અને મનોરંજનમાં કટોકટી કરો
-• ટ્રાવેલ રિવાર્ડ્સ ક્રેડિટ કાર્ડનો ઉપયોગ કરો"""
+            budget_analysis = render('vacation.budget', lang, monthly_income=monthly_income,
+                                     monthly_expenses=monthly_expenses, monthly_surplus=monthly_surplus,
+                                     safe_budget=safe_budget, comfortable_budget=comfortable_budget,
+                                     luxury_budget=luxury_budget)
         else:
             # Fallback when budget data is not available
-            if lang == 'en':
-                budget_analysis = """
-🎯 GENERAL VACATION BUDGET GUIDELINES:
-
-💰 BUDGET CALCULATION RULES:
-• Safe Budget: 10% of monthly income
-• Comfortable Budget: 20% of monthly income
-• Luxury Budget: 30% of monthly income
-
-💡 VACATION SAVING STRATEGIES:
-• Start saving 6 months before your trip
-• Set up automatic transfers to vacation fund
-• Cut back on dining out and entertainment
-• Use travel rewards credit cards
-• Book flights and hotels in advance for discounts
-• Consider off-season travel for better deals
-
-🚀 MONEY-SAVING TIPS:
-• Use price comparison websites (Kayak, Skyscanner)
-• Book accommodations with kitchen facilities
-• Cook some meals instead of eating out
-• Use public transportation instead of taxis
-• Look for free activities and attractions
-• Consider alternative destinations with lower costs
-
-⚠️ IMPORTANT REMINDERS:
-• Don't use emergency fund for vacation
-• Pay off high-interest debt before vacation
-• Set a strict budget and stick to it
-• Consider travel insurance for expensive trips"""
-            elif lang == 'hi':
-                budget_analysis = """
-🎯 सामान्य छुट्टी बजट दिशानिर्देश:
-
-💰 बजट गणना नियम:
-• सुरक्षित बजट: मासिक आय का 10%
-• आरामदायक बजट: मासिक आय का 20%
-• लक्ज़री बजट: मासिक आय का 30%
-
-💡 छुट्टी बचत रणनीतियां:
-• यात्रा से 6 महीने पहले बचत शुरू करें
-• छुट्टी फंड में स्वचालित ट्रांसफर सेट करें
-• बाहर खाने और मनोरंजन में कटौती करें
-• ट्रैवल रिवार्ड्स क्रेडिट कार्ड का उपयोग करें"""
-            else:  # Gujarati
-                budget_analysis = """
-🎯 સામાન્ય રજા બજેટ માર્ગદર્શન:
-
-💰 બજેટ ગણતરી નિયમો:
-• સુરક્ષિત બજેટ: માસિક આવકનો 10%
-• આરામદાયક બજેટ: માસિક આવકનો 20%
-• લક્ઝરી બજેટ: માસિક આવકનો 30%
-
-💡 રજા બચત વ્યૂહરચના:
-• તમારી યાત્રાથી 6 મહિના પહેલા બચત શરૂ કરો
-• રજા ફંડમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
-• બહાર ખાવા અને મનોરંજનમાં કટોકટી કરો"""
+            budget_analysis = template('vacation.general', lang)
         
         return base_recommendation + budget_analysis
     
     # Enhanced Budget Creation and Management
-    elif any_in('budget') or 'create budget' in query_lower or 'budget template' in query_lower:
+    elif 'budget' in intents:
         # Calculate budget based on available data
         monthly_income = 0
         monthly_expenses = 0
         
         # Extract income from transactions if available
-        if 'transactions' in filtered_data:
-            transactions = filtered_data['transactions']
-            for transaction in transactions:
-                if transaction.get('type') == 'income':
-                    monthly_income += transaction.get('amount', 0)
-                elif transaction.get('type') == 'expense':
-                    monthly_expenses += transaction.get('amount', 0)
+        if has_transactions(filtered_data):
+            averages = get_monthly_averages(filtered_data)
+            if averages:
+                monthly_income = averages['income']
+                monthly_expenses = averages['expenses']
         
         # If no transaction data, use mock data for demonstration
         if monthly_income == 0:
@@ -1613,121 +1829,27 @@ PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
         wants_budget = monthly_income * 0.30    # 30% for wants
         savings_budget = monthly_income * 0.20 # 20% for savings/debt
         
-        direct_answer = f"Yes, I can help you create a comprehensive budget! Based on your financial data, here's your personalized budget."
-        
-        explanation = f"""A budget helps you allocate your income effectively and achieve financial goals. With a monthly income of ₹{monthly_income:,}, here's the recommended allocation using the proven 50/30/20 rule."""
-        
-        recommendations = f"""1. 🏠 NEEDS (50% = ₹{needs_budget:,}):
-   • Housing: ₹{needs_budget * 0.4:,.0f} (rent/mortgage)
-   • Utilities: ₹{needs_budget * 0.15:,.0f} (electricity, water, internet)
-   • Groceries: ₹{needs_budget * 0.25:,.0f} (food essentials)
-   • Transportation: ₹{needs_budget * 0.15:,.0f} (fuel, public transport)
-   • Insurance: ₹{needs_budget * 0.05:,.0f} (health, auto)
-
-2. 🎯 WANTS (30% = ₹{wants_budget:,}):
-   • Entertainment: ₹{wants_budget * 0.3:,.0f} (movies, dining out)
-   • Hobbies: ₹{wants_budget * 0.2:,.0f} (personal interests)
-   • Shopping: ₹{wants_budget * 0.3:,.0f} (clothes, gadgets)
-   • Travel: ₹{wants_budget * 0.2:,.0f} (vacations, trips)
-
-3. 💰 SAVINGS & DEBT (20% = ₹{savings_budget:,}):
-   • Emergency Fund: ₹{savings_budget * 0.4:,.0f}
-   • Debt Payment: ₹{savings_budget * 0.4:,.0f}
-   • Investments: ₹{savings_budget * 0.2:,.0f}"""
-        
-        follow_up = "Would you like me to create a detailed monthly budget template, help you track expenses, or suggest ways to increase your savings rate?"
-        
-        return format_structured_response(direct_answer, explanation, recommendations, follow_up)
+        return render('budget.plan', lang, monthly_income=monthly_income,
+                      needs_budget=needs_budget, housing=needs_budget * 0.4, utilities=needs_budget * 0.15,
+                      groceries=needs_budget * 0.25, transportation=needs_budget * 0.15, insurance=needs_budget * 0.05,
+                      wants_budget=wants_budget, entertainment=wants_budget * 0.3, hobbies=wants_budget * 0.2,
+                      shopping=wants_budget * 0.3, travel=wants_budget * 0.2,
+                      savings_budget=savings_budget, emergency_fund=savings_budget * 0.4,
+                      debt_payment=savings_budget * 0.4, investments=savings_budget * 0.2)
     
     else:
-        # Provide strong general financial guidance for any query
-        general_recommendations = {
-            'en': """
-🎯 COMPREHENSIVE FINANCIAL GUIDANCE:
-
-💰 IMMEDIATE ACTIONS YOU CAN TAKE:
-• Create a budget using the 50/30/20 rule (needs/wants/savings)
-• Build an emergency fund of 3-6 months expenses
-• Pay off high-interest debt first (credit cards)
-• Start investing in low-cost index funds
-
-📊 FINANCIAL HEALTH CHECKLIST:
-• Track all expenses for 30 days
-• Review and optimize all subscriptions
-• Negotiate better rates on bills
-• Set up automatic savings transfers
-
-🚀 LONG-TERM WEALTH BUILDING:
-• Maximize employer 401k matching
-• Invest in tax-advantaged accounts (IRA, 401k)
-• Diversify investments across asset classes
-• Review and rebalance portfolio quarterly
-
-⚠️ COMMON MISTAKES TO AVOID:
-• Don't invest money you need within 5 years
-• Don't try to time the market
-• Don't ignore high-interest debt
-• Don't skip emergency fund building
-
-💡 PRO TIPS:
-• Automate everything possible (savings, investments, bill payments)
-• Use cashback apps and credit card rewards
-• Consider robo-advisors for hands-off investing
-• Review financial goals and progress monthly""",
-            'hi': """
-🎯 व्यापक वित्तीय मार्गदर्शन:
-
-💰 आप तुरंत कर सकते हैं:
-• 50/30/20 नियम का उपयोग करके बजट बनाएं (जरूरतें/चाहतें/बचत)
-• 3-6 महीने के खर्च का आपातकालीन फंड बनाएं
-• पहले उच्च ब्याज वाले कर्ज चुकाएं (क्रेडिट कार्ड)
-• कम लागत वाले इंडेक्स फंड में निवेश शुरू करें
-
-📊 वित्तीय स्वास्थ्य चेकलिस्ट:
-• 30 दिनों तक सभी खर्चों को ट्रैक करें
-• सभी सब्सक्रिप्शन की समीक्षा और अनुकूलन करें
-• बिलों पर बेहतर दरों पर बातचीत करें
-• स्वचालित बचत ट्रांसफर सेट करें
-
-🚀 दीर्घकालिक धन निर्माण:
-• नियोक्ता 401k मिलान को अधिकतम करें
-• कर-लाभ खातों में निवेश करें (IRA, 401k)
-• परिसंपत्ति वर्गों में निवेश को विविधता दें
-• त्रैमासिक रूप से पोर्टफोलियो की समीक्षा करें""",
-            'gu': """
-🎯 વ્યાપક નાણાકીય માર્ગદર્શન:
-
-💰 તમે તરત જ કરી શકો છો:
-• 50/30/20 નિયમનો ઉપયોગ કરીને બજેટ બનાવો (જરૂરિયાતો/ઇચ્છાઓ/બચત)
-• 3-6 મહિના ખર્ચનો આપત્તિકાળીન ફંડ બનાવો
-• પહેલા ઉચ્ચ વ્યાજવાળા દેવા ચૂકવો (ક્રેડિટ કાર્ડ)
-• ઓછા ખર્ચાળ ઇન્ડેક્સ ફંડમાં રોકાણ શરૂ કરો
-
-📊 નાણાકીય સ્વાસ્થ્ય ચેકલિસ્ટ:
-• 30 દિવસ સુધી બધા ખર્ચને ટ્રેક કરો
-• બધા સબ્સ્ક્રિપ્શનની સમીક્ષા અને ઑપ્ટિમાઇઝેશન કરો
-• બિલો પર વધુ સારા દરો પર વાટાઘાટ કરો
-• સ્વચાલિત બચત ટ્રાન્સફર સેટ કરો
-
-🚀 લાંબા ગાળાના ધન નિર્માણ:
-• નિયામક 401k મેચિંગને મહત્તમ કરો
-• કર-લાભ ખાતાઓમાં રોકાણ કરો (IRA, 401k)
-• પરિસંપત્તિ વર્ગોમાં રોકાણને વિવિધતા આપો
-• ત્રૈમાસિક રીતે પોર્ટફોલિયોની સમીક્ષા કરો"""
-        }
-        
-        return general_recommendations.get(lang, general_recommendations['en'])
+        return template('general', lang)
 
 def generate_insights(user_data, accessible_data, lang):
     """Generate AI-powered insights based on accessible data"""
     insights = []
-    M = AI_MSG.get(lang, AI_MSG['en'])
+    M = catalogs.get(lang).messages
     
     # Predictive Savings Analysis
-    if accessible_data.get('transactions') and 'transactions' in user_data:
-        transactions = user_data['transactions']
-        monthly_income = sum(t['amount'] for t in transactions if t['type'] == 'income')
-        monthly_expenses = sum(t['amount'] for t in transactions if t['type'] == 'expense')
+    if accessible_data.get('transactions') and has_transactions(user_data):
+        averages = get_monthly_averages(user_data) or {'income': 0, 'expenses': 0}
+        monthly_income = averages['income']
+        monthly_expenses = averages['expenses']
         monthly_surplus = monthly_income - monthly_expenses
         
         if monthly_surplus > 0:
@@ -1744,21 +1866,14 @@ def generate_insights(user_data, accessible_data, lang):
             })
     
     # Spending Pattern Analysis
-    if accessible_data.get('transactions') and 'transactions' in user_data:
-        transactions = user_data['transactions']
-        expenses_by_category = {}
-        for transaction in transactions:
-            if transaction['type'] == 'expense':
-                category = transaction['category']
-                if category not in expenses_by_category:
-                    expenses_by_category[category] = []
-                expenses_by_category[category].append(transaction['amount'])
+    if accessible_data.get('transactions') and has_transactions(user_data):
+        summary = get_transaction_summary(user_data)
         
         # Detect unusual spending patterns
-        for category, amounts in expenses_by_category.items():
-            if len(amounts) > 2:  # Need at least 3 transactions for analysis
-                avg_amount = sum(amounts) / len(amounts)
-                max_amount = max(amounts)
+        for category, stats in summary['expenses_by_category'].items():
+            if stats['count'] > 2:  # Need at least 3 transactions for analysis
+                avg_amount = stats['total'] / stats['count']
+                max_amount = stats['max']
                 if max_amount > avg_amount * 2:  # Unusual spike detected
                     insights.append({
                         'type': 'spending_anomaly',
@@ -1826,33 +1941,22 @@ def signup():
         password = request.form['password']
         
         # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            flash(t('username_exists'))
-            return render_template('signup.html')
-        
-        if User.query.filter_by(email=email).first():
-            flash(t('email_exists'))
+        existing = User.query.filter(db.or_(User.username == username, User.email == email)).first()
+        if existing:
+            flash(t('username_exists') if existing.username == username else t('email_exists'))
             return render_template('signup.html')
         
-        # Create new user
+        # Create new user with mock data in a single transaction
         user = User(
             username=username,
             email=email,
             password_hash=generate_password_hash(password)
         )
         db.session.add(user)
+        db.session.flush()
+        seed_user_data(user.id)
         db.session.commit()
-        
-        # Load mock data for the user
-        mock_data = load_mock_data()
-        for data_type, data in mock_data.items():
-            financial_data = FinancialData(
-                user_id=user.id,
-                data_type=data_type,
-                data=json.dumps(data)
-            )
-            db.session.add(financial_data)
-        db.session.commit()
+        invalidate_financial_data(user.id)
         
         login_user(user)
         return redirect(url_for('dashboard'))
@@ -1885,19 +1989,10 @@ def logout():
 @login_required
 def dashboard():
     # Get user's financial data
-    financial_data = {}
-    for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-        financial_data[data.data_type] = json.loads(data.data)
+    financial_data = get_financial_data(current_user.id)
     
     # Get user's privacy settings
-    accessible_data = {
-        'assets': current_user.assets_access,
-        'liabilities': current_user.liabilities_access,
-        'transactions': current_user.transactions_access,
-        'epf_balance': current_user.epf_access,
-        'credit_score': current_user.credit_score_access,
-        'investments': current_user.investments_access
-    }
+    accessible_data = get_accessible_data(current_user)
     
     return render_template('dashboard.html', 
                          financial_data=financial_data, 
@@ -1907,49 +2002,122 @@ def dashboard():
 @login_required
 def modern_dashboard():
     # Get user's financial data
-    financial_data = {}
-    for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-        financial_data[data.data_type] = json.loads(data.data)
+    financial_data = get_financial_data(current_user.id)
     
     # Get user's privacy settings
-    accessible_data = {
-        'assets': current_user.assets_access,
-        'liabilities': current_user.liabilities_access,
-        'transactions': current_user.transactions_access,
-        'epf_balance': current_user.epf_access,
-        'credit_score': current_user.credit_score_access,
-        'investments': current_user.investments_access
-    }
+    accessible_data = get_accessible_data(current_user)
+    
+    # The vacation planner starts from the average monthly income, not the all-time total
+    monthly_averages = get_monthly_averages(financial_data) if has_transactions(financial_data) else None
     
     return render_template('modern_dashboard.html', 
                          financial_data=financial_data, 
-                         accessible_data=accessible_data)
+                         accessible_data=accessible_data,
+                         monthly_averages=monthly_averages)
 
 @app.route('/ai_assistant')
 @login_required
 def ai_assistant():
     # Get user's financial data
-    financial_data = {}
-    for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-        financial_data[data.data_type] = json.loads(data.data)
+    financial_data = get_financial_data(current_user.id)
     
     # Get user's privacy settings
-    accessible_data = {
-        'assets': current_user.assets_access,
-        'liabilities': current_user.liabilities_access,
-        'transactions': current_user.transactions_access,
-        'epf_balance': current_user.epf_access,
-        'credit_score': current_user.credit_score_access,
-        'investments': current_user.investments_access
-    }
+    accessible_data = get_accessible_data(current_user)
     
     return render_template('ai_assistant.html', 
                          financial_data=financial_data, 
                          accessible_data=accessible_data)
 
+# Shown when answering fails outright
+CHAT_ERROR_MESSAGES = {
+    'en': "I apologize, but I'm experiencing technical difficulties. Please try again in a moment.",
+    'hi': "मुझे खेद है, लेकिन मुझे तकनीकी कठिनाइयों का सामना करना पड़ रहा है। कृपया कुछ समय बाद पुनः प्रयास करें।",
+    'gu': "મને દિલગીરી છે, પરંતુ મને ટેકનિકલ મુશ્કેલીઓનો સામનો કરવો પડી રહ્યો છે। કૃપા કરીને થોડી વાર પછી ફરી પ્રયાસ કરો।"
+}
+
+def append_chat_turn(conversation_history, query, response, timestamp=None):
+    """History with the new exchange appended, trimmed to the last 10 exchanges."""
+    conversation_history = conversation_history + [{
+        'user': query,
+        'assistant': response,
+        'timestamp': timestamp or datetime.utcnow().isoformat()
+    }]
+    # Keep only last 10 exchanges to prevent session bloat
+    return conversation_history[-10:]
+
+def record_chat_turn(conversation_history, turn):
+    """History with a finished turn appended unless it is already there.
+
+    A turn is identified by its question and timestamp, so replaying or
+    committing the same exchange twice does not duplicate it.
+    """
+    if any(t.get('timestamp') == turn['timestamp'] and t.get('user') == turn['user']
+           for t in conversation_history):
+        return conversation_history
+    return append_chat_turn(conversation_history, turn['user'], turn['assistant'], turn['timestamp'])
+
+# Client-chosen keys that make a retried /chat return the first result
+IDEMPOTENCY_KEY = re.compile(r'[A-Za-z0-9_.:-]{8,128}')
+
+def chat_idempotency_key(headers):
+    """Validated Idempotency-Key header, None if absent; raises ValueError if malformed."""
+    value = headers.get('Idempotency-Key')
+    if value is None:
+        return None
+    if not IDEMPOTENCY_KEY.fullmatch(value):
+        raise ValueError('Invalid Idempotency-Key header')
+    return value
+
+def chat_turn(query, response, lang):
+    return {'user': query, 'assistant': response, 'lang': lang, 'timestamp': datetime.utcnow().isoformat()}
+
+def idempotent_chat_turn(user_id, idempotency_key, answer):
+    """Turn produced by ``answer()``, or the stored turn of an earlier request with the same key.
+
+    Requests with the same key that overlap share a single call of ``answer``.
+    """
+    if idempotency_key is None:
+        return answer()
+    key = (user_id, idempotency_key)
+    turn = idempotency_cache.get(key)
+    if turn is None:
+        turn = insight_flights.do(('turn',) + key, _answer_and_store, key, answer)
+    return turn
+
+def _answer_and_store(key, answer):
+    turn = idempotency_cache.get(key)
+    if turn is None:
+        turn = answer()
+        idempotency_cache.set(key, turn)
+    return turn
+
+async def idempotent_chat_turn_async(user_id, idempotency_key, answer):
+    """idempotent_chat_turn for the event loop; ``answer()`` returns an awaitable."""
+    if idempotency_key is None:
+        return await answer()
+    key = (user_id, idempotency_key)
+    turn = idempotency_cache.get(key)
+    if turn is None:
+        turn = await insight_flights.ado(('turn',) + key, _answer_and_store_async, key, answer)
+    return turn
+
+async def _answer_and_store_async(key, answer):
+    turn = idempotency_cache.get(key)
+    if turn is None:
+        turn = await answer()
+        idempotency_cache.set(key, turn)
+    return turn
+
 @app.route('/chat', methods=['POST'])
 @login_required
 def chat():
+    """Answer a question and add the exchange to the conversation history.
+
+    With an Idempotency-Key header, a retried request gets the turn of the
+    first one instead of a new answer and a second history entry. Turns are
+    kept in this worker's memory (IDEMPOTENCY_CACHE_SIZE), so a retry served
+    by another worker or by the async server gets a new answer.
+    """
     try:
         # Validate input
         if not request.json or 'query' not in request.json:
@@ -1958,25 +2126,20 @@ def chat():
         query = request.json.get('query', '').strip()
         if not query:
             return jsonify({'error': 'Query cannot be empty'}), 400
+        try:
+            idempotency_key = chat_idempotency_key(request.headers)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Get user's financial data with error handling
-        financial_data = {}
         try:
-            for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-                financial_data[data.data_type] = json.loads(data.data)
+            financial_data = get_financial_data(current_user.id)
         except Exception as e:
             app.logger.error(f"Error loading financial data: {e}")
             financial_data = {}
         
         # Get user's privacy settings
-        accessible_data = {
-            'assets': current_user.assets_access,
-            'liabilities': current_user.liabilities_access,
-            'transactions': current_user.transactions_access,
-            'epf_balance': current_user.epf_access,
-            'credit_score': current_user.credit_score_access,
-            'investments': current_user.investments_access
-        }
+        accessible_data = get_accessible_data(current_user)
         
         # Get conversation history from session
         conversation_history = session.get('conversation_history', [])
@@ -1985,61 +2148,116 @@ def chat():
         # Force use of session language instead of auto-detection
         user_lang = get_locale()
         try:
-            response = get_ai_insights(query, financial_data, accessible_data, conversation_history, user_lang)
+            turn = idempotent_chat_turn(current_user.id, idempotency_key, lambda: chat_turn(
+                query, get_ai_insights(query, financial_data, accessible_data, conversation_history, user_lang),
+                user_lang))
         except Exception as e:
             app.logger.error(f"Error generating AI response: {e}")
             # Provide error message in user's language
-            error_messages = {
-                'en': "I apologize, but I'm experiencing technical difficulties. Please try again in a moment.",
-                'hi': "मुझे खेद है, लेकिन मुझे तकनीकी कठिनाइयों का सामना करना पड़ रहा है। कृपया कुछ समय बाद पुनः प्रयास करें।",
-                'gu': "મને દિલગીરી છે, પરંતુ મને ટેકનિકલ મુશ્કેલીઓનો સામનો કરવો પડી રહ્યો છે। કૃપા કરીને થોડી વાર પછી ફરી પ્રયાસ કરો।"
-            }
-            response = error_messages.get(user_lang, error_messages['en'])
-        
-        # Store conversation in session (keep last 10 exchanges)
-        conversation_history.append({
-            'user': query,
-            'assistant': response,
-            'timestamp': datetime.utcnow().isoformat()
-        })
-        
-        # Keep only last 10 exchanges to prevent session bloat
-        if len(conversation_history) > 10:
-            conversation_history = conversation_history[-10:]
+            turn = chat_turn(query, CHAT_ERROR_MESSAGES.get(user_lang, CHAT_ERROR_MESSAGES['en']), user_lang)
+        if turn['user'] != query:
+            return jsonify({'error': 'Idempotency-Key was already used for a different query'}), 422
         
-        session['conversation_history'] = conversation_history
+        session['conversation_history'] = record_chat_turn(conversation_history, turn)
         
-        # Use session language instead of auto-detection
-        detected_lang = user_lang
-        
-        return jsonify({'response': response, 'lang': detected_lang})
+        return jsonify({'response': turn['assistant'], 'lang': turn['lang']})
     
     except Exception as e:
         app.logger.error(f"Unexpected error in chat endpoint: {e}")
         return jsonify({'error': 'An unexpected error occurred. Please try again.'}), 500
 
+@app.route('/chat/stream', methods=['POST'])
+@login_required
+def chat_stream():
+    """Streaming /chat: answer pieces as SSE 'token' events, then a 'done' event.
+
+    The 'done' event carries a token to POST to /chat/commit, which adds the
+    finished exchange to the conversation history. A request retried with
+    the same Idempotency-Key replays the first one's turn, following it
+    live if it is still streaming; like /chat, only when the same worker
+    serves the retry.
+    """
+    if not request.json or not str(request.json.get('query') or '').strip():
+        return jsonify({'error': 'Query cannot be empty'}), 400
+    query = str(request.json['query']).strip()
+    try:
+        idempotency_key = chat_idempotency_key(request.headers)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    user_id = current_user.id
+    flight_key = ('turn', user_id, idempotency_key) if idempotency_key else None
+    stored = idempotency_cache.get((user_id, idempotency_key)) if idempotency_key else None
+    pending = stream_flights.current(flight_key) if idempotency_key and stored is None else None
+    if (stored is not None and stored['user'] != query) or (pending is not None and pending.tag != query):
+        return jsonify({'error': 'Idempotency-Key was already used for a different query'}), 422
+    if stored is not None:
+        return Response(replay_chat_turn(user_id, stored), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'})
+    try:
+        financial_data = get_financial_data(current_user.id)
+    except Exception as e:
+        app.logger.error(f"Error loading financial data: {e}")
+        financial_data = {}
+    accessible_data = get_accessible_data(current_user)
+    conversation_history = session.get('conversation_history', [])
+    user_lang = get_locale()
+
+    def answer():
+        parts = []
+        try:
+            for text in stream_ai_insights(query, financial_data, accessible_data, conversation_history, user_lang):
+                parts.append(text)
+                yield sse_event('token', {'text': text})
+        except Exception as e:
+            app.logger.error(f"Error streaming AI response: {e}")
+            if not parts:
+                parts.append(CHAT_ERROR_MESSAGES.get(user_lang, CHAT_ERROR_MESSAGES['en']))
+                yield sse_event('token', {'text': parts[0]})
+        turn = chat_turn(query, ''.join(parts), user_lang)
+        if idempotency_key:
+            idempotency_cache.set((user_id, idempotency_key), turn)
+        return turn
+
+    def events():
+        turn = yield from stream_flights.stream(flight_key, answer, query)
+        yield chat_turn_done_event(user_id, turn)
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/chat/commit', methods=['POST'])
+@login_required
+def chat_commit():
+    """Append a completed streamed exchange (signed by /chat/stream) to the history."""
+    token = (request.json or {}).get('commit') if request.is_json else None
+    try:
+        turn = chat_turn_serializer().loads(token or '', max_age=3600)
+    except BadSignature:
+        return jsonify({'error': 'Invalid or expired commit token'}), 400
+    if turn.get('user_id') != current_user.id:
+        return jsonify({'error': 'Invalid or expired commit token'}), 400
+    # Committing the same stream twice must not duplicate the exchange
+    session['conversation_history'] = record_chat_turn(session.get('conversation_history', []), turn)
+    return jsonify({'status': 'success'})
+
 @app.route('/create_budget', methods=['POST'])
 @login_required
 def create_budget():
     """Create a personalized budget based on user's financial data"""
     try:
         # Get user's financial data
-        financial_data = {}
-        for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-            financial_data[data.data_type] = json.loads(data.data)
+        financial_data = get_financial_data(current_user.id)
         
         # Calculate budget based on available data
         monthly_income = 0
         monthly_expenses = 0
         
         # Extract income from transactions if available
-        if 'transactions' in financial_data:
-            transactions = financial_data['transactions']
-            for transaction in transactions:
-                if transaction.get('type') == 'income':
-                    monthly_income += transaction.get('amount', 0)
-                elif transaction.get('type') == 'expense':
-                    monthly_expenses += transaction.get('amount', 0)
+        if has_transactions(financial_data):
+            averages = get_monthly_averages(financial_data)
+            if averages:
+                monthly_income = averages['income']
+                monthly_expenses = averages['expenses']
         
         # If no transaction data, use mock data for demonstration
         if monthly_income == 0:
@@ -2098,6 +2316,151 @@ def create_budget():
         app.logger.error(f"Error creating budget: {e}")
         return jsonify({'error': 'Failed to create budget. Please try again.'}), 500
 
+@app.route('/import_transactions', methods=['POST'])
+@login_required
+def import_transactions_upload():
+    """Import a bank statement (CSV or OFX) uploaded as 'file'"""
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'error': 'No statement file uploaded'}), 400
+    try:
+        fmt = detect_format(upload.filename, request.form.get('format'))
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', errors='replace', newline='')
+        stats = import_transactions(current_user.id, PARSERS[fmt](stream))
+    except ImportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error importing transactions: {e}")
+        return jsonify({'error': 'Failed to import transactions. Please try again.'}), 500
+    return jsonify({'status': 'success', **stats})
+
+def encode_transaction_cursor(txn_date, txn_id):
+    raw = f"{txn_date.isoformat()}:{txn_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_transaction_cursor(cursor):
+    """Inverse of encode_transaction_cursor; raises ValueError if malformed."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    txn_date, txn_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+    return parse_transaction_date(txn_date), int(txn_id)
+
+@app.route('/api/transactions', methods=['GET'])
+@login_required
+def api_transactions():
+    """Page through the user's transactions, newest first.
+
+    Uses keyset pagination on (date, id): the ``cursor`` returned with a page
+    is the position after its last row, so every page is an index range scan
+    regardless of depth. Optional filters: type, category, from, to
+    (YYYY-MM-DD, inclusive) and limit.
+    """
+    args = request.args
+    try:
+        limit = min(max(int(args.get('limit', 50)), 1), app.config.get('TRANSACTIONS_PAGE_MAX', 200))
+        stmt = (
+            db.select(Transaction.id, Transaction.date, Transaction.type, Transaction.amount,
+                      Transaction.description, Transaction.category)
+            .where(Transaction.user_id == current_user.id)
+        )
+        if args.get('type'):
+            stmt = stmt.where(Transaction.type == args['type'])
+        if args.get('category'):
+            stmt = stmt.where(Transaction.category == args['category'])
+        if args.get('from'):
+            stmt = stmt.where(Transaction.date >= parse_transaction_date(args['from']))
+        if args.get('to'):
+            stmt = stmt.where(Transaction.date <= parse_transaction_date(args['to']))
+        if args.get('cursor'):
+            cursor_date, cursor_id = decode_transaction_cursor(args['cursor'])
+            stmt = stmt.where(db.tuple_(Transaction.date, Transaction.id) < (cursor_date, cursor_id))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination or filter parameters'}), 400
+    
+    rows = db.session.execute(
+        stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_transaction_cursor(rows[-1].date, rows[-1].id)
+    
+    return jsonify({
+        'transactions': [
+            {'id': row.id, 'date': row.date.isoformat(), 'type': row.type, 'amount': _whole(row.amount),
+             'description': row.description, 'category': row.category}
+            for row in rows
+        ],
+        'next_cursor': next_cursor
+    })
+
+@app.route('/api/transactions/<int:transaction_id>', methods=['PATCH'])
+@login_required
+def api_update_transaction(transaction_id):
+    """Correct one of the user's transactions.
+
+    Accepts any of date (YYYY-MM-DD), type (income or expense), amount,
+    description and category; the monthly rollups follow the change.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    changes = {field: payload[field] for field in ('date', 'type', 'amount', 'description', 'category')
+               if field in payload}
+    try:
+        if 'date' in changes:
+            changes['date'] = parse_transaction_date(changes['date'])
+        if 'type' in changes and changes['type'] not in ('income', 'expense'):
+            raise ValueError(changes['type'])
+        if 'amount' in changes:
+            if isinstance(changes['amount'], bool):
+                raise ValueError(changes['amount'])
+            changes['amount'] = float(changes['amount'])
+            if not math.isfinite(changes['amount']) or changes['amount'] < 0:
+                raise ValueError(changes['amount'])
+        for field, size in (('description', 255), ('category', 50)):
+            if field in changes and not (isinstance(changes[field], str) and len(changes[field]) <= size):
+                raise ValueError(changes[field])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid transaction fields'}), 400
+    
+    try:
+        transaction = update_transaction(current_user.id, transaction_id, changes)
+        if transaction is None:
+            return jsonify({'error': 'Transaction not found'}), 404
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        invalidate_financial_data(current_user.id)
+    
+    return jsonify({
+        'id': transaction.id, 'date': transaction.date.isoformat(), 'type': transaction.type,
+        'amount': _whole(transaction.amount), 'description': transaction.description,
+        'category': transaction.category
+    })
+
+@app.route('/api/provision_users', methods=['POST'])
+def api_provision_users():
+    """Bulk-create users with demo data (requires PROVISION_API_TOKEN)"""
+    token = app.config.get('PROVISION_API_TOKEN')
+    if not token or not hmac.compare_digest(request.headers.get('X-Provision-Token', ''), token):
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    users = (request.json or {}).get('users') if request.is_json else None
+    if not isinstance(users, list) or not all(
+        isinstance(u, dict) and all(isinstance(u.get(k), str) and u.get(k) for k in ('username', 'email', 'password'))
+        for u in users
+    ):
+        return jsonify({'error': 'Expected {"users": [{"username", "email", "password"}, ...]}'}), 400
+    
+    try:
+        stats = provision_users(users)
+    except Exception as e:
+        app.logger.error(f"Error provisioning users: {e}")
+        return jsonify({'error': 'Failed to provision users.'}), 500
+    return jsonify({'status': 'success', **stats})
+
 @app.route('/api_status', methods=['GET'])
 @login_required
 def api_status():
@@ -2107,9 +2470,144 @@ def api_status():
     
     return jsonify({
         'openai_configured': is_configured,
-        'message': 'OpenAI API key is configured' if is_configured else 'OpenAI API key needs to be configured in .env file'
+        'message': 'OpenAI API key is configured' if is_configured else 'OpenAI API key needs to be configured in .env file',
+        'llm_backend': app.config.get('LLM_BACKEND', 'openai'),
+        'circuit_breaker': llm_client.breaker.stats(),
+        'response_cache': response_cache.stats(),
+        'prompt_facts_cache': prompt_facts_cache.stats(),
+        'coalesced_requests': insight_flights.stats(),
+        'coalesced_streams': stream_flights.stats(),
+        'fast_path': fast_path_stats.stats()
     })
 
+# Provider settings of the conversation summary call
+SUMMARY_COMPLETION_OPTIONS = {
+    'max_tokens': 350,
+    'temperature': 0.5
+}
+
+# Most turns sent to the model in one summary request
+SUMMARY_MAX_TURNS = 12
+
+def build_summary_messages(conversation_history, lang, previous_summary=None):
+    """Prompt asking the model to summarize turns in the user's language.
+
+    With a ``previous_summary`` only the turns added since are sent, and the
+    model is asked to fold them into it.
+    """
+    language_name = LANGUAGE_NAMES.get(lang, 'English')
+    convo_text = []
+    for turn in conversation_history:
+        convo_text.append(f"User: {turn.get('user','')}")
+        convo_text.append(f"Assistant: {turn.get('assistant','')}")
+    convo_joined = "\n".join(convo_text)
+    if previous_summary is None:
+        system_prompt = (
+            f"You are an expert finance assistant. Summarize the conversation below in {language_name}. "
+            "Include: key questions, direct answers, and 3 actionable next steps. Keep it under 180 words."
+        )
+        content = convo_joined
+    else:
+        system_prompt = (
+            f"You are an expert finance assistant. Update the running summary of a conversation with "
+            f"the new turns and write the result in {language_name}. "
+            "Include: key questions, direct answers, and 3 actionable next steps. Keep it under 180 words."
+        )
+        content = f"Running summary:\n{previous_summary}\n\nNew turns:\n{convo_joined or '(none)'}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content}
+    ]
+
+def fallback_summary(conversation_history):
+    """Lightweight summary of the last turns, used when the model is unavailable."""
+    last_user = [t.get('user','') for t in conversation_history[-5:]]
+    last_bot = [t.get('assistant','') for t in conversation_history[-5:]]
+    bullets = []
+    for i, (u, a) in enumerate(zip(last_user, last_bot), start=1):
+        if not u and not a:
+            continue
+        bullets.append(f"{i}. Q: {u[:120]} | A: {a[:160]}")
+    return (
+        ("Conversation summary (last turns):\n" + "\n".join(bullets))
+        if bullets else "No recent messages to summarize."
+    )
+
+def pending_summary_turns(conversation_history, running_summary):
+    """Turns added after the last one folded into ``running_summary``."""
+    through = running_summary.get('through') if running_summary else None
+    if through is None:
+        return conversation_history
+    return [turn for turn in conversation_history if turn.get('timestamp', '') > through]
+
+def plan_summary(conversation_history, lang, running_summary):
+    """Next request bringing the running summary up to date, or None if it already is.
+
+    Returns the messages and the last turn they cover. Only turns since the
+    previous summary are sent, the oldest SUMMARY_MAX_TURNS of them, so the
+    request stays the same size however long the conversation gets; the
+    caller repeats until this returns None.
+    """
+    new_turns = pending_summary_turns(conversation_history, running_summary)[:SUMMARY_MAX_TURNS]
+    last_turn = new_turns[-1] if new_turns else None
+    if running_summary is None:
+        return build_summary_messages(new_turns, lang), last_turn
+    if not new_turns and running_summary.get('lang') == lang:
+        return None
+    return build_summary_messages(new_turns, lang, running_summary['text']), last_turn
+
+def running_summary_state(summary, last_turn, lang, previous=None):
+    """Running summary covering the turns up to ``last_turn`` (those of ``previous`` if None)."""
+    if last_turn is not None:
+        through = last_turn.get('timestamp', '')
+    else:
+        through = previous.get('through', '') if previous else ''
+    return {'text': summary, 'lang': lang, 'through': through}
+
+def summarize_conversation(conversation_history, lang, running_summary=None):
+    """Summary text and the running summary to persist (None when unchanged).
+
+    Pending turns are folded in SUMMARY_MAX_TURNS at a time; if a request
+    fails after others succeeded, the summary so far is returned and kept.
+    Fallback summaries are not persisted, so the model summarizes the whole
+    conversation once it becomes available.
+    """
+    # Prefer OpenAI if configured
+    if llm_ready():
+        plan = plan_summary(conversation_history, lang, running_summary)
+        if plan is None:
+            return running_summary['text'], None
+        state = running_summary
+        try:
+            while plan is not None:
+                messages, last_turn = plan
+                summary = llm_client.chat(messages, **SUMMARY_COMPLETION_OPTIONS)
+                state = running_summary_state(summary, last_turn, lang, state)
+                plan = plan_summary(conversation_history, lang, state)
+        except Exception as e:
+            app.logger.error(f"OpenAI summary error: {e}")
+        if state is not running_summary:
+            return state['text'], state
+    return fallback_summary(conversation_history), None
+
+async def summarize_conversation_async(conversation_history, lang, running_summary=None):
+    if llm_ready():
+        plan = plan_summary(conversation_history, lang, running_summary)
+        if plan is None:
+            return running_summary['text'], None
+        state = running_summary
+        try:
+            while plan is not None:
+                messages, last_turn = plan
+                summary = await llm_client.achat(messages, **SUMMARY_COMPLETION_OPTIONS)
+                state = running_summary_state(summary, last_turn, lang, state)
+                plan = plan_summary(conversation_history, lang, state)
+        except Exception as e:
+            app.logger.error(f"OpenAI summary error: {e}")
+        if state is not running_summary:
+            return state['text'], state
+    return fallback_summary(conversation_history), None
+
 @app.route('/summarize_chat', methods=['POST'])
 @login_required
 def summarize_chat():
@@ -2119,52 +2617,12 @@ def summarize_chat():
         if not conversation_history:
             return jsonify({'summary': 'No conversation to summarize yet.', 'lang': get_locale()}), 200
 
-        # Build a concise prompt for summary
         user_lang = get_locale()
-        language_name = LANGUAGE_NAMES.get(user_lang, 'English')
-
-        # Prefer OpenAI if configured
-        openai_api_key = app.config['OPENAI_API_KEY']
-        if openai_api_key and openai_api_key != 'your-openai-api-key-here':
-            openai.api_key = openai_api_key
-            try:
-                convo_text = []
-                for turn in conversation_history[-12:]:
-                    convo_text.append(f"User: {turn.get('user','')}")
-                    convo_text.append(f"Assistant: {turn.get('assistant','')}")
-                convo_joined = "\n".join(convo_text)
-                system_prompt = (
-                    f"You are an expert finance assistant. Summarize the conversation below in {language_name}. "
-                    "Include: key questions, direct answers, and 3 actionable next steps. Keep it under 180 words."
-                )
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": convo_joined}
-                ]
-                resp = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=messages,
-                    max_tokens=350,
-                    temperature=0.5
-                )
-                summary = resp.choices[0].message.content
-                return jsonify({'summary': summary, 'lang': user_lang})
-            except Exception as e:
-                app.logger.error(f"OpenAI summary error: {e}")
-
-        # Fallback lightweight summary
-        last_user = [t.get('user','') for t in conversation_history[-5:]]
-        last_bot = [t.get('assistant','') for t in conversation_history[-5:]]
-        bullets = []
-        for i, (u, a) in enumerate(zip(last_user, last_bot), start=1):
-            if not u and not a:
-                continue
-            bullets.append(f"{i}. Q: {u[:120]} | A: {a[:160]}")
-        summary_text = (
-            ("Conversation summary (last turns):\n" + "\n".join(bullets))
-            if bullets else "No recent messages to summarize."
-        )
-        return jsonify({'summary': summary_text, 'lang': user_lang})
+        summary, running_summary = summarize_conversation(
+            conversation_history, user_lang, session.get('chat_summary'))
+        if running_summary is not None:
+            session['chat_summary'] = running_summary
+        return jsonify({'summary': summary, 'lang': user_lang})
     except Exception as e:
         app.logger.error(f"Unexpected error in summarize_chat: {e}")
         return jsonify({'error': 'Failed to summarize conversation.'}), 500
@@ -2174,6 +2632,7 @@ def summarize_chat():
 def clear_chat():
     """Clear conversation history"""
     session.pop('conversation_history', None)
+    session.pop('chat_summary', None)
     return jsonify({'status': 'success'})
 
 @app.route('/insights', methods=['GET'])
@@ -2181,19 +2640,10 @@ def clear_chat():
 def get_insights():
     """Get AI-powered insights based on accessible data"""
     # Get user's financial data
-    financial_data = {}
-    for data in FinancialData.query.filter_by(user_id=current_user.id).all():
-        financial_data[data.data_type] = json.loads(data.data)
+    financial_data = get_financial_data(current_user.id)
     
     # Get user's privacy settings
-    accessible_data = {
-        'assets': current_user.assets_access,
-        'liabilities': current_user.liabilities_access,
-        'transactions': current_user.transactions_access,
-        'epf_balance': current_user.epf_access,
-        'credit_score': current_user.credit_score_access,
-        'investments': current_user.investments_access
-    }
+    accessible_data = get_accessible_data(current_user)
     
     # Generate insights
     lang = get_locale()
@@ -2225,6 +2675,7 @@ def set_language():
     if lang not in app.config.get('LANGUAGES', ['en']):
         lang = 'en'
     session['lang'] = lang
+    g.pop('catalog', None)
     next_url = request.form.get('next') or url_for('index')
     return redirect(next_url)
 
@@ -2238,6 +2689,99 @@ def set_theme():
     next_url = request.form.get('next') or url_for('index')
     return redirect(next_url)
 
+# Command line tools (run with `flask --app app <command>`)
+@app.cli.command('import-transactions')
+@click.argument('username')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', default=None, help='csv or ofx (default: from the file extension)')
+@click.option('--batch-size', default=None, type=int, help='Rows per INSERT batch')
+def import_transactions_command(username, path, fmt, batch_size):
+    """Import a CSV/OFX bank statement for USERNAME."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"No such user: {username}")
+    try:
+        fmt = detect_format(path, fmt)
+        with open(path, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            stats = import_transactions(user.id, PARSERS[fmt](f), batch_size)
+    except ImportFormatError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Imported {stats['inserted']} transactions ({stats['duplicates']} duplicates skipped)")
+
+@app.cli.command('provision-users')
+@click.option('--csv', 'csv_path', type=click.Path(exists=True, dir_okay=False),
+              help='CSV file with username,email,password columns')
+@click.option('--count', default=0, type=int, help='Generate this many numbered accounts')
+@click.option('--prefix', default='loadtest', help='Username prefix for generated accounts')
+@click.option('--password', default=None, help='Password for generated accounts')
+@click.option('--hash-method', default=None,
+              help='Werkzeug password hash method, e.g. a cheaper pbkdf2 for load-test fixtures')
+@click.option('--batch-size', default=None, type=int, help='Users per transaction')
+def provision_users_command(csv_path, count, prefix, password, hash_method, batch_size):
+    """Bulk-create users with demo financial data."""
+    if bool(csv_path) == bool(count):
+        raise click.UsageError('Pass exactly one of --csv or --count')
+    if count and not password:
+        raise click.UsageError('--password is required with --count')
+    db.create_all()
+    if csv_path:
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            stats = provision_users(csv.DictReader(f), hash_method, batch_size)
+    else:
+        accounts = (
+            {'username': f"{prefix}{i}", 'email': f"{prefix}{i}@example.com", 'password': password}
+            for i in range(count)
+        )
+        stats = provision_users(accounts, hash_method, batch_size)
+    click.echo(f"Created {stats['created']} users ({stats['skipped']} already existed)")
+
+@app.cli.command('rebuild-rollups')
+@click.argument('username', required=False)
+def rebuild_rollups_command(username):
+    """Recompute monthly rollups for USERNAME, or for every user."""
+    query = User.query
+    if username:
+        query = query.filter_by(username=username)
+        if query.first() is None:
+            raise click.ClickException(f"No such user: {username}")
+    user_ids = [user_id for (user_id,) in query.with_entities(User.id).order_by(User.id)]
+    for user_id in user_ids:
+        try:
+            rebuild_monthly_rollups(user_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            invalidate_financial_data(user_id)
+    click.echo(f"Rebuilt monthly rollups for {len(user_ids)} users")
+
+@app.cli.command('generate-data')
+@click.argument('username')
+@click.option('--transactions', default=1000, type=int, help='Number of transactions to generate')
+@click.option('--years', default=1.0, type=float, help='Years of history to spread them over')
+@click.option('--seed', default=0, type=int, help='Random seed; same seed, same data')
+def generate_data_command(username, transactions, years, seed):
+    """Replace USERNAME's financial data with a synthetic dataset."""
+    user = User.query.filter_by(username=username).first()
+    if user is None:
+        raise click.ClickException(f"No such user: {username}")
+    profile = datagen.generate_profile(seed)
+    Transaction.query.filter_by(user_id=user.id).delete()
+    MonthlyRollup.query.filter_by(user_id=user.id).delete()
+    FinancialData.query.filter(FinancialData.user_id == user.id,
+                               FinancialData.data_type.notin_(list(profile))).delete(synchronize_session=False)
+    upsert_financial_data(user.id, profile)
+    db.session.commit()
+    batch_size = app.config.get('IMPORT_BATCH_SIZE', 500)
+    try:
+        for batch in batched(datagen.iter_transactions(transactions, seed, years), batch_size):
+            add_transactions(user.id, batch)
+            db.session.commit()
+    finally:
+        invalidate_financial_data(user.id)
+    click.echo(f"Generated {transactions} transactions over {years:g} years for {username}")
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Asynchronous chat endpoints for the finance assistant, served by aiohttp.
+
+A WSGI worker answering /chat is blocked for the whole provider round trip.
+This server runs the same pipeline on an event loop instead: provider calls
+are awaited on the LLM client's aiohttp pool and database work runs on a
+small thread pool, so one process keeps hundreds of conversations in
+flight. It reads and writes the Flask session cookie, so a reverse proxy can
+route /chat, /chat/stream and /summarize_chat here while every other
+endpoint stays on the WSGI app.
+
+    python async_server.py --host 127.0.0.1 --port 5001
+"""
+
+import argparse
+
+from aiohttp import web
+from itsdangerous import BadSignature
+
+import jsoncodec
+from app import (CHAT_ERROR_MESSAGES, app as flask_app, chat_idempotency_key, chat_turn, chat_turn_done_event,
+                 get_ai_insights_async, idempotency_cache, idempotent_chat_turn_async, llm_client,
+                 load_chat_context, record_chat_turn, replay_chat_turn, run_db, session_locale, sse_event,
+                 stream_ai_insights_async, stream_flights, summarize_conversation_async)
+
+
+def load_session(request):
+    """Decode the Flask session cookie of a request ({} if absent or invalid)."""
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if not cookie:
+        return {}
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    with flask_app.app_context():
+        try:
+            return serializer.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+        except BadSignature:
+            return {}
+
+
+def save_session(response, session_data):
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    with flask_app.app_context():
+        value = serializer.dumps(dict(session_data))
+    config = flask_app.config
+    response.set_cookie(
+        config['SESSION_COOKIE_NAME'], value,
+        path=config['SESSION_COOKIE_PATH'] or '/',
+        domain=config['SESSION_COOKIE_DOMAIN'] or None,
+        httponly=config['SESSION_COOKIE_HTTPONLY'],
+        secure=config['SESSION_COOKIE_SECURE'],
+        samesite=config['SESSION_COOKIE_SAMESITE'],
+        max_age=int(flask_app.permanent_session_lifetime.total_seconds()) if session_data.get('_permanent') else None
+    )
+
+
+def json_response(data, status=200):
+    return web.json_response(data, status=status, dumps=jsoncodec.dumps)
+
+
+class ChatRequestError(Exception):
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_chat_request(request):
+    """Session, user id, query, financial data and privacy settings of a chat request."""
+    session_data = load_session(request)
+    user_id = session_data.get('_user_id')
+    if not user_id:
+        raise ChatRequestError('Authentication required', 401)
+    try:
+        body = await request.json(loads=jsoncodec.loads)
+    except ValueError:
+        body = None
+    if not isinstance(body, dict) or 'query' not in body:
+        raise ChatRequestError('Invalid request format', 400)
+    query = str(body.get('query') or '').strip()
+    if not query:
+        raise ChatRequestError('Query cannot be empty', 400)
+    try:
+        chat_idempotency_key(request.headers)
+    except ValueError as e:
+        raise ChatRequestError(str(e), 400)
+    try:
+        context = await run_db(load_chat_context, int(user_id))
+    except Exception as e:
+        flask_app.logger.error(f"Error loading financial data: {e}")
+        context = None
+    if context is None:
+        raise ChatRequestError('Authentication required', 401)
+    return session_data, int(user_id), query, context[0], context[1]
+
+
+async def chat(request):
+    """/chat on the event loop; Idempotency-Key replays only turns this process answered."""
+    try:
+        session_data, user_id, query, financial_data, accessible_data = await read_chat_request(request)
+    except ChatRequestError as e:
+        return json_response({'error': str(e)}, e.status)
+
+    conversation_history = session_data.get('conversation_history', [])
+    user_lang = session_locale(session_data)
+
+    async def answer():
+        response = await get_ai_insights_async(query, financial_data, accessible_data, conversation_history, user_lang)
+        return chat_turn(query, response, user_lang)
+
+    try:
+        turn = await idempotent_chat_turn_async(user_id, chat_idempotency_key(request.headers), answer)
+    except Exception as e:
+        flask_app.logger.error(f"Error generating AI response: {e}")
+        turn = chat_turn(query, CHAT_ERROR_MESSAGES.get(user_lang, CHAT_ERROR_MESSAGES['en']), user_lang)
+    if turn['user'] != query:
+        return json_response({'error': 'Idempotency-Key was already used for a different query'}, 422)
+
+    session_data['conversation_history'] = record_chat_turn(conversation_history, turn)
+    result = json_response({'response': turn['assistant'], 'lang': turn['lang']})
+    save_session(result, session_data)
+    return result
+
+
+async def chat_stream(request):
+    """SSE variant of chat; the finished exchange is committed through /chat/commit.
+
+    A request retried with the same Idempotency-Key replays the first one's
+    turn, following it live if it is still streaming. Turns are kept in this
+    process only, so a retry reaching a Flask worker is answered again.
+    """
+    try:
+        session_data, user_id, query, financial_data, accessible_data = await read_chat_request(request)
+    except ChatRequestError as e:
+        return json_response({'error': str(e)}, e.status)
+
+    conversation_history = session_data.get('conversation_history', [])
+    user_lang = session_locale(session_data)
+    idempotency_key = chat_idempotency_key(request.headers)
+    flight_key = ('turn', user_id, idempotency_key) if idempotency_key else None
+    stored = idempotency_cache.get((user_id, idempotency_key)) if idempotency_key else None
+    pending = stream_flights.current(flight_key) if idempotency_key and stored is None else None
+    if (stored is not None and stored['user'] != query) or (pending is not None and pending.tag != query):
+        return json_response({'error': 'Idempotency-Key was already used for a different query'}, 422)
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    await response.prepare(request)
+    if stored is not None:
+        for event in replay_chat_turn(user_id, stored):
+            await response.write(event.encode('utf-8'))
+        await response.write_eof()
+        return response
+
+    async def answer(publish):
+        parts = []
+        try:
+            async for text in stream_ai_insights_async(query, financial_data, accessible_data,
+                                                       conversation_history, user_lang):
+                parts.append(text)
+                publish(sse_event('token', {'text': text}))
+        except Exception as e:
+            flask_app.logger.error(f"Error streaming AI response: {e}")
+            if not parts:
+                parts.append(CHAT_ERROR_MESSAGES.get(user_lang, CHAT_ERROR_MESSAGES['en']))
+                publish(sse_event('token', {'text': parts[0]}))
+        turn = chat_turn(query, ''.join(parts), user_lang)
+        if idempotency_key:
+            idempotency_cache.set((user_id, idempotency_key), turn)
+        return turn
+
+    # The turn is produced in its own task: a client that goes away (and
+    # raises ConnectionResetError here) only stops following it
+    broadcast = stream_flights.astart(flight_key, answer, query)
+    async for event in broadcast.afollow():
+        await response.write(event.encode('utf-8'))
+    await response.write(chat_turn_done_event(user_id, broadcast.value).encode('utf-8'))
+    await response.write_eof()
+    return response
+
+
+async def summarize_chat(request):
+    session_data = load_session(request)
+    if not session_data.get('_user_id'):
+        return json_response({'error': 'Authentication required'}, 401)
+    user_lang = session_locale(session_data)
+    conversation_history = session_data.get('conversation_history', [])
+    if not conversation_history:
+        return json_response({'summary': 'No conversation to summarize yet.', 'lang': user_lang})
+    try:
+        summary, running_summary = await summarize_conversation_async(
+            conversation_history, user_lang, session_data.get('chat_summary'))
+    except Exception as e:
+        flask_app.logger.error(f"Unexpected error in summarize_chat: {e}")
+        return json_response({'error': 'Failed to summarize conversation.'}, 500)
+    result = json_response({'summary': summary, 'lang': user_lang})
+    if running_summary is not None:
+        session_data['chat_summary'] = running_summary
+        save_session(result, session_data)
+    return result
+
+
+async def close_llm_client(web_app):
+    await llm_client.aclose()
+
+
+def make_app():
+    web_app = web.Application()
+    # Close the provider connections on the loop that opened them
+    web_app.on_cleanup.append(close_llm_client)
+    web_app.router.add_post('/chat', chat)
+    web_app.router.add_post('/chat/stream', chat_stream)
+    web_app.router.add_post('/summarize_chat', summarize_chat)
+    return web_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the chat endpoints asynchronously.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    args = parser.parse_args(argv)
+    web.run_app(make_app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
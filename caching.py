@@ -0,0 +1,392 @@
+"""
+In-process caches shared by the Flask routes.
+
+The caches here are per worker process. Anything stored in them must be
+treated as read-only by callers, since the same object is handed to every
+request that hits the entry.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache.
+
+    With a ``ttl`` (seconds), entries older than that are treated as misses
+    and dropped when next looked up.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = max(int(maxsize), 0)
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.expired = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'ttl': self.ttl,
+            'hit_rate': (self.hits / total) if total else 0.0
+        }
+
+
+class SnapshotCache:
+    """Read-through cache of decoded per-user financial data.
+
+    Entries are keyed by user id and tagged with the data version they were
+    built from. A lookup with a different version is treated as a miss, so a
+    write anywhere in the user's data is enough to retire the old snapshot.
+    """
+
+    def __init__(self, maxsize=1024):
+        self._lru = LRUCache(maxsize)
+        self.stale = 0
+
+    def get_or_load(self, user_id, version, loader):
+        entry = self._lru.get(user_id)
+        if entry is not None:
+            if entry[0] == version:
+                return entry[1]
+            self.stale += 1
+        snapshot = loader()
+        self._lru.set(user_id, (version, snapshot))
+        return snapshot
+
+    def invalidate(self, user_id):
+        self._lru.pop(user_id)
+
+    def clear(self):
+        self._lru.clear()
+        self.stale = 0
+
+    def stats(self):
+        stats = self._lru.stats()
+        stats['stale'] = self.stale
+        return stats
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run concurrent calls with the same key once and share the outcome.
+
+    The first caller for a key executes the function; callers arriving while
+    it runs wait for it and get the same result or exception. Nothing is
+    remembered afterwards, so pair it with a cache for later requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._tasks = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.shared += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = fn(*args)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                self.executed += 1
+            flight.done.set()
+
+    async def ado(self, key, fn, *args):
+        """Coroutine version of do: ``fn(*args)`` must return an awaitable.
+
+        The work runs in its own task, so a caller that is cancelled (e.g. a
+        client that disconnects) does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = self._tasks[flight_key] = loop.create_task(fn(*args))
+                task.add_done_callback(partial(self._finish, flight_key))
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task):
+        with self._lock:
+            del self._tasks[flight_key]
+            self.executed += 1
+
+    def stats(self):
+        return {
+            'in_flight': len(self._flights) + len(self._tasks),
+            'executed': self.executed,
+            'shared': self.shared
+        }
+
+
+class Broadcast:
+    """Pieces of one streamed answer, readable by any number of followers.
+
+    Every follower gets all pieces from the first one, so a follower that
+    arrives late first replays what was already sent and then follows
+    live. ``value`` is the result the producer finished with.
+    """
+
+    def __init__(self, tag=None):
+        self.tag = tag
+        self.value = None
+        self.error = None
+        self._cond = threading.Condition()
+        self._parts = []
+        self._done = False
+        self._waiters = set()
+
+    def publish(self, part):
+        with self._cond:
+            self._parts.append(part)
+            self._cond.notify_all()
+        self._wake()
+
+    def finish(self, value=None, error=None):
+        with self._cond:
+            self.value, self.error, self._done = value, error, True
+            self._cond.notify_all()
+        self._wake()
+
+    def _wake(self):
+        with self._cond:
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # the follower's loop has been closed
+
+    def follow(self):
+        """Generator of every piece; returns ``value`` (or raises ``error``) at the end."""
+        index = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: index < len(self._parts) or self._done)
+                parts = self._parts[index:]
+            if not parts:
+                if self.error is not None:
+                    raise self.error
+                return self.value
+            index += len(parts)
+            yield from parts
+
+    async def afollow(self):
+        """Async generator version of follow; read ``value`` once it is exhausted."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            self._waiters.add(waiter)
+        try:
+            index = 0
+            while True:
+                with self._cond:
+                    parts = self._parts[index:]
+                    done = self._done
+                    if not parts and not done:
+                        waiter[1].clear()
+                if parts:
+                    index += len(parts)
+                    for part in parts:
+                        yield part
+                elif done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                else:
+                    await waiter[1].wait()
+        finally:
+            with self._cond:
+                self._waiters.discard(waiter)
+
+
+def _drain(pieces, broadcast):
+    """Publish the rest of a generator; returns (its return value, its exception)."""
+    try:
+        while True:
+            broadcast.publish(next(pieces))
+    except StopIteration as stop:
+        return stop.value, None
+    except Exception as e:
+        return None, e
+
+
+class StreamFlights:
+    """SingleFlight for streamed answers.
+
+    The first caller for a key produces the answer and publishes it to a
+    Broadcast; callers arriving while it is produced follow that Broadcast
+    instead of producing it again. A ``tag`` (e.g. the question) is stored
+    with it, and a caller with another tag gets an answer of its own. A key
+    of None is never shared. Nothing is remembered afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._tasks = set()
+        self.executed = 0
+        self.shared = 0
+
+    def current(self, key):
+        """Broadcast in flight for ``key``, or None."""
+        with self._lock:
+            return self._streams.get(key)
+
+    def _join(self, key, tag):
+        with self._lock:
+            broadcast = self._streams.get(key)
+            if broadcast is not None and broadcast.tag == tag:
+                self.shared += 1
+                return broadcast, False
+            shared = key is not None and broadcast is None
+            broadcast = Broadcast(tag)
+            if shared:
+                self._streams[key] = broadcast
+            return broadcast, True
+
+    def _finish(self, key, broadcast, value, error):
+        with self._lock:
+            if key is not None and self._streams.get(key) is broadcast:
+                del self._streams[key]
+            self.executed += 1
+        broadcast.finish(value, error)
+
+    def stream(self, key, produce, tag=None):
+        """Generator of the pieces of ``produce()``, itself a generator.
+
+        Returns what ``produce`` returned. The caller producing the answer
+        finishes it even if its own consumer stops early (a client that
+        disconnects), so its followers still get all of it.
+        """
+        broadcast, leader = self._join(key, tag)
+        if not leader:
+            return (yield from broadcast.follow())
+        value = error = None
+        try:
+            pieces = produce()
+            while True:
+                try:
+                    piece = next(pieces)
+                except StopIteration as stop:
+                    value = stop.value
+                    return value
+                broadcast.publish(piece)
+                try:
+                    yield piece
+                except GeneratorExit:
+                    value, error = _drain(pieces, broadcast)
+                    raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._finish(key, broadcast, value, error)
+
+    def astart(self, key, produce, tag=None):
+        """Broadcast of ``produce(publish)`` for ``key``, starting it if none is in flight.
+
+        ``produce`` is a coroutine function that passes each piece to
+        ``publish`` and returns the value. It runs in its own task on the
+        running loop, so a caller that is cancelled does not cut the answer
+        short for the others; read it with ``afollow()``.
+        """
+        broadcast, leader = self._join(key, tag)
+        if leader:
+            task = asyncio.get_running_loop().create_task(self._arun(key, broadcast, produce))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return broadcast
+
+    async def _arun(self, key, broadcast, produce):
+        value = error = None
+        try:
+            value = await produce(broadcast.publish)
+        except BaseException as e:
+            error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._finish(key, broadcast, value, error)
+
+    def stats(self):
+        with self._lock:
+            in_flight = len(self._streams)
+        return {'in_flight': in_flight, 'executed': self.executed, 'shared': self.shared}
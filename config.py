@@ -3,9 +3,127 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# SQLite storage presets applied to every new connection. Any single pragma
+# can be overridden with an SQLITE_<NAME> environment variable.
+SQLITE_PROFILES = {
+    # Plain SQLite defaults (rollback journal, full sync)
+    'default': {},
+    # Concurrent reads alongside writes, durable across process crashes
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -65536,        # KiB, i.e. 64 MB of page cache
+        'mmap_size': 268435456,      # 256 MB
+        'busy_timeout': 5000,        # ms to wait on a locked database
+        'temp_store': 'MEMORY'
+    },
+    # Mostly dashboard/chat reads: bigger cache and memory map
+    'read_heavy': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -262144,       # 256 MB
+        'mmap_size': 1073741824,     # 1 GB
+        'busy_timeout': 10000,
+        'temp_store': 'MEMORY'
+    }
+}
+
+def sqlite_pragmas(profile):
+    pragmas = dict(SQLITE_PROFILES.get(profile, SQLITE_PROFILES['production']))
+    for name in ('journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'busy_timeout', 'temp_store'):
+        value = os.getenv(f'SQLITE_{name.upper()}')
+        if value:
+            pragmas[name] = value
+    return pragmas
+
+def engine_options(database_uri, pragmas):
+    """SQLAlchemy create_engine() options for the configured database."""
+    in_memory = database_uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in database_uri
+    if in_memory:
+        return {}
+    options = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    }
+    if database_uri.startswith('sqlite'):
+        # pysqlite's own lock wait, kept in step with PRAGMA busy_timeout
+        options['connect_args'] = {'timeout': int(pragmas.get('busy_timeout', 5000)) / 1000}
+    return options
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///finance_assistant.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Storage profile: 'production' (default), 'read_heavy' or 'default'
+    SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'production')
+    SQLITE_PRAGMAS = sqlite_pragmas(SQLITE_PROFILE)
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, SQLITE_PRAGMAS)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', 'your-openai-api-key-here')
+    # 'openai' for LLM_API_BASE, or 'stub' for the local stand-in served by
+    # llm_stub.py, which needs neither an API key nor network access
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')
+    LLM_STUB_HOST = os.getenv('LLM_STUB_HOST', '127.0.0.1')
+    LLM_STUB_PORT = int(os.getenv('LLM_STUB_PORT', '8765'))
+    # Stub behaviour: latency distribution (see llm_stub.py), injected error rates,
+    # random seed, canned replies file and delay between streamed chunks (seconds)
+    LLM_STUB_LATENCY = os.getenv('LLM_STUB_LATENCY', 'lognormal:-1.0,0.5')
+    LLM_STUB_ERRORS = os.getenv('LLM_STUB_ERRORS', '')
+    LLM_STUB_SEED = int(os.getenv('LLM_STUB_SEED', '0'))
+    LLM_STUB_REPLIES = os.getenv('LLM_STUB_REPLIES')
+    LLM_STUB_TOKEN_DELAY = float(os.getenv('LLM_STUB_TOKEN_DELAY', '0.02'))
+    # Chat completions endpoint (any OpenAI-compatible API) and model
+    if LLM_BACKEND == 'stub':
+        LLM_API_BASE = f"http://{LLM_STUB_HOST}:{LLM_STUB_PORT}/v1"
+    else:
+        LLM_API_BASE = os.getenv('LLM_API_BASE', 'https://api.openai.com/v1')
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-3.5-turbo')
+    # Per-attempt timeout (seconds) and retries of rate-limited, timed out or
+    # 5xx calls, spaced by jittered exponential backoff between base and max seconds,
+    # all within LLM_DEADLINE seconds per call (0 for no limit)
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '8'))
+    LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', '12'))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '2'))
+    LLM_BACKOFF_BASE = float(os.getenv('LLM_BACKOFF_BASE', '0.25'))
+    LLM_BACKOFF_MAX = float(os.getenv('LLM_BACKOFF_MAX', '4'))
+    # Circuit breaker: consecutive quota/rate-limit/timeout failures that open it,
+    # and seconds before a probe call is let through
+    LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', '3'))
+    LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', '30'))
+    # Keep-alive connections per worker to the chat completions API
+    LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', '10'))
     LANGUAGES = ['en', 'hi', 'gu']
+    # Directory of the <lang>.json translation catalogs
+    LOCALE_DIR = os.getenv('LOCALE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales'))
+    # Number of users whose decoded financial data is kept in memory per worker
+    SNAPSHOT_CACHE_SIZE = int(os.getenv('SNAPSHOT_CACHE_SIZE', '1024'))
+    # Cached assistant answers per worker and how long (seconds) each stays valid
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '4096'))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '600'))
+    # Completed /chat turns kept per worker for Idempotency-Key replays, and for how long (seconds).
+    # Only the worker that answered can replay a turn: a retry landing on another gunicorn
+    # worker or on the async server is answered again, so route a session to one worker
+    # when replays must hold
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '4096'))
+    IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '3600'))
+    # Estimated token budget of a chat prompt (facts, instructions and history)
+    # and the most past exchanges it may include
+    PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '1500'))
+    PROMPT_HISTORY_TURNS = int(os.getenv('PROMPT_HISTORY_TURNS', '6'))
+    # Threads for database work of the async chat server (async_server.py)
+    ASYNC_DB_WORKERS = int(os.getenv('ASYNC_DB_WORKERS', '8'))
+    # Directory of memory-mapped binary snapshots shared by all workers (disabled if unset)
+    SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR')
+    # Snapshot files at least this large are memory-mapped, smaller ones read into memory
+    SNAPSHOT_MMAP_MIN_BYTES = int(os.getenv('SNAPSHOT_MMAP_MIN_BYTES', str(1024 * 1024)))
+    # Newest transactions kept in a snapshot for prompts (totals cover all of them)
+    SNAPSHOT_RECENT_TRANSACTIONS = int(os.getenv('SNAPSHOT_RECENT_TRANSACTIONS', '50'))
+    # Rows per INSERT batch when importing bank statements
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+    # Largest page /api/transactions will return
+    TRANSACTIONS_PAGE_MAX = int(os.getenv('TRANSACTIONS_PAGE_MAX', '200'))
+    # Bulk user provisioning: users per transaction, password hashing threads,
+    # and the X-Provision-Token required by /api/provision_users (disabled if unset)
+    PROVISION_BATCH_SIZE = int(os.getenv('PROVISION_BATCH_SIZE', '500'))
+    PROVISION_HASH_WORKERS = int(os.getenv('PROVISION_HASH_WORKERS', str(os.cpu_count() or 4)))
+    PROVISION_API_TOKEN = os.getenv('PROVISION_API_TOKEN')
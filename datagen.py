@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic financial data for benchmarks and load tests.
+
+Produces per-user datasets in the same schema as mock_data.json, from a few
+transactions up to millions spread over several years. Transactions are
+yielded as a stream (newest first, like mock_data.json) so they can be
+written to the database or to a JSON file without holding them in memory.
+
+    python datagen.py bench.json --transactions 1000000 --years 5 --seed 42
+"""
+
+import argparse
+import json
+import random
+import sys
+from datetime import date, timedelta
+
+# category -> (relative frequency, (min amount, max amount), descriptions by language)
+EXPENSE_CATEGORIES = {
+    'housing': (2, (800, 2500), {
+        'en': ['Rent', 'Maintenance charges', 'Home repairs'],
+        'hi': ['किराया', 'रखरखाव शुल्क', 'घर की मरम्मत'],
+        'gu': ['ભાડું', 'જાળવણી ચાર્જ', 'ઘર સમારકામ'],
+    }),
+    'food': (30, (5, 150), {
+        'en': ['Groceries', 'Coffee', 'Dining out', 'Food delivery'],
+        'hi': ['किराने का सामान', 'कॉफ़ी', 'बाहर खाना', 'फ़ूड डिलीवरी'],
+        'gu': ['કરિયાણું', 'કોફી', 'બહાર જમવું', 'ફૂડ ડિલિવરી'],
+    }),
+    'transport': (15, (3, 120), {
+        'en': ['Fuel', 'Metro card', 'Taxi', 'Parking'],
+        'hi': ['ईंधन', 'मेट्रो कार्ड', 'टैक्सी', 'पार्किंग'],
+        'gu': ['ઇંધણ', 'મેટ્રો કાર્ડ', 'ટેક્સી', 'પાર્કિંગ'],
+    }),
+    'utilities': (6, (20, 200), {
+        'en': ['Electricity bill', 'Phone bill', 'Internet', 'Water bill'],
+        'hi': ['बिजली बिल', 'फ़ोन बिल', 'इंटरनेट', 'पानी का बिल'],
+        'gu': ['વીજળી બિલ', 'ફોન બિલ', 'ઇન્ટરનેટ', 'પાણી બિલ'],
+    }),
+    'entertainment': (8, (5, 150), {
+        'en': ['Movies', 'Streaming subscription', 'Concert tickets'],
+        'hi': ['फ़िल्में', 'स्ट्रीमिंग सदस्यता', 'कॉन्सर्ट टिकट'],
+        'gu': ['ફિલ્મો', 'સ્ટ્રીમિંગ સબ્સ્ક્રિપ્શન', 'કોન્સર્ટ ટિકિટ'],
+    }),
+    'shopping': (10, (10, 400), {
+        'en': ['Clothing', 'Electronics', 'Household items'],
+        'hi': ['कपड़े', 'इलेक्ट्रॉनिक्स', 'घरेलू सामान'],
+        'gu': ['કપડાં', 'ઇલેક્ટ્રોનિક્સ', 'ઘરવપરાશની વસ્તુઓ'],
+    }),
+    'health': (4, (15, 300), {
+        'en': ['Pharmacy', 'Gym membership', 'Doctor visit'],
+        'hi': ['दवा की दुकान', 'जिम सदस्यता', 'डॉक्टर परामर्श'],
+        'gu': ['દવાની દુકાન', 'જીમ સભ્યપદ', 'ડૉક્ટર મુલાકાત'],
+    }),
+    'insurance': (1, (50, 400), {
+        'en': ['Insurance premium'],
+        'hi': ['बीमा प्रीमियम'],
+        'gu': ['વીમા પ્રીમિયમ'],
+    }),
+    'education': (2, (20, 500), {
+        'en': ['Course fees', 'Books'],
+        'hi': ['कोर्स फीस', 'किताबें'],
+        'gu': ['કોર્સ ફી', 'પુસ્તકો'],
+    }),
+    'travel': (2, (100, 1500), {
+        'en': ['Flight tickets', 'Hotel stay', 'Train tickets'],
+        'hi': ['हवाई टिकट', 'होटल में ठहराव', 'ट्रेन टिकट'],
+        'gu': ['ફ્લાઇટ ટિકિટ', 'હોટેલ રોકાણ', 'ટ્રેન ટિકિટ'],
+    }),
+}
+
+INCOME_DESCRIPTIONS = {
+    'en': ['Salary', 'Freelance payment', 'Interest credit'],
+    'hi': ['वेतन', 'फ्रीलांस भुगतान', 'ब्याज जमा'],
+    'gu': ['પગાર', 'ફ્રીલાન્સ ચુકવણી', 'વ્યાજ જમા'],
+}
+
+# Share of monthly income budgeted for each category (the rest is unbudgeted)
+BUDGET_SHARES = {
+    'housing': 0.24, 'food': 0.12, 'transport': 0.06, 'utilities': 0.06, 'entertainment': 0.04,
+    'shopping': 0.05, 'health': 0.035, 'insurance': 0.04, 'savings': 0.2,
+}
+
+CREDIT_FACTORS = ('payment_history', 'credit_utilization', 'length_of_credit', 'new_credit', 'credit_mix')
+RATINGS = ('Poor', 'Fair', 'Good', 'Excellent')
+
+# Expenses a salary credit is kept apart by, so small counts are not all salaries
+MIN_EXPENSES_PER_SALARY = 3
+
+LANGUAGES = ('en', 'hi', 'gu')
+END_DATE = date(2024, 12, 31)
+
+
+def _salary(rng):
+    return rng.randrange(3000, 12000, 100)
+
+
+def _rating(score):
+    return 'Excellent' if score >= 800 else 'Good' if score >= 700 else 'Fair' if score >= 630 else 'Poor'
+
+
+def iter_transactions(count, seed=0, years=1, end=None, languages=LANGUAGES):
+    """Yield ``count`` transactions spread over ``years`` ending at ``end``, newest first.
+
+    The first transaction of every month is a salary credit, unless fewer
+    than MIN_EXPENSES_PER_SALARY transactions came since the last one; the
+    rest are expenses drawn from weighted categories. Output depends only
+    on the arguments, so the same seed always reproduces the same stream.
+    """
+    rng = random.Random(seed)
+    end = end or END_DATE
+    span_days = max(int(years * 365), 1)
+    categories = list(EXPENSE_CATEGORIES)
+    weights = [EXPENSE_CATEGORIES[c][0] for c in categories]
+    salary = _salary(rng)
+    last_month = None
+    last_salary = -MIN_EXPENSES_PER_SALARY - 1
+    for i in range(count):
+        day = end - timedelta(days=i * span_days // count)
+        month = (day.year, day.month)
+        lang = languages[rng.randrange(len(languages))]
+        if month != last_month and i - last_salary > MIN_EXPENSES_PER_SALARY:
+            last_month = month
+            last_salary = i
+            yield {
+                'date': day.isoformat(),
+                'type': 'income',
+                'amount': salary,
+                'description': INCOME_DESCRIPTIONS[lang][0],
+                'category': 'income'
+            }
+            continue
+        category = rng.choices(categories, weights)[0]
+        _, (low, high), descriptions = EXPENSE_CATEGORIES[category]
+        yield {
+            'date': day.isoformat(),
+            'type': 'expense',
+            'amount': round(rng.uniform(low, high), 2),
+            'description': rng.choice(descriptions[lang]),
+            'category': category
+        }
+
+
+def generate_profile(seed=0, end=None):
+    """Every non-transaction category of a dataset, in the mock_data.json schema.
+
+    The budget's income is the salary iter_transactions credits for the
+    same seed.
+    """
+    rng = random.Random(f"profile-{seed}")
+    end = end or END_DATE
+    cash = rng.randrange(1000, 20000, 100)
+    bank = rng.randrange(5000, 200000, 500)
+    prop = rng.choice([0, rng.randrange(100000, 900000, 5000)])
+    credit_card = rng.randrange(0, 10000, 50)
+    personal_loan = rng.randrange(0, 40000, 500)
+    mortgage = int(prop * rng.uniform(0.3, 0.8))
+    employee = rng.randrange(10000, 150000, 1000)
+    employer = rng.randrange(10000, 150000, 1000)
+    score = rng.randint(550, 850)
+    stocks = []
+    for symbol in rng.sample(['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TCS', 'INFY', 'RELIANCE', 'HDFCBANK'], 3):
+        shares = rng.randint(1, 50)
+        price = rng.randint(50, 3000)
+        purchase = int(price * rng.uniform(0.7, 1.2))
+        stocks.append({'symbol': symbol, 'shares': shares, 'current_price': price,
+                       'total_value': shares * price, 'purchase_price': purchase,
+                       'gain_loss': shares * (price - purchase)})
+    funds = []
+    for name, category in rng.sample([('Tech Growth Fund', 'Equity'), ('Index Fund', 'Index'),
+                                      ('Bond Fund', 'Debt'), ('Balanced Advantage Fund', 'Hybrid')], 2):
+        units = rng.randint(50, 500)
+        nav = round(rng.uniform(10, 80), 2)
+        funds.append({'name': name, 'units': units, 'nav': nav,
+                      'total_value': round(units * nav, 2), 'category': category})
+    total_investments = round(sum(s['total_value'] for s in stocks) + sum(f['total_value'] for f in funds), 2)
+    income = _salary(random.Random(seed))
+    budgeted = {category: int(income * share * rng.uniform(0.8, 1.1)) for category, share in BUDGET_SHARES.items()}
+    total_budgeted = sum(budgeted.values())
+    # Factor ratings scatter one step around the overall rating
+    level = RATINGS.index(_rating(score))
+    factors = {factor: RATINGS[min(max(level + rng.choice((-1, 0, 0, 1)), 0), len(RATINGS) - 1)]
+               for factor in CREDIT_FACTORS}
+    return {
+        'assets': {'cash': cash, 'bank_balance': bank, 'property_value': prop,
+                   'total_assets': cash + bank + prop},
+        'liabilities': {'credit_card_debt': credit_card, 'personal_loan': personal_loan,
+                        'mortgage': mortgage, 'total_liabilities': credit_card + personal_loan + mortgage},
+        'epf_balance': {'employee_contribution': employee, 'employer_contribution': employer,
+                        'total_balance': employee + employer,
+                        'monthly_contribution': rng.randrange(500, 5000, 100),
+                        'last_contribution_date': end.replace(day=1).isoformat()},
+        'credit_score': {'score': score, 'rating': _rating(score),
+                         'last_updated': '2024-01-01', 'factors': factors},
+        'investments': {'stocks': stocks, 'mutual_funds': funds,
+                        'total_investment_value': total_investments,
+                        'total_gain_loss': sum(s['gain_loss'] for s in stocks)},
+        'budget': {'monthly_income': income, 'monthly_expenses': budgeted,
+                   'total_budgeted_expenses': total_budgeted,
+                   'remaining_budget': income - total_budgeted},
+    }
+
+
+def generate_user_data(transactions=15, seed=0, years=1):
+    """A complete in-memory dataset; use iter_transactions for large counts."""
+    data = generate_profile(seed)
+    data['transactions'] = list(iter_transactions(transactions, seed, years))
+    return data
+
+
+def write_json(out, transactions, seed=0, years=1):
+    """Stream a dataset to a text file object without materializing transactions."""
+    profile = generate_profile(seed)
+    out.write('{\n')
+    for key, value in profile.items():
+        out.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+    out.write('  "transactions": [')
+    for i, transaction in enumerate(iter_transactions(transactions, seed, years)):
+        out.write(',\n    ' if i else '\n    ')
+        out.write(json.dumps(transaction, ensure_ascii=False))
+    out.write('\n  ]\n}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic financial dataset as JSON.')
+    parser.add_argument('out', help="Output file, or '-' for stdout")
+    parser.add_argument('--transactions', type=int, default=1000)
+    parser.add_argument('--years', type=float, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.out == '-':
+        write_json(sys.stdout, args.transactions, args.seed, args.years)
+    else:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            write_json(f, args.transactions, args.seed, args.years)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,795 @@
+"""
+Localized answer templates of the rule-based assistant.
+
+Every text the fallback engine can answer with is built here once, keyed by
+(intent, language). Static sections are plain strings; sections with
+figures are ``str.format`` templates with named fields, filled by render().
+"""
+
+TEMPLATES = {
+    # Advice appended to answers about a data category
+    ('advice.assets', 'en'): """
+🚀 STRONG FINANCIAL RECOMMENDATIONS:
+
+💰 ASSET OPTIMIZATION:
+• Diversify across 4 asset classes: Stocks (40%), Bonds (30%), Real Estate (20%), Cash (10%)
+• Build emergency fund: 6 months of expenses in high-yield savings account
+• Invest excess cash: Consider index funds for 7-10% annual returns
+• Review asset allocation quarterly and rebalance when needed
+
+📈 GROWTH STRATEGIES:
+• Use dollar-cost averaging for consistent investing
+• Consider tax-advantaged accounts (401k, IRA) for retirement
+• Explore REITs for real estate exposure without property management
+• Automate investments to remove emotional decision-making
+
+⚠️ RISK MANAGEMENT:
+• Never invest more than you can afford to lose
+• Keep 3-6 months expenses in liquid assets
+• Consider insurance for major assets (home, car, health)
+• Review and update beneficiaries annually""",
+    ('advice.liabilities', 'en'): """
+🔥 DEBT ELIMINATION STRATEGY:
+
+⚡ IMMEDIATE ACTIONS:
+• List all debts by interest rate (highest first)
+• Pay minimum on all debts except the highest interest one
+• Put every extra dollar toward the highest interest debt
+• Consider balance transfer cards for 0% introductory rates
+
+💳 CREDIT CARD DEBT:
+• Stop using credit cards until debt-free
+• Negotiate lower interest rates with creditors
+• Consider debt consolidation loan if rate is lower
+• Use cash or debit cards to prevent new debt
+
+🏠 MORTGAGE OPTIMIZATION:
+• Make bi-weekly payments to save thousands in interest
+• Consider refinancing if rates drop 0.5% or more
+• Pay extra principal when possible
+• Avoid cash-out refinancing unless absolutely necessary
+
+📊 DEBT TRACKING:
+• Use debt payoff calculator to see timeline
+• Celebrate small wins to stay motivated
+• Consider debt snowball method for psychological wins
+• Set up automatic payments to avoid late fees""",
+    ('advice.investments', 'en'): """
+🎯 INVESTMENT MASTERY PLAN:
+
+📊 PORTFOLIO CONSTRUCTION:
+• 60% Stocks (40% US, 20% International)
+• 30% Bonds (Government and Corporate)
+• 10% Alternative investments (REITs, Commodities)
+• Rebalance quarterly to maintain target allocation
+
+💡 INVESTMENT STRATEGIES:
+• Start with low-cost index funds (VTI, VXUS, BND)
+• Use tax-loss harvesting to reduce tax burden
+• Consider robo-advisors for automated management
+• Invest in tax-advantaged accounts first (401k, IRA)
+
+🚀 GROWTH ACCELERATION:
+• Increase contributions by 1% every 6 months
+• Take advantage of employer 401k matching
+• Consider Roth IRA for tax-free growth
+• Use catch-up contributions if over 50
+
+⚠️ RISK MANAGEMENT:
+• Never time the market - stay invested
+• Diversify across sectors and geographies
+• Keep 3-6 months expenses in emergency fund
+• Review and rebalance portfolio quarterly""",
+    ('advice.spending', 'en'): """
+💸 SPENDING OPTIMIZATION BLUEPRINT:
+
+📋 BUDGET MASTERY:
+• Use 50/30/20 rule: 50% needs, 30% wants, 20% savings
+• Track every expense for 30 days to identify patterns
+• Use envelope method for discretionary spending
+• Set up automatic transfers to savings accounts
+
+🔍 EXPENSE AUDIT:
+• Cancel unused subscriptions and memberships
+• Negotiate bills (cable, internet, insurance)
+• Shop around for better rates on services
+• Use cashback apps and credit card rewards
+
+💡 SMART SPENDING:
+• Wait 24-48 hours before making purchases over $100
+• Use shopping lists to avoid impulse buys
+• Buy generic brands for non-essential items
+• Cook at home more often to save on dining out
+
+📊 TRACKING TOOLS:
+• Use budgeting apps (Mint, YNAB, Personal Capital)
+• Review bank statements monthly
+• Set spending alerts on credit cards
+• Create monthly spending reports""",
+    ('advice.savings', 'en'): """
+🏦 SAVINGS ACCELERATION STRATEGY:
+
+💰 EMERGENCY FUND:
+• Build 6 months of expenses in high-yield savings
+• Use separate account to avoid temptation
+• Start with $1,000, then build to full amount
+• Consider money market accounts for better rates
+
+🚀 SAVINGS BOOSTERS:
+• Automate transfers on payday
+• Use round-up apps to save spare change
+• Save windfalls (tax refunds, bonuses, gifts)
+• Increase savings by 1% every 6 months
+
+📈 HIGH-YIELD OPTIONS:
+• High-yield savings accounts (3-4% APY)
+• Money market accounts for better rates
+• CDs for guaranteed returns
+• Treasury bills for government-backed security
+
+💡 SAVINGS HACKS:
+• Save first, spend what's left
+• Use multiple accounts for different goals
+• Set up automatic transfers to investment accounts
+• Review and optimize savings rates quarterly""",
+    ('advice.credit_score', 'en'): """
+📊 CREDIT SCORE OPTIMIZATION:
+
+⚡ IMMEDIATE IMPROVEMENTS:
+• Pay all bills on time (35% of score)
+• Keep credit utilization under 30% (30% of score)
+• Don't close old credit accounts
+• Avoid opening new credit accounts frequently
+
+🔧 CREDIT REPAIR:
+• Dispute errors on credit reports
+• Request credit limit increases
+• Become authorized user on good accounts
+• Consider secured credit cards if rebuilding
+
+📈 SCORE BUILDING:
+• Use credit cards responsibly and pay in full
+• Keep oldest accounts open
+• Mix of credit types (cards, loans, mortgage)
+• Monitor credit reports regularly
+
+⚠️ AVOID THESE MISTAKES:
+• Don't max out credit cards
+• Don't apply for multiple credit accounts
+• Don't close accounts with long history
+• Don't ignore credit report errors""",
+    ('advice.assets', 'hi'): """
+🚀 मजबूत वित्तीय सुझाव:
+
+💰 संपत्ति अनुकूलन:
+• 4 परिसंपत्ति वर्गों में विविधता: स्टॉक (40%), बॉन्ड (30%), रियल एस्टेट (20%), नकद (10%)
+• आपातकालीन फंड बनाएं: उच्च-उपज बचत खाते में 6 महीने का खर्च
+• अतिरिक्त नकदी का निवेश: 7-10% वार्षिक रिटर्न के लिए इंडेक्स फंड
+• त्रैमासिक रूप से संपत्ति आवंटन की समीक्षा करें
+
+📈 वृद्धि रणनीतियां:
+• निरंतर निवेश के लिए डॉलर-कॉस्ट एवरेजिंग
+• सेवानिवृत्ति के लिए कर-लाभ खाते (401k, IRA)
+• संपत्ति प्रबंधन के बिना रियल एस्टेट एक्सपोजर के लिए REITs
+• भावनात्मक निर्णय लेने से बचने के लिए निवेश को स्वचालित करें
+
+⚠️ जोखिम प्रबंधन:
+• जितना खो सकते हैं उससे अधिक कभी निवेश न करें
+• तरल संपत्ति में 3-6 महीने का खर्च रखें
+• प्रमुख संपत्तियों के लिए बीमा पर विचार करें""",
+    ('advice.liabilities', 'hi'): """
+🔥 कर्ज उन्मूलन रणनीति:
+
+⚡ तत्काल कार्य:
+• सभी कर्ज को ब्याज दर के अनुसार सूचीबद्ध करें (उच्चतम पहले)
+• सबसे उच्च ब्याज वाले को छोड़कर सभी कर्ज पर न्यूनतम भुगतान
+• हर अतिरिक्त डॉलर को सबसे उच्च ब्याज वाले कर्ज पर लगाएं
+• 0% प्रारंभिक दरों के लिए बैलेंस ट्रांसफर कार्ड पर विचार करें
+
+💳 क्रेडिट कार्ड कर्ज:
+• कर्ज-मुक्त होने तक क्रेडिट कार्ड का उपयोग बंद करें
+• कर्जदाताओं के साथ कम ब्याज दरों पर बातचीत करें
+• यदि दर कम है तो कर्ज समेकन ऋण पर विचार करें
+• नए कर्ज को रोकने के लिए नकद या डेबिट कार्ड का उपयोग करें
+
+🏠 मॉर्गेज अनुकूलन:
+• ब्याज में हजारों बचाने के लिए साप्ताहिक भुगतान करें
+• यदि दरें 0.5% या अधिक गिरती हैं तो पुनर्वित्त पर विचार करें
+• जब संभव हो तो अतिरिक्त मूलधन का भुगतान करें""",
+    ('advice.investments', 'hi'): """
+🎯 निवेश महारत योजना:
+
+📊 पोर्टफोलियो निर्माण:
+• 60% स्टॉक (40% US, 20% अंतर्राष्ट्रीय)
+• 30% बॉन्ड (सरकारी और कॉर्पोरेट)
+• 10% वैकल्पिक निवेश (REITs, कमोडिटीज)
+• लक्ष्य आवंटन बनाए रखने के लिए त्रैमासिक रूप से पुनः संतुलित करें
+
+💡 निवेश रणनीतियां:
+• कम लागत वाले इंडेक्स फंड (VTI, VXUS, BND) से शुरुआत करें
+• कर बोझ कम करने के लिए टैक्स-लॉस हार्वेस्टिंग का उपयोग करें
+• स्वचालित प्रबंधन के लिए रोबो-सलाहकारों पर विचार करें
+• पहले कर-लाभ खातों में निवेश करें (401k, IRA)
+
+🚀 वृद्धि त्वरण:
+• हर 6 महीने में योगदान 1% बढ़ाएं
+• नियोक्ता 401k मिलान का लाभ उठाएं
+• कर-मुक्त वृद्धि के लिए रोथ IRA पर विचार करें""",
+    ('advice.spending', 'hi'): """
+💸 खर्च अनुकूलन खाका:
+
+📋 बजट महारत:
+• 50/30/20 नियम का उपयोग करें: 50% जरूरतें, 30% चाहतें, 20% बचत
+• पैटर्न की पहचान के लिए 30 दिनों तक हर खर्च को ट्रैक करें
+• विवेकाधीन खर्च के लिए लिफाफा विधि का उपयोग करें
+• बचत खातों में स्वचालित ट्रांसफर सेट करें
+
+🔍 खर्च ऑडिट:
+• अनुपयोगी सब्सक्रिप्शन और सदस्यताएं रद्द करें
+• बिलों पर बातचीत करें (केबल, इंटरनेट, बीमा)
+• सेवाओं के लिए बेहतर दरों की तलाश करें
+• कैशबैक ऐप्स और क्रेडिट कार्ड रिवार्ड्स का उपयोग करें""",
+    ('advice.savings', 'hi'): """
+🏦 बचत त्वरण रणनीति:
+
+💰 आपातकालीन फंड:
+• उच्च-उपज बचत में 6 महीने का खर्च बनाएं
+• प्रलोभन से बचने के लिए अलग खाते का उपयोग करें
+• $1,000 से शुरुआत करें, फिर पूरी राशि तक बनाएं
+• बेहतर दरों के लिए मनी मार्केट खातों पर विचार करें
+
+🚀 बचत बूस्टर:
+• वेतन दिवस पर स्वचालित ट्रांसफर
+• स्पेयर चेंज बचाने के लिए राउंड-अप ऐप्स
+• विंडफॉल्स बचाएं (टैक्स रिफंड, बोनस, उपहार)
+• हर 6 महीने में बचत 1% बढ़ाएं""",
+    ('advice.credit_score', 'hi'): """
+📊 क्रेडिट स्कोर अनुकूलन:
+
+⚡ तत्काल सुधार:
+• सभी बिल समय पर भुगतान करें (स्कोर का 35%)
+• क्रेडिट उपयोग 30% से कम रखें (स्कोर का 30%)
+• पुराने क्रेडिट खाते बंद न करें
+• नए क्रेडिट खाते बार-बार न खोलें
+
+🔧 क्रेडिट मरम्मत:
+• क्रेडिट रिपोर्ट में त्रुटियों का विवाद करें
+• क्रेडिट सीमा बढ़ाने का अनुरोध करें
+• अच्छे खातों पर अधिकृत उपयोगकर्ता बनें
+• यदि पुनर्निर्माण कर रहे हैं तो सुरक्षित क्रेडिट कार्ड पर विचार करें""",
+    ('advice.assets', 'gu'): """
+🚀 મજબૂત નાણાકીય સૂચનો:
+
+💰 સંપત્તિ ઑપ્ટિમાઇઝેશન:
+• 4 સંપત્તિ વર્ગોમાં વિવિધતા: સ્ટોક (40%), બોન્ડ (30%), રિયલ એસ્ટેટ (20%), રોકડ (10%)
+• આપત્તિકાળીન ફંડ બનાવો: ઉચ્ચ-ઉપજ બચત ખાતામાં 6 મહિના ખર્ચ
+• વધારાના રોકડનું રોકાણ: 7-10% વાર્ષિક રિટર્ન માટે ઇન્ડેક્સ ફંડ
+• ત્રૈમાસિક રીતે સંપત્તિ ફાળવણીની સમીક્ષા કરો
+
+📈 વૃદ્ધિ વ્યૂહરચના:
+• સતત રોકાણ માટે ડોલર-કોસ્ટ એવરેજિંગ
+• નિવૃત્તિ માટે કર-લાભ ખાતા (401k, IRA)
+• મિલકત વ્યવસ્થાપન વગર રિયલ એસ્ટેટ એક્સપોઝર માટે REITs
+• ભાવનાત્મક નિર્ણય લેવાથી બચવા માટે રોકાણને સ્વચાલિત કરો""",
+    ('advice.liabilities', 'gu'): """
+🔥 દેવું ઉન્મૂલન વ્યૂહરચના:
+
+⚡ તાત્કાલિક ક્રિયાઓ:
+• બધા દેવા ને વ્યાજ દર અનુસાર યાદી બનાવો (સૌથી વધુ પહેલા)
+• સૌથી વધુ વ્યાજવાળા સિવાય બધા દેવા પર લઘુત્તમ ચૂકવણી
+• દરેક વધારાના ડોલરને સૌથી વધુ વ્યાજવાળા દેવા પર મૂકો
+• 0% પ્રારંભિક દરો માટે બેલેન્સ ટ્રાન્સફર કાર્ડ પર વિચાર કરો
+
+💳 ક્રેડિટ કાર્ડ દેવું:
+• દેવું-મુક્ત થાય ત્યાં સુધી ક્રેડિટ કાર્ડનો ઉપયોગ બંધ કરો
+• લેન્ડર્સ સાથે ઓછા વ્યાજ દરો પર વાટાઘાટ કરો
+• જો દર ઓછો હોય તો દેવું એકીકરણ લોન પર વિચાર કરો
+• નવા દેવુંને રોકવા માટે રોકડ અથવા ડેબિટ કાર્ડનો ઉપયોગ કરો""",
+    ('advice.investments', 'gu'): """
+🎯 રોકાણ મહારત યોજના:
+
+📊 પોર્ટફોલિયો નિર્માણ:
+• 60% સ્ટોક (40% US, 20% આંતરરાષ્ટ્રીય)
+• 30% બોન્ડ (સરકારી અને કોર્પોરેટ)
+• 10% વૈકલ્પિક રોકાણ (REITs, કમોડિટીઝ)
+• લક્ષ્ય ફાળવણી જાળવવા માટે ત્રૈમાસિક રીતે પુનઃસંતુલિત કરો
+
+💡 રોકાણ વ્યૂહરચના:
+• ઓછા ખર્ચાળ ઇન્ડેક્સ ફંડ (VTI, VXUS, BND) થી શરૂઆત કરો
+• કર બોજ ઘટાડવા માટે ટેક્સ-લોસ હાર્વેસ્ટિંગનો ઉપયોગ કરો
+• સ્વચાલિત વ્યવસ્થાપન માટે રોબો-સલાહકારો પર વિચાર કરો
+• પહેલા કર-લાભ ખાતાઓમાં રોકાણ કરો (401k, IRA)""",
+    ('advice.spending', 'gu'): """
+💸 ખર્ચ ઑપ્ટિમાઇઝેશન બ્લુપ્રિન્ટ:
+
+📋 બજેટ મહારત:
+• 50/30/20 નિયમનો ઉપયોગ કરો: 50% જરૂરિયાતો, 30% ઇચ્છાઓ, 20% બચત
+• પેટર્ન ઓળખવા માટે 30 દિવસ સુધી દરેક ખર્ચને ટ્રેક કરો
+• વિવેકાધિન ખર્ચ માટે લિફાફો પદ્ધતિનો ઉપયોગ કરો
+• બચત ખાતાઓમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
+
+🔍 ખર્ચ ઓડિટ:
+• અનુપયોગી સબ્સ્ક્રિપ્શન અને સભ્યતાઓ રદ્દ કરો
+• બિલો પર વાટાઘાટ કરો (કેબલ, ઇન્ટરનેટ, વીમો)
+• સેવાઓ માટે વધુ સારા દરો શોધો
+• કેશબેક એપ્સ અને ક્રેડિટ કાર્ડ રિવાર્ડ્સનો ઉપયોગ કરો""",
+    ('advice.savings', 'gu'): """
+🏦 બચત ત્વરણ વ્યૂહરચના:
+
+💰 આપત્તિકાળીન ફંડ:
+• ઉચ્ચ-ઉપજ બચતમાં 6 મહિના ખર્ચ બનાવો
+• પ્રલોભનથી બચવા માટે અલગ ખાતાનો ઉપયોગ કરો
+• $1,000 થી શરૂઆત કરો, પછી સંપૂર્ણ રકમ સુધી બનાવો
+• વધુ સારા દરો માટે મની માર્કેટ ખાતાઓ પર વિચાર કરો""",
+    ('advice.credit_score', 'gu'): """
+📊 ક્રેડિટ સ્કોર ઑપ્ટિમાઇઝેશન:
+
+⚡ તાત્કાલિક સુધારા:
+• બધા બિલ સમયસર ચૂકવો (સ્કોરનો 35%)
+• ક્રેડિટ ઉપયોગ 30% થી ઓછો રાખો (સ્કોરનો 30%)
+• જૂના ક્રેડિટ ખાતા બંધ ન કરો
+• નવા ક્રેડિટ ખાતા વારંવાર ન ખોલો
+
+🔧 ક્રેડિટ મરમ્મત:
+• ક્રેડિટ રિપોર્ટમાં ભૂલોનો વિવાદ કરો
+• ક્રેડિટ મર્યાદા વધારવાની વિનંતી કરો
+• સારા ખાતાઓ પર અધિકૃત વપરાશકર્તા બનો
+• જો પુનઃનિર્માણ કરી રહ્યા છો તો સુરક્ષિત ક્રેડિટ કાર્ડ પર વિચાર કરો""",
+
+    # Debt payoff plan computed from the liabilities and monthly surplus
+    ('payoff.plan', 'en'): """💳 DEBT REPAYMENT STRATEGY ANALYSIS:
+
+📊 CURRENT DEBT SITUATION:
+• Credit Card Debt: ${credit_card_debt:,}
+• Personal Loan: ${personal_loan:,}
+• Mortgage: ${mortgage:,} (long-term, low priority)
+• Total High-Priority Debt: ${total_high_priority_debt:,}
+
+💰 AVAILABLE MONTHLY PAYMENT: ${monthly_surplus:,}
+
+🎯 RECOMMENDED STRATEGY: Enhanced Snowball Method
+
+PHASE 1 (Months 1-{phase1_months:.1f}):
+• Pay ${phase1_payment:,}/month on Credit Card
+• Use $250 from emergency fund temporarily
+• Pay off ${credit_card_debt:,} credit card debt
+
+PHASE 2 (Months {phase1_months:.1f}-{total_months:.1f}):
+• Pay ${monthly_surplus:,}/month on Personal Loan
+• Pay off ${personal_loan:,} personal loan
+
+⏱️ TOTAL TIME TO DEBT-FREE: {total_months:.1f} months
+
+💡 WHY THIS WORKS:
+1. Quick psychological win (credit card paid first)
+2. Saves on high-interest credit card charges
+3. Creates momentum for continued debt reduction
+4. Maintains emergency fund for unexpected expenses
+
+🚀 ALTERNATIVE: Conservative Approach
+• Pay ${monthly_surplus:,}/month on credit card: {alt_phase1:.1f} months
+• Then pay ${monthly_surplus:,}/month on personal loan: {alt_phase2:.1f} months
+• Total time: {alt_total:.1f} months""",
+    ('payoff.plan', 'hi'): """💳 कर्ज चुकौती रणनीति विश्लेषण:
+
+📊 वर्तमान कर्ज स्थिति:
+• क्रेडिट कार्ड कर्ज: ${credit_card_debt:,}
+• पर्सनल लोन: ${personal_loan:,}
+• मॉर्गेज: ${mortgage:,} (दीर्घकालिक, कम प्राथमिकता)
+• कुल उच्च-प्राथमिकता कर्ज: ${total_high_priority_debt:,}
+
+💰 उपलब्ध मासिक भुगतान: ${monthly_surplus:,}
+
+🎯 अनुशंसित रणनीति: उन्नत स्नोबॉल विधि
+
+चरण 1 (महीने 1–{phase1_months:.1f}):
+• क्रेडिट कार्ड पर ${phase1_payment:,}/माह चुकाएँ
+• अस्थायी रूप से आपातकालीन फंड से $250 उपयोग करें
+• ${credit_card_debt:,} क्रेडिट कार्ड कर्ज समाप्त करें
+
+चरण 2 (महीने {phase1_months:.1f}–{total_months:.1f}):
+• पर्सनल लोन पर ${monthly_surplus:,}/माह चुकाएँ
+• ${personal_loan:,} पर्सनल लोन समाप्त करें
+
+⏱️ कर्ज-मुक्त कुल समय: {total_months:.1f} महीने
+
+💡 यह क्यों काम करता है:
+1) त्वरित मनोवैज्ञानिक जीत (पहले क्रेडिट कार्ड) 2) उच्च ब्याज की बचत 3) निरंतर कमी के लिए गति 4) आपातकालीन फंड सुरक्षित रहता है
+
+🚀 वैकल्पिक: संयमित तरीका
+• क्रेडिट कार्ड पर ${monthly_surplus:,}/माह: {alt_phase1:.1f} महीने
+• फिर पर्सनल लोन पर ${monthly_surplus:,}/माह: {alt_phase2:.1f} महीने
+• कुल समय: {alt_total:.1f} महीने""",
+    ('payoff.plan', 'gu'): """💳 દેવું ચુકવણી વ્યૂહરચના વિશ્લેષણ:
+
+📊 વર્તમાન દેવું સ્થિતિ:
+• ક્રેડિટ કાર્ડ દેવું: ${credit_card_debt:,}
+• પર્સનલ લોન: ${personal_loan:,}
+• મોર્ટગેજ: ${mortgage:,} (દીર્ઘકાલીન, ઓછી પ્રાથમિકતા)
+• કુલ ઉચ્ચ-પ્રાથમિકતા દેવું: ${total_high_priority_debt:,}
+
+💰 ઉપલબ્ધ માસિક ચુકવણી: ${monthly_surplus:,}
+
+🎯 ભલામણ કરેલ વ્યૂહરચના: સુધારેલી સ્નોબોલ પદ્ધતિ
+
+ચરણ 1 (મહિના 1–{phase1_months:.1f}):
+• ક્રેડિટ કાર્ડ પર ${phase1_payment:,}/મહિનો ચૂકવો
+• તાત્કાલિક રીતે ઈમરજન્સી ફંડમાંથી $250 વાપરો
+• ${credit_card_debt:,} ક્રેડિટ કાર્ડ દેવું ચૂકવી દો
+
+ચરણ 2 (મહિના {phase1_months:.1f}–{total_months:.1f}):
+• પર્સનલ લોન પર ${monthly_surplus:,}/મહિનો ચૂકવો
+• ${personal_loan:,} પર્સનલ લોન ચૂકવી દો
+
+⏱️ દેવું-મુક્ત કુલ સમય: {total_months:.1f} મહિના
+
+💡 કેમ કામ કરે છે:
+1) ઝડપી માનસિક જીત (પહેલાં ક્રેડિટ કાર્ડ) 2) ઉચ્ચ વ્યાજમાં બચત 3) સતત ઘટાડા માટે ગતિ 4) ઈમરજન્સી ફંડ સુરક્ષિત રહે છે
+
+🚀 વિકલ્પ: કન્ઝર્વેટિવ અભિગમ
+• ક્રેડિટ કાર્ડ પર ${monthly_surplus:,}/મહિનો: {alt_phase1:.1f} મહિના
+• પછી પર્સનલ લોન પર ${monthly_surplus:,}/મહિનો: {alt_phase2:.1f} મહિના
+• કુલ સમય: {alt_total:.1f} મહિના""",
+
+    # Debt payoff advice when no liabilities are shared
+    ('payoff.general', 'en'): """🔥 DEBT REPAYMENT STRATEGY (GENERAL GUIDANCE):
+
+⚡ IMMEDIATE ACTIONS:
+• List all debts by interest rate (highest first)
+• Pay minimum on all debts except the highest interest one
+• Put every extra dollar toward the highest interest debt
+• Consider balance transfer cards for 0% introductory rates
+
+💳 CREDIT CARD DEBT:
+• Stop using credit cards until debt-free
+• Negotiate lower interest rates with creditors
+• Consider debt consolidation loan if rate is lower
+• Use cash or debit cards to prevent new debt
+
+🏠 MORTGAGE OPTIMIZATION:
+• Make bi-weekly payments to save thousands in interest
+• Consider refinancing if rates drop 0.5% or more
+• Pay extra principal when possible
+• Avoid cash-out refinancing unless absolutely necessary
+
+📊 DEBT TRACKING:
+• Use debt payoff calculator to see timeline
+• Celebrate small wins to stay motivated
+• Consider debt snowball method for psychological wins
+• Set up automatic payments to avoid late fees
+
+💡 PRO TIPS:
+• The debt avalanche method saves the most money
+• The debt snowball method provides psychological wins
+• Consider working extra hours or side gigs for extra payments
+• Track progress monthly to stay motivated""",
+    ('payoff.general', 'hi'): """🔥 कर्ज चुकौती रणनीति (सामान्य मार्गदर्शन):
+
+⚡ तुरंत करें:
+• सभी कर्ज ब्याज दर के अनुसार सूचीबद्ध करें (उच्चतम पहले)
+• सबसे उच्च ब्याज वाले को छोड़कर बाकी पर न्यूनतम भुगतान
+• अतिरिक्त राशि उच्चतम ब्याज वाले कर्ज पर लगाएँ
+• 0% प्रारंभिक दर वाले बैलेंस ट्रांसफर कार्ड पर विचार करें
+
+💳 क्रेडिट कार्ड कर्ज:
+• कर्ज-मुक्त होने तक कार्ड का उपयोग बंद करें
+• उधारदाताओं से कम ब्याज पर बातचीत करें
+• दर कम हो तो कर्ज समेकन ऋण पर विचार करें
+• नया कर्ज रोकने के लिए नकद/डेबिट का उपयोग करें
+
+🏠 मॉर्गेज अनुकूलन:
+• द्वि-साप्ताहिक भुगतान करें
+• दरें 0.5%+ घटें तो रीफाइनेंसिंग पर विचार करें
+• संभव हो तो अतिरिक्त मूलधन चुकाएँ
+
+📊 ट्रैकिंग:
+• कर्ज भुगतान टाइमलाइन कैलकुलेटर का उपयोग करें
+• छोटे मील के पत्थर मनाएँ
+• ऑटो-पे सेट करें ताकि लेट फीस न लगे""",
+    ('payoff.general', 'gu'): """🔥 દેવું ચુકવણી વ્યૂહરચના (સામાન્ય માર્ગદર્શન):
+
+⚡ તરત કરો:
+• બધા દેવા ને વ્યાજદર મુજબ યાદીબદ્ધ કરો (સૌથી વધુ પહેલા)
+• સૌથી વધુ વ્યાજવાળા સિવાય બાકીના પર લઘુત્તમ ચુકવણી
+• વધારાની રકમ સૌથી વધુ વ્યાજવાળા દેવા પર મૂકો
+• 0% ઇન્ટ્રો રેટ ધરાવતા બેલેન્સ ટ્રાન્સફર કાર્ડ વિચારો
+
+💳 ક્રેડિટ કાર્ડ દેવું:
+• દેવું-મુક્ત થાય ત્યાં સુધી કાર્ડનો ઉપયોગ બંધ કરો
+• લેન્ડર્સ સાથે ઓછા વ્યાજ પર વાટાઘાટ કરો
+• દર ઓછો હોય તો દેવું એકીકરણ લોન વિચારો
+• નવું દેવું ટાળવા કેશ/ડેબિટ વાપરો
+
+🏠 મોર્ગેજ ઑપ્ટિમાઇઝેશન:
+• બાય-વીકલી ચુકવણી કરો
+• દરો 0.5%+ ઘટે તો રિફાઇનાન્સ વિચારો
+• શક્ય હોય તો વધારાનો પ્રિન્સિપલ ચૂકવો
+
+📊 ટ્રેકિંગ:
+• દેવું ચુકવણી સમયરેખા કેલ્ક્યુલેટર વાપરો
+• નાના માઈલસ્ટોન ઉજવો
+• મોડ ફી ટાળવા માટે ઑટો-પે સેટ કરો""",
+
+    # Why expenses went up, by category
+    ('spending.trend', 'en'): """📈 EXPENSE ANALYSIS - LAST QUARTER:
+
+💰 TOTAL EXPENSES: ${total_expenses:,}
+
+🔍 TOP EXPENSE CATEGORIES:
+{top_categories}
+
+⚠️ MAJOR CONTRIBUTORS TO HIGH EXPENSES:
+• Housing: ${housing:,} - Your largest expense
+• Food: ${food:,} - High dining out costs
+• Transport: ${transport:,} - Transportation expenses
+
+💡 RECOMMENDATIONS TO REDUCE EXPENSES:
+1. Review dining out costs (currently ${food:,})
+2. Optimize housing costs if possible
+3. Track transportation expenses more closely
+4. Consider reducing entertainment spending""",
+
+    # Opening of every vacation answer
+    ('vacation.guide', 'en'): """
+🏖️ VACATION BUDGET PLANNING GUIDE:
+
+💰 BUDGET CALCULATION:
+• Safe Budget: 10% of monthly income
+• Comfortable Budget: 20% of monthly income  
+• Luxury Budget: 30% of monthly income
+• Emergency Fund: Keep 3-6 months expenses untouched
+
+📊 VACATION AFFORDABILITY ANALYSIS:""",
+    ('vacation.guide', 'hi'): """
+🏖️ छुट्टी बजट योजना गाइड:
+
+💰 बजट गणना:
+• सुरक्षित बजट: मासिक आय का 10%
+• आरामदायक बजट: मासिक आय का 20%
+• लक्ज़री बजट: मासिक आय का 30%
+• आपातकालीन फंड: 3-6 महीने का खर्च अछूता रखें
+
+📊 छुट्टी वहन क्षमता विश्लेषण:""",
+    ('vacation.guide', 'gu'): """
+🏖️ રજા બજેટ આયોજન ગાઇડ:
+
+💰 બજેટ ગણતરી:
+• સુરક્ષિત બજેટ: માસિક આવકનો 10%
+• આરામદાયક બજેટ: માસિક આવકનો 20%
+• લક્ઝરી બજેટ: માસિક આવકનો 30%
+• આપત્તિકાળીન ફંડ: 3-6 મહિના ખર્ચ અછૂતા રાખો
+
+📊 રજા વહન ક્ષમતા વિશ્લેષણ:""",
+
+    # Vacation budget from monthly income and expenses
+    ('vacation.budget', 'en'): """
+• Monthly Income: ${monthly_income:,}
+• Monthly Expenses: ${monthly_expenses:,}
+• Monthly Surplus: ${monthly_surplus:,}
+
+🎯 RECOMMENDED VACATION BUDGETS:
+• Safe Budget: ${safe_budget:,.0f} (10% of income)
+• Comfortable Budget: ${comfortable_budget:,.0f} (20% of income)
+• Luxury Budget: ${luxury_budget:,.0f} (30% of income)
+
+💡 VACATION SAVING STRATEGIES:
+• Start saving 6 months before your trip
+• Set up automatic transfers to vacation fund
+• Cut back on dining out and entertainment
+• Use travel rewards credit cards
+• Book flights and hotels in advance for discounts
+• Consider off-season travel for better deals
+• Look for package deals and group discounts
+
+🚀 MONEY-SAVING TIPS:
+• Use price comparison websites (Kayak, Skyscanner)
+• Book accommodations with kitchen facilities
+• Cook some meals instead of eating out
+• Use public transportation instead of taxis
+• Look for free activities and attractions
+• Consider alternative destinations with lower costs
+
+⚠️ IMPORTANT REMINDERS:
+• Don't use emergency fund for vacation
+• Pay off high-interest debt before vacation
+• Set a strict budget and stick to it
+• Consider travel insurance for expensive trips
+• Have a backup plan for unexpected expenses""",
+    ('vacation.budget', 'hi'): """
+• मासिक आय: ${monthly_income:,}
+• मासिक खर्च: ${monthly_expenses:,}
+• मासिक अधिशेष: ${monthly_surplus:,}
+
+🎯 अनुशंसित छुट्टी बजट:
+• सुरक्षित बजट: ${safe_budget:,.0f} (आय का 10%)
+• आरामदायक बजट: ${comfortable_budget:,.0f} (आय का 20%)
+• लक्ज़री बजट: ${luxury_budget:,.0f} (आय का 30%)
+
+💡 छुट्टी बचत रणनीतियां:
+• यात्रा से 6 महीने पहले बचत शुरू करें
+• छुट्टी फंड में स्वचालित ट्रांसफर सेट करें
+• बाहर खाने और मनोरंजन में कटौती करें
+• ट्रैवल रिवार्ड्स क्रेडिट कार्ड का उपयोग करें
+• छूट के लिए फ्लाइट और होटल पहले बुक करें""",
+    ('vacation.budget', 'gu'): """
+• માસિક આવક: ${monthly_income:,}
+• માસિક ખર્ચ: ${monthly_expenses:,}
+• માસિક વધારાની રકમ: ${monthly_surplus:,}
+
+🎯 ભલામણ કરેલ રજા બજેટ:
+• સુરક્ષિત બજેટ: ${safe_budget:,.0f} (આવકનો 10%)
+• આરામદાયક બજેટ: ${comfortable_budget:,.0f} (આવકનો 20%)
+• લક્ઝરી બજેટ: ${luxury_budget:,.0f} (આવકનો 30%)
+
+💡 રજા બચત વ્યૂહરચના:
+• તમારી યાત્રાથી 6 મહિના પહેલા બચત શરૂ કરો
+• રજા ફંડમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
+• બહાર ખાવા અને મનોરંજનમાં કટોકટી કરો
+• ટ્રાવેલ રિવાર્ડ્સ ક્રેડિટ કાર્ડનો ઉપયોગ કરો""",
+
+    # Vacation guidelines when no income data is shared
+    ('vacation.general', 'en'): """
+🎯 GENERAL VACATION BUDGET GUIDELINES:
+
+💰 BUDGET CALCULATION RULES:
+• Safe Budget: 10% of monthly income
+• Comfortable Budget: 20% of monthly income
+• Luxury Budget: 30% of monthly income
+
+💡 VACATION SAVING STRATEGIES:
+• Start saving 6 months before your trip
+• Set up automatic transfers to vacation fund
+• Cut back on dining out and entertainment
+• Use travel rewards credit cards
+• Book flights and hotels in advance for discounts
+• Consider off-season travel for better deals
+
+🚀 MONEY-SAVING TIPS:
+• Use price comparison websites (Kayak, Skyscanner)
+• Book accommodations with kitchen facilities
+• Cook some meals instead of eating out
+• Use public transportation instead of taxis
+• Look for free activities and attractions
+• Consider alternative destinations with lower costs
+
+⚠️ IMPORTANT REMINDERS:
+• Don't use emergency fund for vacation
+• Pay off high-interest debt before vacation
+• Set a strict budget and stick to it
+• Consider travel insurance for expensive trips""",
+    ('vacation.general', 'hi'): """
+🎯 सामान्य छुट्टी बजट दिशानिर्देश:
+
+💰 बजट गणना नियम:
+• सुरक्षित बजट: मासिक आय का 10%
+• आरामदायक बजट: मासिक आय का 20%
+• लक्ज़री बजट: मासिक आय का 30%
+
+💡 छुट्टी बचत रणनीतियां:
+• यात्रा से 6 महीने पहले बचत शुरू करें
+• छुट्टी फंड में स्वचालित ट्रांसफर सेट करें
+• बाहर खाने और मनोरंजन में कटौती करें
+• ट्रैवल रिवार्ड्स क्रेडिट कार्ड का उपयोग करें""",
+    ('vacation.general', 'gu'): """
+🎯 સામાન્ય રજા બજેટ માર્ગદર્શન:
+
+💰 બજેટ ગણતરી નિયમો:
+• સુરક્ષિત બજેટ: માસિક આવકનો 10%
+• આરામદાયક બજેટ: માસિક આવકનો 20%
+• લક્ઝરી બજેટ: માસિક આવકનો 30%
+
+💡 રજા બચત વ્યૂહરચના:
+• તમારી યાત્રાથી 6 મહિના પહેલા બચત શરૂ કરો
+• રજા ફંડમાં સ્વચાલિત ટ્રાન્સફર સેટ કરો
+• બહાર ખાવા અને મનોરંજનમાં કટોકટી કરો""",
+
+    # 50/30/20 budget plan
+    ('budget.plan', 'en'): """🎯 DIRECT ANSWER: Yes, I can help you create a comprehensive budget! Based on your financial data, here's your personalized budget.
+
+📋 CONTEXTUAL EXPLANATION: A budget helps you allocate your income effectively and achieve financial goals. With a monthly income of ₹{monthly_income:,}, here's the recommended allocation using the proven 50/30/20 rule.
+
+✅ ACTIONABLE RECOMMENDATIONS:
+1. 🏠 NEEDS (50% = ₹{needs_budget:,}):
+   • Housing: ₹{housing:,.0f} (rent/mortgage)
+   • Utilities: ₹{utilities:,.0f} (electricity, water, internet)
+   • Groceries: ₹{groceries:,.0f} (food essentials)
+   • Transportation: ₹{transportation:,.0f} (fuel, public transport)
+   • Insurance: ₹{insurance:,.0f} (health, auto)
+
+2. 🎯 WANTS (30% = ₹{wants_budget:,}):
+   • Entertainment: ₹{entertainment:,.0f} (movies, dining out)
+   • Hobbies: ₹{hobbies:,.0f} (personal interests)
+   • Shopping: ₹{shopping:,.0f} (clothes, gadgets)
+   • Travel: ₹{travel:,.0f} (vacations, trips)
+
+3. 💰 SAVINGS & DEBT (20% = ₹{savings_budget:,}):
+   • Emergency Fund: ₹{emergency_fund:,.0f}
+   • Debt Payment: ₹{debt_payment:,.0f}
+   • Investments: ₹{investments:,.0f}
+
+🔄 FOLLOW-UP SUGGESTIONS: Would you like me to create a detailed monthly budget template, help you track expenses, or suggest ways to increase your savings rate?""",
+
+    # Answer to questions no intent matched
+    ('general', 'en'): """
+🎯 COMPREHENSIVE FINANCIAL GUIDANCE:
+
+💰 IMMEDIATE ACTIONS YOU CAN TAKE:
+• Create a budget using the 50/30/20 rule (needs/wants/savings)
+• Build an emergency fund of 3-6 months expenses
+• Pay off high-interest debt first (credit cards)
+• Start investing in low-cost index funds
+
+📊 FINANCIAL HEALTH CHECKLIST:
+• Track all expenses for 30 days
+• Review and optimize all subscriptions
+• Negotiate better rates on bills
+• Set up automatic savings transfers
+
+🚀 LONG-TERM WEALTH BUILDING:
+• Maximize employer 401k matching
+• Invest in tax-advantaged accounts (IRA, 401k)
+• Diversify investments across asset classes
+• Review and rebalance portfolio quarterly
+
+⚠️ COMMON MISTAKES TO AVOID:
+• Don't invest money you need within 5 years
+• Don't try to time the market
+• Don't ignore high-interest debt
+• Don't skip emergency fund building
+
+💡 PRO TIPS:
+• Automate everything possible (savings, investments, bill payments)
+• Use cashback apps and credit card rewards
+• Consider robo-advisors for hands-off investing
+• Review financial goals and progress monthly""",
+    ('general', 'hi'): """
+🎯 व्यापक वित्तीय मार्गदर्शन:
+
+💰 आप तुरंत कर सकते हैं:
+• 50/30/20 नियम का उपयोग करके बजट बनाएं (जरूरतें/चाहतें/बचत)
+• 3-6 महीने के खर्च का आपातकालीन फंड बनाएं
+• पहले उच्च ब्याज वाले कर्ज चुकाएं (क्रेडिट कार्ड)
+• कम लागत वाले इंडेक्स फंड में निवेश शुरू करें
+
+📊 वित्तीय स्वास्थ्य चेकलिस्ट:
+• 30 दिनों तक सभी खर्चों को ट्रैक करें
+• सभी सब्सक्रिप्शन की समीक्षा और अनुकूलन करें
+• बिलों पर बेहतर दरों पर बातचीत करें
+• स्वचालित बचत ट्रांसफर सेट करें
+
+🚀 दीर्घकालिक धन निर्माण:
+• नियोक्ता 401k मिलान को अधिकतम करें
+• कर-लाभ खातों में निवेश करें (IRA, 401k)
+• परिसंपत्ति वर्गों में निवेश को विविधता दें
+• त्रैमासिक रूप से पोर्टफोलियो की समीक्षा करें""",
+    ('general', 'gu'): """
+🎯 વ્યાપક નાણાકીય માર્ગદર્શન:
+
+💰 તમે તરત જ કરી શકો છો:
+• 50/30/20 નિયમનો ઉપયોગ કરીને બજેટ બનાવો (જરૂરિયાતો/ઇચ્છાઓ/બચત)
+• 3-6 મહિના ખર્ચનો આપત્તિકાળીન ફંડ બનાવો
+• પહેલા ઉચ્ચ વ્યાજવાળા દેવા ચૂકવો (ક્રેડિટ કાર્ડ)
+• ઓછા ખર્ચાળ ઇન્ડેક્સ ફંડમાં રોકાણ શરૂ કરો
+
+📊 નાણાકીય સ્વાસ્થ્ય ચેકલિસ્ટ:
+• 30 દિવસ સુધી બધા ખર્ચને ટ્રેક કરો
+• બધા સબ્સ્ક્રિપ્શનની સમીક્ષા અને ઑપ્ટિમાઇઝેશન કરો
+• બિલો પર વધુ સારા દરો પર વાટાઘાટ કરો
+• સ્વચાલિત બચત ટ્રાન્સફર સેટ કરો
+
+🚀 લાંબા ગાળાના ધન નિર્માણ:
+• નિયામક 401k મેચિંગને મહત્તમ કરો
+• કર-લાભ ખાતાઓમાં રોકાણ કરો (IRA, 401k)
+• પરિસંપત્તિ વર્ગોમાં રોકાણને વિવિધતા આપો
+• ત્રૈમાસિક રીતે પોર્ટફોલિયોની સમીક્ષા કરો"""
+}
+
+
+def template(intent, lang):
+    """Text of an intent in a language, or in English if it has no translation."""
+    return TEMPLATES.get((intent, lang)) or TEMPLATES[(intent, 'en')]
+
+
+def render(intent, lang, **values):
+    """Template of an intent filled with named values."""
+    return template(intent, lang).format_map(values)
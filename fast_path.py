@@ -0,0 +1,109 @@
+"""
+First-tier matching for questions that need no model and no analysis.
+
+Greetings and questions asking for a single figure ("what is my credit
+score", "मेरी नेट वर्थ क्या है") are recognized with patterns compiled once
+at import, so the assistant can answer them from the user's snapshot
+before the response cache, the model or the fallback cascade are involved.
+A question only counts as a lookup if every word in it is either part of
+the lookup phrase or a filler word; anything more ("how can I improve my
+credit score") goes down the normal path. Greetings are held to the same
+rule, so "hi, how can I reduce my debt?" is a question, not a greeting.
+"""
+
+import re
+import threading
+from collections import Counter
+
+# Word characters: \w plus Devanagari and Gujarati vowel signs (but not the danda)
+WORD_CHARS = r'\w\u0900-\u0963\u0966-\u097F\u0A80-\u0AFF'
+WORD = re.compile(f'[{WORD_CHARS}]+')
+
+
+def greeting_pattern(tokens):
+    """Regex finding any of ``tokens`` as whole words ('hi' but not 'this')."""
+    alternatives = '|'.join(re.escape(token) for token in sorted(set(tokens), key=len, reverse=True))
+    return re.compile(f'(?<![{WORD_CHARS}])(?:{alternatives})(?![{WORD_CHARS}])', re.IGNORECASE)
+
+
+class LookupMatcher:
+    """Maps a one-figure question to the name of the figure it asks for.
+
+    ``phrases`` is ``{figure: {lang: [phrase, ...]}}`` and ``fillers`` is
+    ``{lang: [word, ...]}``: words a question may contain besides the phrase.
+    """
+
+    def __init__(self, phrases, fillers):
+        self._phrases = {}
+        for figure, by_lang in phrases.items():
+            for lang, entries in by_lang.items():
+                for phrase in entries:
+                    self._phrases.setdefault(lang, {})[' '.join(WORD.findall(phrase.lower()))] = figure
+        self._fillers = {lang: frozenset(word.lower() for word in words) for lang, words in fillers.items()}
+
+    def match(self, text, langs):
+        """Figure asked for in ``text`` by phrases and fillers of ``langs``, or None."""
+        fillers = [self._fillers.get(lang, ()) for lang in langs]
+        words = [word for word in WORD.findall(text.lower()) if not any(word in f for f in fillers)]
+        if not words:
+            return None
+        phrase = ' '.join(words)
+        for lang in langs:
+            figure = self._phrases.get(lang, {}).get(phrase)
+            if figure is not None:
+                return figure
+        return None
+
+
+class GreetingMatcher:
+    """Tells whether a message is a greeting and nothing more.
+
+    ``greetings`` is ``{lang: [token, ...]}`` and ``fillers`` is
+    ``{lang: [word, ...]}``: words a greeting may contain besides the tokens.
+    """
+
+    def __init__(self, greetings, fillers):
+        self._patterns = {lang: greeting_pattern(tokens) for lang, tokens in greetings.items()}
+        self._fillers = {lang: frozenset(word.lower() for word in words) for lang, words in fillers.items()}
+
+    def match(self, text, langs):
+        """Whether ``text`` greets in ``langs`` and every other word is a filler of ``langs``."""
+        rest, greeted = text.lower(), False
+        for lang in langs:
+            pattern = self._patterns.get(lang)
+            if pattern is not None:
+                rest, count = pattern.subn(' ', rest)
+                greeted = greeted or count > 0
+        if not greeted:
+            return False
+        fillers = [self._fillers.get(lang, ()) for lang in langs]
+        return all(any(word in f for f in fillers) for word in WORD.findall(rest))
+
+
+class HitCounter:
+    """Thread-safe count of questions a tier answered, by answer kind, and of those it passed on."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.answered = Counter()
+        self.passed = 0
+
+    def hit(self, kind):
+        with self._lock:
+            self.answered[kind] += 1
+
+    def miss(self):
+        with self._lock:
+            self.passed += 1
+
+    def stats(self):
+        with self._lock:
+            hits = sum(self.answered.values())
+            total = hits + self.passed
+            return {
+                'questions': total,
+                'hits': hits,
+                'misses': self.passed,
+                'hit_rate': round(hits / total, 4) if total else 0.0,
+                'answered': dict(self.answered)
+            }
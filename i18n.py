@@ -0,0 +1,65 @@
+"""
+Translation catalogs of the web UI and the assistant.
+
+Each language's strings live in ``<directory>/<lang>.json`` with three
+sections: ``ui`` (labels looked up by ``t()`` in templates and flash
+messages), ``assistant`` (format strings of the rule-based answers) and
+``greetings`` (instant replies to a greeting). A language is read from disk
+the first time it is asked for, so importing the app loads none, and the
+loaded catalog is then shared read-only by every request of the worker.
+"""
+
+import os
+import threading
+from types import MappingProxyType
+
+import jsoncodec
+
+
+class Catalog:
+    """Strings of one language; keys it lacks come from the default language."""
+
+    def __init__(self, lang, data, fallback=None):
+        self.lang = lang
+        self.ui = MappingProxyType({**(fallback.ui if fallback else {}), **data.get('ui', {})})
+        self.messages = MappingProxyType({**(fallback.messages if fallback else {}), **data.get('assistant', {})})
+        self.greetings = tuple(data.get('greetings') or (fallback.greetings if fallback else ()))
+
+    def gettext(self, key):
+        """UI label for ``key``, or the key itself if no language has it."""
+        return self.ui.get(key, key)
+
+
+class Catalogs:
+    """Lazily loaded catalogs of the supported ``languages``, keyed by code."""
+
+    def __init__(self, directory, languages, default='en'):
+        self.directory = directory
+        self.languages = tuple(languages)
+        self.default = default
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def get(self, lang):
+        """Catalog of ``lang``, or of the default language if it is unsupported."""
+        if lang not in self.languages:
+            lang = self.default
+        catalog = self._loaded.get(lang)
+        if catalog is None:
+            with self._lock:
+                catalog = self._loaded.get(lang)
+                if catalog is None:
+                    catalog = self._loaded[lang] = self._load(lang)
+        return catalog
+
+    def _load(self, lang):
+        fallback = None
+        if lang != self.default:
+            fallback = self._loaded.get(self.default) or self._loaded.setdefault(
+                self.default, self._load(self.default))
+        with open(os.path.join(self.directory, f"{lang}.json"), 'rb') as f:
+            return Catalog(lang, jsoncodec.loads(f.read()), fallback)
+
+    def loaded(self):
+        """Languages read from disk so far."""
+        return sorted(self._loaded)
@@ -0,0 +1,84 @@
+"""
+Keyword intent matching for the rule-based assistant.
+
+All keyword tokens of all languages are compiled once into an Aho-Corasick
+automaton, so a query is classified in a single pass over its characters
+however many tokens there are. A token only matches where a word starts,
+and it may run on into the rest of the word, so stems such as 'invest' or
+'liabilit' still match 'investments' and 'liabilities' while 'bank' no
+longer matches inside 'embankment'.
+"""
+
+import unicodedata
+from collections import deque, namedtuple
+
+Match = namedtuple('Match', 'intent lang term start end')
+
+
+def is_word_char(ch):
+    """Letters, digits and combining marks (Devanagari and Gujarati vowel signs)."""
+    return ch.isalnum() or unicodedata.category(ch)[0] == 'M' or ch == '_'
+
+
+class IntentMatcher:
+    """Aho-Corasick automaton over ``{intent: {lang: [token, ...]}}``.
+
+    Tokens are matched case-insensitively; the same token may belong to
+    several intents.
+    """
+
+    def __init__(self, vocabulary):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for intent, by_lang in vocabulary.items():
+            for lang, tokens in by_lang.items():
+                for token in tokens:
+                    self._add(token.lower(), (intent, lang, token.lower()))
+        self._link()
+
+    def _add(self, token, entry):
+        state = 0
+        for ch in token:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if entry not in self._out[state]:
+            self._out[state] += (entry,)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def scan(self, text):
+        """Every token occurrence in ``text`` that starts at a word boundary."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for intent, lang, term in out[state]:
+                start = end - len(term)
+                if start == 0 or not is_word_char(text[start - 1]):
+                    matches.append(Match(intent, lang, term, start, end))
+        return matches
+
+    def intents(self, text, langs=None):
+        """Set of intents matched in ``text``, optionally only by tokens of ``langs``."""
+        return frozenset(m.intent for m in self.scan(text) if langs is None or m.lang in langs)
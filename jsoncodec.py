@@ -0,0 +1,72 @@
+"""
+One JSON codec for storage blobs, prompts, API responses and the session.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+produce compact UTF-8 output without ``\\u`` escapes, which keeps Hindi and
+Gujarati text several times smaller than ``ensure_ascii`` JSON.
+"""
+
+import json
+from collections.abc import Mapping, Sequence
+
+# orjson is optional; without it everything goes through the stdlib encoder.
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+
+def dumps_bytes(obj, default=None, indent=False, sort_keys=False):
+    """Serialize ``obj`` to UTF-8 encoded JSON bytes.
+
+    ``default`` is called for objects the encoder does not know, as with
+    :func:`json.dumps`. When one is given, dates and dataclasses are routed
+    through it too so both backends agree on their representation. Without
+    one, read-only sequence and mapping views (such as the record views of a
+    binary snapshot) are encoded as lists and objects.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        try:
+            return orjson.dumps(obj, default=default or _builtin, option=option)
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) still
+            # encode with the stdlib
+            pass
+    return _stdlib_dumps(obj, default or _builtin, indent, sort_keys).encode('utf-8')
+
+
+def dumps(obj, default=None, indent=False, sort_keys=False):
+    """Serialize ``obj`` to a JSON string."""
+    if orjson is None:
+        return _stdlib_dumps(obj, default or _builtin, indent, sort_keys)
+    return dumps_bytes(obj, default, indent, sort_keys).decode('utf-8')
+
+
+def loads(data):
+    """Parse JSON from a str, bytes or bytearray."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _builtin(obj):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj, default, indent, sort_keys):
+    return json.dumps(obj, default=default, ensure_ascii=False, sort_keys=sort_keys,
+                      indent=2 if indent else None,
+                      separators=(',', ': ') if indent else (',', ':'))
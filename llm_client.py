@@ -0,0 +1,452 @@
+"""
+Pooled client for an OpenAI-compatible chat completions API.
+
+Each worker process owns one LLMClient. The client keeps its own keep-alive
+connection pools (a requests session shared by the worker's threads and an
+aiohttp session for its event loop) and its own credentials, so nothing is
+written to module-level SDK state. Failures are classified as retryable
+(rate limits, timeouts, connection drops, 5xx) or fatal (quota exhausted,
+authentication, bad requests); retryable ones are retried with bounded
+exponential backoff and full jitter, within an overall deadline so a
+caller waits at most that long however many attempts time out. A
+CircuitBreaker stops calls entirely
+while the provider keeps failing, so callers can fall back immediately.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+# HTTP libraries are optional; without them the client reports itself
+# unavailable and callers use their offline fallback.
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    requests = None
+
+try:
+    import aiohttp  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+
+class LLMError(Exception):
+    """A failed chat completion.
+
+    ``kind`` is one of 'rate_limit', 'quota', 'timeout', 'connection',
+    'server', 'auth', 'bad_request' or 'invalid_response'.
+    """
+
+    def __init__(self, message, kind, retryable, status=None, retry_after=None):
+        super().__init__(message)
+        self.kind = kind
+        self.retryable = retryable
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+    def __init__(self, retry_in):
+        super().__init__(f"Circuit open; next probe in {retry_in:.0f}s", 'circuit_open', False)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker shared by all threads of a worker.
+
+    ``threshold`` consecutive failures of the ``trip_on`` kinds open the
+    circuit. After ``cooldown`` seconds one caller is let through as a probe
+    (half-open): success closes the circuit, another such failure reopens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, threshold=3, cooldown=30.0, trip_on=('quota', 'rate_limit', 'timeout')):
+        self.threshold = max(int(threshold), 1)
+        self.cooldown = cooldown
+        self.trip_on = frozenset(trip_on)
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go to the provider now; raises nothing."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self):
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(self.cooldown - (time.monotonic() - self.opened_at), 0.0)
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self, error):
+        kind = getattr(error, 'kind', None)
+        with self._lock:
+            if kind in self.trip_on:
+                self.failures += 1
+                if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                    self._open()
+            elif self.state == self.HALF_OPEN:
+                # Inconclusive probe (bad request, cancelled call...): let
+                # the next caller probe again
+                self.state = self.OPEN
+
+    def _open(self):
+        if self.state != self.OPEN:
+            self.trips += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            retry_in = max(self.cooldown - (time.monotonic() - self.opened_at), 0.0) if self.state == self.OPEN else 0.0
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'threshold': self.threshold,
+                'cooldown': self.cooldown,
+                'retry_in': round(retry_in, 1),
+                'trips': self.trips,
+                'rejected': self.rejected
+            }
+
+
+def classify_response(status, body, retry_after=None):
+    """LLMError for a non-2xx response of status ``status`` and decoded ``body``."""
+    error = body.get('error') if isinstance(body, dict) else None
+    error = error if isinstance(error, dict) else {}
+    code = error.get('code') or error.get('type') or ''
+    message = error.get('message') or f"HTTP {status}"
+    if status == 429:
+        if code == 'insufficient_quota':
+            return LLMError(message, 'quota', False, status)
+        return LLMError(message, 'rate_limit', True, status, retry_after)
+    if status == 408:
+        return LLMError(message, 'timeout', True, status)
+    if status >= 500:
+        return LLMError(message, 'server', True, status, retry_after)
+    if status in (401, 403):
+        return LLMError(message, 'auth', False, status)
+    return LLMError(message, 'bad_request', False, status)
+
+
+def _retry_after(headers):
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode_json(data):
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
+
+
+def _message_content(body):
+    try:
+        return body['choices'][0]['message']['content'] or ''
+    except (KeyError, IndexError, TypeError):
+        raise LLMError("Malformed chat completion response", 'invalid_response', False)
+
+
+def _delta_content(line):
+    """Text of one ``data:`` line of a streamed completion; None at [DONE]."""
+    if not line.startswith('data:'):
+        return ''
+    data = line[5:].strip()
+    if data == '[DONE]':
+        return None
+    chunk = _decode_json(data)
+    try:
+        return chunk['choices'][0].get('delta', {}).get('content') or ''
+    except (KeyError, IndexError, TypeError, AttributeError):
+        raise LLMError("Malformed chat completion chunk", 'invalid_response', False)
+
+
+class LLMClient:
+    """Chat completions over pooled keep-alive connections, with retries."""
+
+    def __init__(self, api_key, api_base='https://api.openai.com/v1', model='gpt-3.5-turbo',
+                 timeout=8, max_retries=2, backoff_base=0.25, backoff_max=4.0, pool_size=10,
+                 breaker=None, deadline=None):
+        self.api_key = api_key
+        self.url = api_base.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max(int(max_retries), 0)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.breaker = breaker
+        self.deadline = deadline
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+        self._aio_session = None
+        self._aio_loop = None
+
+    @property
+    def available(self):
+        return requests is not None
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry ``attempt`` (0-based): full jitter, capped."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def _expiry(self):
+        return time.monotonic() + self.deadline if self.deadline else None
+
+    def _attempt_timeout(self, timeout, expiry):
+        """Timeout of the next attempt: ``timeout``, cut to what is left of the deadline."""
+        if expiry is None:
+            return timeout
+        return max(min(timeout, expiry - time.monotonic()), 0.001)
+
+    def _retry_delay(self, error, attempt, timeout, expiry):
+        """Seconds to wait before retrying ``error``, or None to give up.
+
+        A retry is only made if it leaves the next attempt at least a second
+        (or its whole timeout, if shorter) before the deadline.
+        """
+        if not error.retryable or attempt >= self.max_retries:
+            return None
+        delay = self.backoff(attempt, error.retry_after)
+        if expiry is not None and expiry - time.monotonic() - delay < min(timeout, 1.0):
+            return None
+        return delay
+
+    def _payload(self, messages, stream, options):
+        payload = {'model': options.pop('model', self.model), 'messages': messages}
+        payload.update(options)
+        if stream:
+            payload['stream'] = True
+        return payload
+
+    def _headers(self):
+        return {'Authorization': f"Bearer {self.api_key}", 'Content-Type': 'application/json'}
+
+    # Synchronous API
+
+    def _http(self):
+        # Sessions are created lazily and never shared across a fork, so a
+        # preloading server gives every worker its own pool.
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session, self._session_pid = session, pid
+        return self._session
+
+    def _post(self, payload, timeout, stream=False):
+        try:
+            response = self._http().post(self.url, data=json.dumps(payload), headers=self._headers(),
+                                         timeout=timeout, stream=stream)
+        except requests.Timeout as e:
+            raise LLMError(f"Request timed out: {e}", 'timeout', True)
+        except requests.ConnectionError as e:
+            raise LLMError(f"Connection failed: {e}", 'connection', True)
+        if response.status_code >= 400:
+            body = _decode_json(response.content)
+            response.close()
+            raise classify_response(response.status_code, body, _retry_after(response.headers))
+        return response
+
+    def _admit(self):
+        if self.breaker is not None and not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.retry_in())
+
+    def _settle(self, error=None):
+        if self.breaker is not None:
+            if error is None:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure(error)
+
+    def _with_retries(self, call, timeout):
+        """Run ``call(attempt_timeout)``, retrying retryable errors until the deadline."""
+        self._admit()
+        expiry = self._expiry()
+        attempt = 0
+        while True:
+            try:
+                result = call(self._attempt_timeout(timeout, expiry))
+            except LLMError as e:
+                delay = self._retry_delay(e, attempt, timeout, expiry)
+                if delay is None:
+                    self._settle(e)
+                    raise
+                time.sleep(delay)
+                attempt += 1
+            except BaseException as e:
+                self._settle(e)
+                raise
+            else:
+                self._settle()
+                return result
+
+    def chat(self, messages, timeout=None, **options):
+        """Complete ``messages`` and return the reply text."""
+        payload = self._payload(messages, False, options)
+
+        def call(attempt_timeout):
+            response = self._post(payload, attempt_timeout)
+            body = _decode_json(response.content)
+            return _message_content(body)
+
+        return self._with_retries(call, timeout or self.timeout)
+
+    def stream(self, messages, timeout=None, **options):
+        """Yield reply text deltas as they arrive.
+
+        Connecting is retried; once the first delta has been yielded a
+        failure is raised to the caller, since the reply cannot be replayed.
+        """
+        payload = self._payload(messages, True, options)
+        response = self._with_retries(lambda attempt_timeout: self._post(payload, attempt_timeout, stream=True),
+                                      timeout or self.timeout)
+        try:
+            for raw in response.iter_lines():
+                text = _delta_content(raw.decode('utf-8'))
+                if text is None:
+                    return
+                if text:
+                    yield text
+        except requests.RequestException as e:
+            raise LLMError(f"Stream interrupted: {e}", 'connection', True)
+        finally:
+            response.close()
+
+    # Asynchronous API
+
+    def _aio_http(self):
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_loop is not loop or self._aio_session.closed:
+            self._discard_aio_session()
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._aio_session = aiohttp.ClientSession(connector=connector)
+            self._aio_loop = loop
+        return self._aio_session
+
+    def _discard_aio_session(self):
+        # A session can only be closed on the loop it was created on. If that
+        # loop runs in another thread the close is scheduled there; a loop
+        # that has already been closed can no longer close its connections,
+        # which is why the owner of a loop should await aclose() before it ends.
+        session, loop = self._aio_session, self._aio_loop
+        self._aio_session = self._aio_loop = None
+        if session is not None and not session.closed and loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def _apost(self, payload, timeout, stream=False):
+        if aiohttp is None:
+            raise LLMError("aiohttp is not installed", 'connection', False)
+        try:
+            response = await self._aio_http().post(
+                self.url, data=json.dumps(payload), headers=self._headers(),
+                # A stream may outlast the timeout as long as data keeps coming
+                timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout) if stream
+                else aiohttp.ClientTimeout(total=timeout))
+        except asyncio.TimeoutError as e:
+            raise LLMError(f"Request timed out: {e}", 'timeout', True)
+        except aiohttp.ClientError as e:
+            raise LLMError(f"Connection failed: {e}", 'connection', True)
+        if response.status >= 400:
+            body = _decode_json(await response.read())
+            response.release()
+            raise classify_response(response.status, body, _retry_after(response.headers))
+        return response
+
+    async def _awith_retries(self, call, timeout):
+        self._admit()
+        expiry = self._expiry()
+        attempt = 0
+        while True:
+            try:
+                result = await call(self._attempt_timeout(timeout, expiry))
+            except LLMError as e:
+                delay = self._retry_delay(e, attempt, timeout, expiry)
+                if delay is None:
+                    self._settle(e)
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            except BaseException as e:
+                self._settle(e)
+                raise
+            else:
+                self._settle()
+                return result
+
+    async def achat(self, messages, timeout=None, **options):
+        """chat() for the event loop."""
+        payload = self._payload(messages, False, options)
+
+        async def call(attempt_timeout):
+            response = await self._apost(payload, attempt_timeout)
+            try:
+                body = _decode_json(await response.read())
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                raise LLMError(f"Reading response failed: {e}", 'connection', True)
+            finally:
+                response.release()
+            return _message_content(body)
+
+        return await self._awith_retries(call, timeout or self.timeout)
+
+    async def astream(self, messages, timeout=None, **options):
+        """stream() for the event loop."""
+        payload = self._payload(messages, True, options)
+        response = await self._awith_retries(
+            lambda attempt_timeout: self._apost(payload, attempt_timeout, stream=True), timeout or self.timeout)
+        try:
+            async for raw in response.content:
+                text = _delta_content(raw.decode('utf-8').strip())
+                if text is None:
+                    return
+                if text:
+                    yield text
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            raise LLMError(f"Stream interrupted: {e}", 'connection', True)
+        finally:
+            response.release()
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    async def aclose(self):
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = self._aio_loop = None
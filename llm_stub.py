@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an OpenAI-compatible chat completions API.
+
+Serves ``POST /v1/chat/completions``, plain and streamed, with a configurable
+latency distribution, injected quota, rate-limit, timeout and server
+failures, and canned replies. The assistant's provider path (retries,
+circuit breaker, caches, request coalescing) can then be benchmarked and
+load-tested offline. Every random draw comes from a generator seeded with
+the configured seed and the request body, so a run replays identically
+whatever order concurrent requests arrive in.
+
+    python llm_stub.py --latency lognormal:-1.0,0.5 --errors rate_limit=0.05,timeout=0.01
+    LLM_BACKEND=stub python app.py
+
+``GET /stats`` reports what was served; ``DELETE /stats`` returns the same
+and starts over, so the next run replays like a fresh stub. A request may
+force an outcome with the ``X-Stub-Error`` (quota, rate_limit, timeout,
+server) and ``X-Stub-Latency`` (seconds) headers.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+from collections import Counter, OrderedDict
+
+from aiohttp import web
+
+import jsoncodec
+from config import Config
+from prompt_builder import estimate_tokens
+
+# Latency distributions by name; parameters are in seconds
+LATENCY_DISTRIBUTIONS = {
+    'fixed': lambda rng, seconds: seconds,
+    'uniform': lambda rng, low, high: rng.uniform(low, high),
+    'normal': lambda rng, mean, sigma: max(rng.gauss(mean, sigma), 0.0),
+    'lognormal': lambda rng, mu, sigma: rng.lognormvariate(mu, sigma),
+    'exponential': lambda rng, mean: rng.expovariate(1 / mean)
+}
+
+ERROR_KINDS = ('quota', 'rate_limit', 'timeout', 'server')
+
+# Error bodies as the OpenAI API returns them, with their status codes
+ERROR_RESPONSES = {
+    'quota': (429, {'message': 'You exceeded your current quota, please check your plan and billing details.',
+                    'type': 'insufficient_quota', 'code': 'insufficient_quota'}),
+    'rate_limit': (429, {'message': 'Rate limit reached for requests. Please try again in 1s.',
+                         'type': 'requests', 'code': 'rate_limit_exceeded'}),
+    'server': (500, {'message': 'The server had an error while processing your request.',
+                     'type': 'server_error', 'code': None})
+}
+
+DEFAULT_REPLY = """DIRECT ANSWER: This is a canned answer from the local model stub to "{question}".
+
+CONTEXTUAL EXPLANATION: The stub does not look at your financial data; it returns fixed text so the assistant's request path can be measured.
+
+ACTIONABLE RECOMMENDATIONS:
+1. Review your monthly expenses by category
+2. Move a fixed share of income to savings on payday
+3. Keep an emergency fund of three to six months of expenses
+
+FOLLOW-UP SUGGESTIONS: Would you like a detailed budget plan?"""
+
+
+def parse_latency(spec):
+    """Sampler ``f(rng) -> seconds`` for a spec like 'lognormal:-1,0.5' or '0.2'."""
+    name, _, params = str(spec).strip().partition(':')
+    try:
+        if not params:
+            seconds = float(name)
+            return lambda rng: seconds
+        values = [float(value) for value in params.split(',')]
+        distribution = LATENCY_DISTRIBUTIONS[name]
+        distribution(random.Random(0), *values)
+    except (KeyError, TypeError, ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid latency spec {spec!r}; use a number of seconds or "
+                         f"one of {', '.join(LATENCY_DISTRIBUTIONS)} with parameters") from None
+    return lambda rng: distribution(rng, *values)
+
+
+def parse_errors(spec):
+    """Injected error rates from 'quota=0.01,rate_limit=0.05' as {kind: probability}."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in str(spec or '').split(','))):
+        kind, _, rate = item.partition('=')
+        if kind not in ERROR_KINDS:
+            raise ValueError(f"Unknown error kind {kind!r}; use one of {', '.join(ERROR_KINDS)}")
+        rates[kind] = float(rate)
+    if sum(rates.values()) > 1:
+        raise ValueError('Error rates add up to more than 1')
+    return rates
+
+
+def load_replies(path):
+    """Canned replies from a JSON object mapping regular expressions to reply text."""
+    if not path:
+        return []
+    with open(path, 'rb') as f:
+        rules = jsoncodec.loads(f.read())
+    return [(re.compile(pattern, re.IGNORECASE), reply) for pattern, reply in rules.items()]
+
+
+class StubProvider:
+    """Decides the latency, outcome and text of each stubbed completion."""
+
+    def __init__(self, latency='0', errors='', seed=0, replies=(), token_delay=0.0, hang=30.0,
+                 max_bodies=100000):
+        self.sample_latency = parse_latency(latency)
+        self.error_rates = parse_errors(errors)
+        self.seed = seed
+        self.replies = list(replies)
+        self.token_delay = token_delay
+        self.hang = hang
+        self.max_bodies = max_bodies
+        self.stats = Counter()
+        self._seen = OrderedDict()
+
+    def rng_for(self, body):
+        """Generator for a request, fixed by the seed and the request's content.
+
+        Repeats of the same body are numbered so each gets its own draws. The
+        numbers of the ``max_bodies`` most recently seen bodies are kept; a
+        body forgotten since starts again from the first draws.
+        """
+        digest = hashlib.sha1(jsoncodec.dumps_bytes(body, sort_keys=True)).hexdigest()
+        occurrence = self._seen.pop(digest, 0)
+        self._seen[digest] = occurrence + 1
+        if len(self._seen) > self.max_bodies:
+            self._seen.popitem(last=False)
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def reset(self):
+        """Forget what was served, as if the stub had just started."""
+        self.stats.clear()
+        self._seen.clear()
+
+    def draw_error(self, rng):
+        roll = rng.random()
+        for kind, rate in self.error_rates.items():
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def reply_for(self, messages):
+        question = next((m.get('content') or '' for m in reversed(messages) if m.get('role') == 'user'), '')
+        for pattern, reply in self.replies:
+            if pattern.search(question):
+                return reply
+        return DEFAULT_REPLY.format(question=' '.join(question.split())[:80])
+
+    def completion_text(self, messages, max_tokens=None):
+        """Reply text, cut to ``max_tokens``, and the finish reason."""
+        text = self.reply_for(messages)
+        if max_tokens is None or estimate_tokens(text) <= max_tokens:
+            return text, 'stop'
+        words = text.split(' ')
+        kept = 0
+        while kept < len(words) and estimate_tokens(' '.join(words[:kept + 1])) <= max_tokens:
+            kept += 1
+        return ' '.join(words[:kept]), 'length'
+
+
+def invalid_request(message):
+    return web.json_response({'error': {'message': message, 'type': 'invalid_request_error', 'code': None}},
+                             status=400, dumps=jsoncodec.dumps)
+
+
+def forced_latency(headers):
+    """Seconds from the X-Stub-Latency header, None if absent; raises ValueError if malformed."""
+    value = headers.get('X-Stub-Latency')
+    if value is None:
+        return None
+    seconds = float(value)
+    if not math.isfinite(seconds) or seconds < 0:
+        raise ValueError(value)
+    return seconds
+
+
+def error_response(kind):
+    status, error = ERROR_RESPONSES[kind]
+    headers = {'Retry-After': '1'} if kind == 'rate_limit' else None
+    return web.json_response({'error': error}, status=status, headers=headers, dumps=jsoncodec.dumps)
+
+
+async def chat_completions(request):
+    provider = request.app['provider']
+    try:
+        body = await request.json(loads=jsoncodec.loads)
+    except ValueError:
+        body = None
+    if not isinstance(body, dict) or not isinstance(body.get('messages'), list):
+        return invalid_request("'messages' is required")
+    try:
+        forced = forced_latency(request.headers)
+    except ValueError:
+        return invalid_request('X-Stub-Latency must be a non-negative number of seconds')
+    rng = provider.rng_for(body)
+    latency = provider.sample_latency(rng)
+    kind = provider.draw_error(rng)
+    if forced is not None:
+        latency = forced
+    if request.headers.get('X-Stub-Error') in ERROR_KINDS:
+        kind = request.headers['X-Stub-Error']
+    provider.stats['requests'] += 1
+    provider.stats[f"error_{kind}" if kind else 'ok'] += 1
+
+    if kind == 'timeout':
+        # Hold the request open; the client's own timeout ends it
+        await asyncio.sleep(provider.hang)
+        return web.json_response({'error': {'message': 'Request timed out.', 'type': 'timeout',
+                                            'code': None}}, status=408, dumps=jsoncodec.dumps)
+    await asyncio.sleep(latency)
+    if kind:
+        return error_response(kind)
+
+    model = body.get('model') or 'stub'
+    text, finish_reason = provider.completion_text(body['messages'], body.get('max_tokens'))
+    completion_id = f"chatcmpl-stub-{rng.getrandbits(48):012x}"
+    created = int(time.time())
+    if body.get('stream'):
+        provider.stats['streams'] += 1
+        return await stream_completion(request, provider, completion_id, created, model, text, finish_reason)
+
+    prompt_tokens = sum(estimate_tokens(m.get('content') or '') for m in body['messages'])
+    completion_tokens = estimate_tokens(text)
+    return web.json_response({
+        'id': completion_id,
+        'object': 'chat.completion',
+        'created': created,
+        'model': model,
+        'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                     'finish_reason': finish_reason}],
+        'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                  'total_tokens': prompt_tokens + completion_tokens}
+    }, dumps=jsoncodec.dumps)
+
+
+async def stream_completion(request, provider, completion_id, created, model, text, finish_reason):
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+    await response.prepare(request)
+
+    async def send(delta, reason=None):
+        chunk = {'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                 'choices': [{'index': 0, 'delta': delta, 'finish_reason': reason}]}
+        await response.write(b'data: ' + jsoncodec.dumps_bytes(chunk) + b'\n\n')
+
+    await send({'role': 'assistant'})
+    for piece in re.findall(r'\S+\s*|\s+', text):
+        await send({'content': piece})
+        if provider.token_delay:
+            await asyncio.sleep(provider.token_delay)
+    await send({}, finish_reason)
+    await response.write(b'data: [DONE]\n\n')
+    await response.write_eof()
+    return response
+
+
+async def stats(request):
+    return web.json_response(dict(request.app['provider'].stats), dumps=jsoncodec.dumps)
+
+
+async def reset_stats(request):
+    provider = request.app['provider']
+    served = dict(provider.stats)
+    provider.reset()
+    return web.json_response(served, dumps=jsoncodec.dumps)
+
+
+def make_app(provider):
+    web_app = web.Application()
+    web_app['provider'] = provider
+    web_app.router.add_post('/v1/chat/completions', chat_completions)
+    web_app.router.add_get('/stats', stats)
+    web_app.router.add_delete('/stats', reset_stats)
+    return web_app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a local OpenAI-compatible chat completions stub.')
+    parser.add_argument('--host', default=Config.LLM_STUB_HOST)
+    parser.add_argument('--port', type=int, default=Config.LLM_STUB_PORT)
+    parser.add_argument('--latency', default=Config.LLM_STUB_LATENCY,
+                        help="seconds, or fixed:S, uniform:LOW,HIGH, normal:MEAN,SIGMA, "
+                             "lognormal:MU,SIGMA, exponential:MEAN")
+    parser.add_argument('--errors', default=Config.LLM_STUB_ERRORS,
+                        help='injected error rates, e.g. quota=0.01,rate_limit=0.05,timeout=0.01,server=0.01')
+    parser.add_argument('--seed', type=int, default=Config.LLM_STUB_SEED)
+    parser.add_argument('--replies', default=Config.LLM_STUB_REPLIES,
+                        help='JSON file mapping regular expressions to canned replies')
+    parser.add_argument('--token-delay', type=float, default=Config.LLM_STUB_TOKEN_DELAY,
+                        help='seconds between streamed chunks')
+    parser.add_argument('--hang', type=float, default=30.0,
+                        help='seconds an injected timeout holds the request open')
+    args = parser.parse_args(argv)
+    try:
+        provider = StubProvider(args.latency, args.errors, args.seed, load_replies(args.replies),
+                                args.token_delay, args.hang)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    web.run_app(make_app(provider), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Token budgeting for the chat completions prompt.
+
+The prompt is assembled from parts of different value: the fixed core
+instructions and the question must always be sent, while fact lines, past
+conversation turns and the longer guidance blocks are dropped, least
+important first, once they stop fitting a shared token budget. Counts are
+estimated locally so no tokenizer is needed.
+"""
+
+import math
+
+# Chat formatting overhead per message (role markers and separators)
+MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text):
+    """Approximate token count of ``text``.
+
+    English text averages about four characters per token; Devanagari and
+    Gujarati script is closer to one token per character, so non-ASCII
+    characters are counted individually.
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def message_tokens(content):
+    """Estimated tokens of one chat message with ``content``."""
+    return estimate_tokens(content) + MESSAGE_OVERHEAD
+
+
+def take_within(costs, budget):
+    """Number of leading items whose ``costs`` add up to at most ``budget``."""
+    spent = 0
+    for count, cost in enumerate(costs):
+        if spent + cost > budget:
+            return count, spent
+        spent += cost
+    return len(costs), spent
+
+
+def fit_prompt(budget, required, facts, turns, extras=(), facts_share=0.5):
+    """Decide which optional prompt parts fit in ``budget`` tokens.
+
+    ``required`` is the token count that is always sent. ``facts`` and
+    ``extras`` are token counts in priority order; ``turns`` are the token
+    counts of past exchanges, oldest first. Facts may take ``facts_share`` of
+    what is left, recent turns the rest, and any remainder goes to the extra
+    instruction blocks.
+
+    Returns ``(n_facts, n_turns, n_extras, tokens)``: how many leading facts
+    and extras and how many trailing turns to keep, and the estimated total.
+    """
+    remaining = max(budget - required, 0)
+    n_facts, spent = take_within(facts, int(remaining * facts_share))
+    used = spent
+    n_turns, spent = take_within(turns[::-1], remaining - used)
+    used += spent
+    if n_turns == len(turns):
+        # History did not need its share: let the facts have the rest
+        more, spent = take_within(facts[n_facts:], remaining - used)
+        n_facts += more
+        used += spent
+    n_extras, spent = take_within(extras, remaining - used)
+    used += spent
+    return n_facts, n_turns, n_extras, required + used
@@ -0,0 +1,405 @@
+"""
+Versioned binary snapshot of a user's complete financial data.
+
+A snapshot file holds the transaction list and investment holdings as
+fixed-width little-endian columns, every string they reference in one
+interned string table, and the remaining (small) categories as a JSON
+section. Snapshots the app builds from its Transaction table have no
+transaction list, only the summary, monthly rollups and newest rows
+('recent_transactions') of it, which go to the JSON section; their files
+have no TXN_ section and load without ``transaction_columns``. Readers
+memory-map large files (small ones are simply read) and wrap the columns
+in memoryviews, so opening a snapshot copies nothing more and allocates
+no per-transaction objects; individual records are decoded only when
+they are indexed.
+
+Layout (all integers little-endian)::
+
+    header     magic b'FASNAP', format version (u16), section count (u16), reserved (u32)
+    directory  per section: tag (4s), offset (u64), length (u64), item count (u32), reserved (u32)
+    sections   8-byte aligned; tags STRS, TXN_, STK_, MUF_ and JSON
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Sequence
+from datetime import date
+
+import jsoncodec
+from txn_engine import TransactionColumns
+
+MAGIC = b'FASNAP'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<6sHHI')
+_SECTION = struct.Struct('<4sQQII')
+_TXN_HEADER = struct.Struct('<HHI')
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+# Holding lists stored as columns: (data key, list key, section tag, fields).
+# Field kinds are 's' for interned strings and 'd' for float64 numbers.
+HOLDINGS = (
+    ('investments', 'stocks', b'STK_', (
+        ('symbol', 's'), ('shares', 'd'), ('current_price', 'd'), ('total_value', 'd'),
+        ('purchase_price', 'd'), ('gain_loss', 'd'))),
+    ('investments', 'mutual_funds', b'MUF_', (
+        ('name', 's'), ('units', 'd'), ('nav', 'd'), ('total_value', 'd'), ('category', 's'))),
+)
+
+TRANSACTION_FIELDS = ('date', 'type', 'amount', 'description', 'category')
+
+# Keys of a loaded snapshot that are rebuilt from columns, never stored as JSON
+COLUMN_KEYS = ('transactions', 'transaction_columns')
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a snapshot file is truncated, corrupt or of another version."""
+
+
+def _number(value):
+    return int(value) if value.is_integer() else value
+
+
+def _pad(length):
+    return -length % 8
+
+
+class _StringTable:
+    """Interns strings while writing; decodes them lazily while reading."""
+
+    def __init__(self, offsets=None, blob=None):
+        self._ids = {}
+        self._strings = []
+        self._offsets = offsets
+        self._blob = blob
+        self._decoded = [None] * (len(offsets) - 1) if offsets is not None else None
+
+    def intern(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    def __len__(self):
+        return len(self._strings)
+
+    def encode(self):
+        offsets = array('I', [0])
+        blob = bytearray()
+        for value in self._strings:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+        return _le_bytes(offsets) + bytes(blob)
+
+    def __getitem__(self, string_id):
+        value = self._decoded[string_id]
+        if value is None:
+            start, end = self._offsets[string_id], self._offsets[string_id + 1]
+            value = self._decoded[string_id] = str(self._blob[start:end], 'utf-8')
+        return value
+
+
+def _le_bytes(values):
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _column(buffer, offset, typecode, count):
+    """A typed, zero-copy view of ``count`` little-endian items at ``offset``."""
+    size = array(typecode).itemsize
+    view = buffer[offset:offset + size * count]
+    if len(view) != size * count:
+        raise SnapshotFormatError("Snapshot column runs past the end of the file")
+    if _LITTLE_ENDIAN:
+        return view.cast(typecode)
+    values = array(typecode, view.tobytes())
+    values.byteswap()
+    return values
+
+
+class RecordView(Sequence):
+    """Read-only sequence of dicts decoded on access from snapshot columns."""
+
+    def __init__(self, length, fields):
+        self._length = length
+        self._fields = fields  # (name, decode(index)) pairs
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('record index out of range')
+        return {name: decode(index) for name, decode in self._fields}
+
+
+# Writing
+
+def _columnar_transactions(transactions):
+    if not isinstance(transactions, list) or len(transactions) >= 2 ** 32:
+        return False
+    for t in transactions:
+        if not isinstance(t, dict) or set(t) != set(TRANSACTION_FIELDS):
+            return False
+        if not (isinstance(t['date'], str) and isinstance(t['type'], str)
+                and isinstance(t['description'], str) and isinstance(t['category'], str)
+                and isinstance(t['amount'], (int, float))):
+            return False
+        try:
+            if date.fromisoformat(t['date']).isoformat() != t['date']:
+                return False
+        except ValueError:
+            return False
+    return True
+
+
+def _columnar_holdings(records, fields):
+    if not isinstance(records, list):
+        return False
+    names = {name for name, _ in fields}
+    for record in records:
+        if not isinstance(record, dict) or set(record) != names:
+            return False
+        for name, kind in fields:
+            value = record[name]
+            if kind == 's' and not isinstance(value, str):
+                return False
+            if kind == 'd' and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                return False
+    return True
+
+
+def _encode_transactions(transactions, strings):
+    type_codes, category_codes = {}, {}
+    amounts, dates = array('d'), array('i')
+    types, categories, descriptions = array('B'), array('H'), array('I')
+    for t in transactions:
+        type_code = type_codes.setdefault(t['type'], len(type_codes))
+        category_code = category_codes.setdefault(t['category'], len(category_codes))
+        if type_code > 0xFF or category_code > 0xFFFF:
+            return None
+        amounts.append(t['amount'])
+        dates.append(date.fromisoformat(t['date']).toordinal())
+        types.append(type_code)
+        categories.append(category_code)
+        descriptions.append(strings.intern(t['description']))
+    names = array('I', [strings.intern(n) for n in type_codes] + [strings.intern(n) for n in category_codes])
+    parts = [_TXN_HEADER.pack(len(type_codes), len(category_codes), 0), _le_bytes(names)]
+    for column in (amounts, dates, types, categories, descriptions):
+        parts.append(b'\0' * _pad(sum(map(len, parts))))
+        parts.append(_le_bytes(column))
+    return b''.join(parts)
+
+
+def _encode_holdings(records, fields, strings):
+    parts = []
+    for name, kind in fields:
+        if kind == 's':
+            column = array('I', [strings.intern(r[name]) for r in records])
+        else:
+            column = array('d', [r[name] for r in records])
+        parts.append(b'\0' * _pad(sum(map(len, parts))))
+        parts.append(_le_bytes(column))
+    return b''.join(parts)
+
+
+def dumps(financial_data):
+    """Encode a financial snapshot dict (as built by the app) to bytes."""
+    strings = _StringTable()
+    remaining = {k: v for k, v in financial_data.items() if k not in COLUMN_KEYS}
+    sections = []
+
+    transactions = financial_data.get('transactions')
+    if transactions is not None:
+        encoded = _encode_transactions(transactions, strings) if _columnar_transactions(transactions) else None
+        if encoded is None:
+            remaining['transactions'] = transactions
+        else:
+            sections.append((b'TXN_', encoded, len(transactions)))
+
+    for data_key, list_key, tag, fields in HOLDINGS:
+        container = remaining.get(data_key)
+        if isinstance(container, dict) and _columnar_holdings(container.get(list_key), fields):
+            records = container[list_key]
+            sections.append((tag, _encode_holdings(records, fields, strings), len(records)))
+            remaining[data_key] = {k: v for k, v in container.items() if k != list_key}
+
+    sections.insert(0, (b'STRS', strings.encode(), len(strings)))
+    sections.append((b'JSON', jsoncodec.dumps_bytes(remaining), 0))
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory, body = [], []
+    for tag, payload, count in sections:
+        padding = _pad(offset)
+        body.append(b'\0' * padding)
+        offset += padding
+        directory.append(_SECTION.pack(tag, offset, len(payload), count, 0))
+        body.append(payload)
+        offset += len(payload)
+    return b''.join([_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), 0)] + directory + body)
+
+
+def write(path, financial_data):
+    """Atomically write a snapshot file; readers never see a partial file."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps(financial_data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def prune(directory, prefix, keep, stale_after=300):
+    """Remove snapshot files named ``prefix*`` other than ``keep``.
+
+    Temporary files are removed once they are ``stale_after`` seconds old,
+    as younger ones may still be written by another process. Files that
+    cannot be removed yet (on Windows, while another process has them
+    mapped) are left for the next call; returns how many were left.
+    """
+    now = time.time()
+    left = 0
+    for entry in os.scandir(directory):
+        name = entry.name
+        if not name.startswith(prefix) or name == keep:
+            continue
+        try:
+            if name.endswith('.tmp'):
+                if now - entry.stat().st_mtime < stale_after:
+                    continue
+            elif not name.endswith('.snap'):
+                continue
+            os.unlink(entry.path)
+        except FileNotFoundError:
+            pass  # already removed by another process
+        except OSError:
+            left += 1
+    return left
+
+
+# Reading
+
+def _decode_transactions(buffer, offset, count, strings):
+    n_types, n_categories, _ = _TXN_HEADER.unpack_from(buffer, offset)
+    position = offset + _TXN_HEADER.size
+    names = _column(buffer, position, 'I', n_types + n_categories)
+    type_names = [strings[i] for i in names[:n_types]]
+    category_names = [strings[i] for i in names[n_types:]]
+    position += 4 * (n_types + n_categories)
+    columns = {}
+    for name, typecode in (('amounts', 'd'), ('dates', 'i'), ('types', 'B'),
+                           ('categories', 'H'), ('descriptions', 'I')):
+        position += _pad(position - offset)
+        columns[name] = _column(buffer, position, typecode, count)
+        position += array(typecode).itemsize * count
+
+    amounts, dates, types = columns['amounts'], columns['dates'], columns['types']
+    categories, descriptions = columns['categories'], columns['descriptions']
+    view = RecordView(count, (
+        ('date', lambda i: date.fromordinal(dates[i]).isoformat()),
+        ('type', lambda i: type_names[types[i]]),
+        ('amount', lambda i: _number(amounts[i])),
+        ('description', lambda i: strings[descriptions[i]]),
+        ('category', lambda i: category_names[categories[i]]),
+    ))
+    table = TransactionColumns.from_buffers(amounts, dates, types, categories, type_names, category_names)
+    return view, table
+
+
+def _decode_holdings(buffer, offset, count, fields, strings):
+    decoders = []
+    position = offset
+    for name, kind in fields:
+        typecode = 'I' if kind == 's' else 'd'
+        position += _pad(position - offset)
+        column = _column(buffer, position, typecode, count)
+        position += array(typecode).itemsize * count
+        if kind == 's':
+            decoders.append((name, lambda i, c=column: strings[c[i]]))
+        else:
+            decoders.append((name, lambda i, c=column: _number(c[i])))
+    return RecordView(count, decoders)
+
+
+def loads(buffer):
+    """Open a snapshot from any buffer (bytes, mmap) without copying columns.
+
+    Returns the same dict shape the app builds from the database, with
+    holdings and any transaction list as lazily decoded RecordViews and
+    ``transaction_columns`` wrapping the file's transaction columns
+    directly; without a TXN_ section there are neither.
+    """
+    buffer = memoryview(buffer)
+    try:
+        magic, version, n_sections, _ = _HEADER.unpack_from(buffer, 0)
+    except struct.error:
+        raise SnapshotFormatError("Snapshot header is truncated")
+    if magic != MAGIC:
+        raise SnapshotFormatError("Not a financial snapshot file")
+    if version != FORMAT_VERSION:
+        raise SnapshotFormatError(f"Unsupported snapshot format version {version}")
+    try:
+        sections = {}
+        for i in range(n_sections):
+            tag, offset, length, count, _ = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(buffer):
+                raise SnapshotFormatError(f"Snapshot section {tag!r} runs past the end of the file")
+            sections[tag] = (offset, length, count)
+    except struct.error:
+        raise SnapshotFormatError("Snapshot directory is truncated")
+    if b'STRS' not in sections or b'JSON' not in sections:
+        raise SnapshotFormatError("Snapshot is missing required sections")
+
+    offset, _, count = sections[b'STRS']
+    offsets = _column(buffer, offset, 'I', count + 1)
+    blob_start = offset + 4 * (count + 1)
+    strings = _StringTable(offsets, buffer[blob_start:blob_start + offsets[count]])
+
+    offset, length, _ = sections[b'JSON']
+    data = jsoncodec.loads(buffer[offset:offset + length].tobytes())
+
+    if b'TXN_' in sections:
+        offset, _, count = sections[b'TXN_']
+        data['transactions'], data['transaction_columns'] = _decode_transactions(buffer, offset, count, strings)
+
+    for data_key, list_key, tag, fields in HOLDINGS:
+        if tag in sections:
+            offset, _, count = sections[tag]
+            data.setdefault(data_key, {})[list_key] = _decode_holdings(buffer, offset, count, fields, strings)
+    return data
+
+
+def load(path, map_threshold=0):
+    """Open a snapshot file with :func:`loads`.
+
+    Files of at least ``map_threshold`` bytes are memory-mapped read-only;
+    the mapping (and the descriptor it holds) stays alive for as long as any
+    returned view references it. Smaller files are read into memory.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            raise SnapshotFormatError("Snapshot file is empty")
+        if size < map_threshold:
+            return loads(f.read())
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return loads(mapped)
@@ -5,6 +5,7 @@ Test script to verify the AI Finance Assistant application structure
 
 import sys
 import os
+import time
 
 def test_imports():
     """Test if all required modules can be imported"""
@@ -56,6 +57,440 @@ def test_app_creation():
         print(f"✗ Error creating Flask app: {e}")
         return False
 
+def test_snapshot_cache():
+    """Test that cached snapshots are reused until the data version changes"""
+    from caching import SnapshotCache
+    cache = SnapshotCache(maxsize=2)
+    loads = []
+    def loader():
+        loads.append(1)
+        return {'assets': {'cash': len(loads)}}
+    first = cache.get_or_load(1, (1, 1), loader)
+    again = cache.get_or_load(1, (1, 1), loader)
+    changed = cache.get_or_load(1, (2, 2), loader)
+    assert first is again and len(loads) == 2
+    assert changed['assets']['cash'] == 2
+    cache.invalidate(1)
+    cache.get_or_load(1, (2, 2), loader)
+    assert len(loads) == 3
+    print("✓ Snapshot cache reuses and invalidates entries correctly")
+
+def test_response_cache_ttl():
+    """Test that cached responses expire after their TTL"""
+    import time
+    from caching import LRUCache
+    cache = LRUCache(maxsize=2, ttl=0.05)
+    cache.set(('net worth', 'en', 'v1', ''), 'Your net worth is $1')
+    assert cache.get(('net worth', 'en', 'v1', '')) == 'Your net worth is $1'
+    time.sleep(0.06)
+    assert cache.get(('net worth', 'en', 'v1', '')) is None
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['expired'] == 1
+    print("✓ Response cache expires entries correctly")
+
+def test_llm_error_classification():
+    """Test that provider errors are classified and backoff stays bounded"""
+    from llm_client import LLMClient, classify_response
+    rate_limited = classify_response(429, {'error': {'code': 'rate_limit_exceeded'}}, retry_after=2)
+    out_of_quota = classify_response(429, {'error': {'code': 'insufficient_quota'}})
+    assert rate_limited.kind == 'rate_limit' and rate_limited.retryable
+    assert out_of_quota.kind == 'quota' and not out_of_quota.retryable
+    assert classify_response(503, None).retryable
+    assert not classify_response(401, {}).retryable
+    client = LLMClient('key', backoff_base=0.5, backoff_max=2.0)
+    assert all(0 <= client.backoff(attempt) <= 2.0 for attempt in range(10))
+    assert client.backoff(0, retry_after=30) == 2.0
+    print("✓ LLM client classifies errors and bounds backoff correctly")
+
+def test_circuit_breaker():
+    """Test that the circuit breaker opens, rejects and recovers through a probe"""
+    from llm_client import CircuitBreaker, LLMError
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.record_failure(LLMError('bad request', 'bad_request', False))
+    breaker.record_failure(LLMError('slow', 'timeout', True))
+    assert breaker.state == 'closed' and breaker.allow()
+    breaker.record_failure(LLMError('no quota', 'quota', False))
+    assert breaker.state == 'open' and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == 'half_open'
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.stats()['trips'] == 1
+    print("✓ Circuit breaker opens and recovers correctly")
+
+def test_prompt_budget():
+    """Test that optional prompt parts are dropped to stay within the token budget"""
+    from prompt_builder import estimate_tokens, fit_prompt
+    assert estimate_tokens('abcdefgh') == 2 and estimate_tokens('नमस्ते') == 6
+    # Facts get half of the 100 spare tokens, the newest turns the rest
+    assert fit_prompt(200, 100, [20, 20, 20], [30, 30, 30], [10]) == (2, 2, 0, 200)
+    assert fit_prompt(200, 100, [20, 20, 20], [60, 30], [10]) == (2, 1, 1, 180)
+    # Without history the facts may use the whole budget
+    assert fit_prompt(200, 100, [20, 20, 20], [], [50]) == (3, 0, 0, 160)
+    assert fit_prompt(50, 100, [5], [5], [5]) == (0, 0, 0, 100)
+    print("✓ Prompt budget is enforced correctly")
+
+def test_single_flight():
+    """Test that concurrent identical calls share one execution"""
+    import threading
+    from caching import SingleFlight
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return 'answer'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('q', compute)))
+    leader.start()
+    started.wait(2)
+    followers = [threading.Thread(target=lambda: results.append(flights.do('q', compute))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while flights.stats()['shared'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+    assert len(calls) == 1 and results == ['answer'] * 4
+    assert flights.stats() == {'in_flight': 0, 'executed': 1, 'shared': 3}
+
+    from caching import StreamFlights
+    streams = StreamFlights()
+    def produce():
+        calls.append(1)
+        yield 'a'
+        yield 'b'
+        return 'ab'
+    first = streams.stream('q', produce, 'tag')
+    assert next(first) == 'a'
+    late = streams.stream('q', produce, 'tag')
+    assert next(late) == 'a'  # replayed to a follower arriving mid-stream
+    first.close()  # the producer's client leaves; the answer is still finished
+    assert list(late) == ['b'] and len(calls) == 2
+    assert streams.stats() == {'in_flight': 0, 'executed': 1, 'shared': 1}
+    print("✓ Single-flight coalescing works correctly")
+
+def test_incremental_summary():
+    """Test that summaries only send the turns added since the last one"""
+    from app import SUMMARY_MAX_TURNS, plan_summary, running_summary_state
+    history = [{'user': f'q{i}', 'assistant': f'a{i}', 'timestamp': f'2024-01-01T00:00:{i:02d}'} for i in range(4)]
+    first, last_turn = plan_summary(history[:3], 'en', None)
+    assert 'q0' in first[1]['content'] and 'q2' in first[1]['content'] and last_turn is history[2]
+    running = running_summary_state('summary so far', last_turn, 'en')
+    assert plan_summary(history[:3], 'en', running) is None
+    update = plan_summary(history, 'en', running)[0][1]['content']
+    assert 'summary so far' in update and 'q3' in update and 'q2' not in update
+    # A long backlog is folded in batches; the watermark only passes turns sent
+    long_history = [dict(turn, user=f'q{i}', timestamp=f'2024-01-01T00:01:{i:02d}')
+                    for i, turn in enumerate(history * 8)]
+    messages, last_turn = plan_summary(long_history, 'en', running)
+    assert last_turn is long_history[SUMMARY_MAX_TURNS - 1]
+    running = running_summary_state('batch one', last_turn, 'en', running)
+    assert f'q{SUMMARY_MAX_TURNS}' in plan_summary(long_history, 'en', running)[0][1]['content']
+    print("✓ Incremental summaries fold in only new turns")
+
+def test_llm_stub():
+    """Test that the model stub's latency, errors and replies are reproducible"""
+    import random
+    from llm_stub import StubProvider, forced_latency, parse_errors, parse_latency
+    assert parse_latency('0.25')(random.Random(0)) == 0.25
+    assert 1 <= parse_latency('uniform:1,2')(random.Random(0)) <= 2
+    assert parse_errors('quota=0.1, timeout=0.2') == {'quota': 0.1, 'timeout': 0.2}
+    for spec, parse in (('gamma:1', parse_latency), ('boom=0.1', parse_errors)):
+        try:
+            parse(spec)
+            raise AssertionError(f"{spec} accepted")
+        except ValueError:
+            pass
+    body = {'messages': [{'role': 'user', 'content': 'hello'}]}
+
+    def run():
+        provider = StubProvider('lognormal:-1,0.5', 'rate_limit=0.5', seed=7)
+        draws = []
+        for _ in range(20):
+            rng = provider.rng_for(body)
+            draws.append((provider.sample_latency(rng), provider.draw_error(rng)))
+        return draws
+    assert run() == run()
+    assert forced_latency({'X-Stub-Latency': '1.5'}) == 1.5 and forced_latency({}) is None
+    for value in ('abc', 'nan', '-1'):
+        try:
+            forced_latency({'X-Stub-Latency': value})
+            raise AssertionError(f"latency {value} accepted")
+        except ValueError:
+            pass
+    provider = StubProvider(max_bodies=2)
+    first = provider.rng_for(body).random()
+    for i in range(3):
+        provider.rng_for({'messages': [{'role': 'user', 'content': str(i)}]})
+    assert len(provider._seen) == 2
+    provider.stats['requests'] += 1
+    provider.reset()
+    assert not provider.stats and provider.rng_for(body).random() == first
+    text, reason = StubProvider().completion_text(body['messages'], max_tokens=5)
+    assert reason == 'length' and len(text) < 40
+    print("✓ Model stub is configurable and deterministic")
+
+def test_intent_matcher():
+    """Test single-pass multilingual intent matching with word boundaries"""
+    from intent_engine import IntentMatcher
+    matcher = IntentMatcher({
+        'assets': {'en': ['asset', 'bank'], 'hi': ['संपत्ति']},
+        'liabilities': {'en': ['liabilit', 'loan']},
+        'total': {'en': ['total'], 'hi': ['कुल']}
+    })
+    assert matcher.intents('Total assets and liabilities?') == {'assets', 'liabilities', 'total'}
+    assert matcher.intents('कुल संपत्ति') == {'assets', 'total'}
+    assert matcher.intents('कुल संपत्ति', langs=('en',)) == frozenset()
+    assert matcher.intents('embankment') == frozenset()
+    assert [(m.intent, m.start) for m in matcher.scan('bank loan')] == [('assets', 0), ('liabilities', 5)]
+    from app import INTENT_MATCHER
+    assert 'net_worth' in INTENT_MATCHER.intents('my networth')
+    assert 'expense' in INTENT_MATCHER.intents('my overspending this month')
+    assert 'payoff' in INTENT_MATCHER.intents('emi prepayment options')
+    assert 'payoff' in INTENT_MATCHER.intents('loan repayment plan')
+    print("✓ Intent matcher classifies queries correctly")
+
+def test_fallback_templates():
+    """Test the precompiled answer template catalog"""
+    from fallback_templates import TEMPLATES, render, template
+    assert template('general', 'fr') == TEMPLATES[('general', 'en')]
+    assert template('budget.plan', 'hi') == TEMPLATES[('budget.plan', 'en')]
+    assert template('advice.assets', 'gu') != template('advice.assets', 'en')
+    plan = render('vacation.budget', 'en', monthly_income=5000, monthly_expenses=3500, monthly_surplus=1500,
+                  safe_budget=500.0, comfortable_budget=1000.0, luxury_budget=1500.0)
+    assert '$5,000' in plan and '{' not in plan
+    print("✓ Answer templates render correctly")
+
+def test_translation_catalogs():
+    """Test lazy loading and fallback of translation catalogs"""
+    import json
+    import tempfile
+    from i18n import Catalogs
+    with tempfile.TemporaryDirectory() as directory:
+        for lang, data in {'en': {'ui': {'login': 'Login', 'logout': 'Logout'}, 'greetings': ['Hi!']},
+                           'hi': {'ui': {'login': 'लॉगिन'}}}.items():
+            with open(os.path.join(directory, f'{lang}.json'), 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        catalogs = Catalogs(directory, ['en', 'hi'])
+        assert catalogs.loaded() == []
+        hindi = catalogs.get('hi')
+        assert catalogs.loaded() == ['en', 'hi']
+        assert hindi.gettext('login') == 'लॉगिन' and hindi.gettext('logout') == 'Logout'
+        assert hindi.gettext('missing') == 'missing' and hindi.greetings == ('Hi!',)
+        assert catalogs.get('fr') is catalogs.get('en') and catalogs.get('hi') is hindi
+    print("✓ Translation catalogs load lazily with fallback")
+
+def test_fast_path():
+    """Test greeting and one-figure question matching of the fast path"""
+    from fast_path import GreetingMatcher, HitCounter, LookupMatcher, greeting_pattern
+    greeting = greeting_pattern(['hi', 'hello', 'नमस्ते'])
+    assert greeting.search('Hi there!') and greeting.search('नमस्ते जी')
+    assert not greeting.search('this is a test') and not greeting.search('which fund')
+    greets = GreetingMatcher({'en': ['hi', 'good morning'], 'hi': ['नमस्ते']}, {'en': ['there'], 'hi': ['जी']})
+    assert greets.match('Hi there!', ('en',)) and greets.match('नमस्ते जी', ('hi', 'en'))
+    assert greets.match('Good morning, hi', ('en',)) and not greets.match('there', ('en',))
+    assert not greets.match('Hi, how can I reduce my debt?', ('en',))
+    from app import is_greeting
+    assert is_greeting('hello, how are you?', 'en') and is_greeting('नमस्ते जी', 'hi')
+    assert not is_greeting('hi, how can i reduce my debt?', 'en')
+    matcher = LookupMatcher({'credit_score': {'en': ['credit score'], 'hi': ['क्रेडिट स्कोर']}},
+                            {'en': ['what', 'is', 'my', 's'], 'hi': ['मेरा', 'क्या', 'है']})
+    assert matcher.match("what's my credit score?", ('en',)) == 'credit_score'
+    assert matcher.match('मेरा क्रेडिट स्कोर क्या है?', ('hi', 'en')) == 'credit_score'
+    assert matcher.match('how can I improve my credit score', ('en',)) is None
+    assert matcher.match('what is my', ('en',)) is None
+    counter = HitCounter()
+    counter.hit('credit_score')
+    counter.miss()
+    assert counter.stats() == {'questions': 2, 'hits': 1, 'misses': 1, 'hit_rate': 0.5,
+                               'answered': {'credit_score': 1}}
+    print("✓ Fast path matches greetings and lookups correctly")
+
+def test_schema_upgrade():
+    """Test upgrading a financial_data table from before row versions"""
+    import tempfile
+    from sqlalchemy import create_engine, inspect, text
+    from app import upgrade_schema
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'legacy.db')}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE financial_data (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                              "data_type VARCHAR(50) NOT NULL, data TEXT NOT NULL, created_at DATETIME)"))
+            conn.execute(text("INSERT INTO financial_data (user_id, data_type, data) VALUES "
+                              "(1, 'assets', '{}'), (1, 'assets', '{\"cash\": 5}'), (1, 'budget', '{}')"))
+            conn.execute(text('CREATE TABLE "user" (id INTEGER PRIMARY KEY)'))
+            conn.execute(text('INSERT INTO "user" (id) VALUES (1), (2)'))
+        upgrade_schema(engine)
+        upgrade_schema(engine)
+        columns = {column['name'] for column in inspect(engine).get_columns('financial_data')}
+        assert {'version', 'updated_at'} <= columns
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT data_type, data, version FROM financial_data ORDER BY id")).all()
+        assert [tuple(row) for row in rows] == [('assets', '{"cash": 5}', 1), ('budget', '{}', 1)]
+        with engine.connect() as conn:
+            versions = conn.execute(text("SELECT user_id, version FROM data_version ORDER BY user_id")).all()
+        assert [tuple(row) for row in versions] == [(1, 1), (2, 1)]
+        engine.dispose()
+    print("✓ Legacy schema upgrades in place")
+
+def test_data_version():
+    """Test that every write to a user's financial data moves its version on"""
+    from app import (Transaction, User, add_transactions, app, db, get_financial_data_version,
+                     rebuild_monthly_rollups, update_transaction, upsert_financial_data)
+    with app.app_context():
+        db.create_all()
+        try:
+            user = User(username='data-version-test', email='data-version-test@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            versions = [get_financial_data_version(user.id)]
+            upsert_financial_data(user.id, {'assets': {'cash': 1}})
+            versions.append(get_financial_data_version(user.id))
+            add_transactions(user.id, [{'date': '2024-01-01', 'type': 'expense', 'amount': 5, 'category': 'food'}])
+            versions.append(get_financial_data_version(user.id))
+            update_transaction(user.id, Transaction.query.filter_by(user_id=user.id).one().id, {'amount': 7})
+            versions.append(get_financial_data_version(user.id))
+            rebuild_monthly_rollups(user.id)
+            versions.append(get_financial_data_version(user.id))
+            assert versions[0] == (0, None) and [version for version, _ in versions[1:]] == [1, 2, 3, 4]
+        finally:
+            db.session.rollback()
+    print("✓ Data version moves on with every write")
+
+def test_financial_snapshot():
+    """Test that snapshots keep the newest transactions apart from the totals over all of them"""
+    from app import User, add_transactions, app, db, load_financial_snapshot, upsert_financial_data
+    with app.app_context():
+        db.create_all()
+        limit = app.config.get('SNAPSHOT_RECENT_TRANSACTIONS')
+        app.config['SNAPSHOT_RECENT_TRANSACTIONS'] = 2
+        try:
+            user = User(username='snapshot-test', email='snapshot-test@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            add_transactions(user.id, [{'date': f'2024-01-0{day}', 'type': 'expense', 'amount': day,
+                                        'category': 'food'} for day in (1, 2, 3)])
+            snapshot = load_financial_snapshot(user.id)
+            assert 'transactions' not in snapshot
+            assert [t['date'] for t in snapshot['recent_transactions']] == ['2024-01-03', '2024-01-02']
+            assert snapshot['transaction_summary']['transaction_count'] == 3
+            # A legacy JSON list is moved into the table by the user's next write
+            legacy = User(username='legacy-test', email='legacy-test@example.com', password_hash='x')
+            db.session.add(legacy)
+            db.session.flush()
+            upsert_financial_data(legacy.id, {'transactions': [
+                {'date': '2023-12-01', 'type': 'income', 'amount': 100, 'category': 'income'}]})
+            assert load_financial_snapshot(legacy.id)['transaction_summary']['transaction_count'] == 1
+            add_transactions(legacy.id, [{'date': '2024-01-01', 'type': 'expense', 'amount': 5, 'category': 'food'}])
+            snapshot = load_financial_snapshot(legacy.id)
+            assert 'transactions' not in snapshot and snapshot['transaction_summary']['transaction_count'] == 2
+            assert list(snapshot['monthly_rollups']) == ['2023-12', '2024-01']
+        finally:
+            app.config['SNAPSHOT_RECENT_TRANSACTIONS'] = limit
+            db.session.rollback()
+    print("✓ Snapshots label their recent transactions and keep legacy ones")
+
+def test_transaction_columns():
+    """Test columnar grouping of transactions"""
+    from txn_engine import TransactionColumns
+    columns = TransactionColumns.from_transactions([
+        {"date": "2024-01-03", "type": "expense", "amount": 300, "category": "food"},
+        {"date": "2024-01-02", "type": "expense", "amount": 80, "category": "food"},
+        {"date": "2024-01-01", "type": "income", "amount": 5000, "category": "income"}
+    ])
+    groups = columns.groups()
+    assert len(columns) == 3
+    assert groups[0] == ('income', 'income', 5000.0, 1, 5000.0)
+    assert groups[1] == ('expense', 'food', 380.0, 2, 300.0)
+    print("✓ Transaction columns aggregate correctly")
+
+def test_statement_import_parsing():
+    """Test CSV statement parsing and duplicate hashing"""
+    import io
+    from importers import iter_csv_transactions
+    text = ("Date,Description,Amount\n2024-02-14,Coffee,-4.50\n2024-02-14,Coffee,-4.50\n"
+            "2024-02-15,Salary,5000\n2024-02-14,Coffee,(4.50)\n")
+    first = list(iter_csv_transactions(io.StringIO(text)))
+    again = list(iter_csv_transactions(io.StringIO(text)))
+    assert [t['type'] for t in first] == ['expense', 'expense', 'income', 'expense']
+    assert first[0]['amount'] == first[3]['amount'] == 4.5
+    assert len({t['content_hash'] for t in first}) == 4
+    assert [t['content_hash'] for t in first] == [t['content_hash'] for t in again]
+    print("✓ Statement import parses and hashes rows correctly")
+
+def test_json_codec():
+    """Test the JSON codec round-trips and keeps non-ASCII text unescaped"""
+    import jsoncodec
+    data = {'description': 'किराया', 'amount': 1200.5, 'tags': ['ભાડું']}
+    text = jsoncodec.dumps(data)
+    assert '\\u' not in text and 'किराया' in text
+    assert jsoncodec.loads(text) == data
+    assert jsoncodec.loads(jsoncodec.dumps_bytes(data)) == data
+    print(f"✓ JSON codec ({jsoncodec.BACKEND}) works correctly")
+
+def test_binary_snapshot():
+    """Test the binary snapshot format round-trips financial data"""
+    import datagen
+    import snapshot_format
+    data = datagen.generate_user_data(transactions=50, seed=7)
+    snapshot = snapshot_format.loads(snapshot_format.dumps(data))
+    assert list(snapshot['transactions']) == data['transactions']
+    assert snapshot['transactions'][-1] == data['transactions'][-1]
+    assert list(snapshot['investments']['stocks']) == data['investments']['stocks']
+    assert snapshot['assets'] == data['assets']
+    assert len(snapshot['transaction_columns']) == 50
+    summarized = {k: v for k, v in data.items() if k != 'transactions'}
+    summarized['recent_transactions'] = data['transactions'][:5]
+    snapshot = snapshot_format.loads(snapshot_format.dumps(summarized))
+    assert 'transactions' not in snapshot and 'transaction_columns' not in snapshot
+    assert snapshot['recent_transactions'] == data['transactions'][:5]
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'user-1-new.snap')
+        snapshot_format.write(path, data)
+        open(os.path.join(directory, 'user-1-old.snap'), 'wb').close()
+        read = snapshot_format.load(path, map_threshold=os.path.getsize(path) + 1)
+        mapped = snapshot_format.load(path)
+        assert list(read['transactions']) == list(mapped['transactions']) == data['transactions']
+        del mapped
+        assert snapshot_format.prune(directory, 'user-1-', 'user-1-new.snap') == 0
+        assert os.listdir(directory) == ['user-1-new.snap']
+    print("✓ Binary snapshot round-trips correctly")
+
+def test_synthetic_data():
+    """Test synthetic datasets follow the mock_data.json schema"""
+    import json
+    import datagen
+    def keys(value):
+        if isinstance(value, dict):
+            return {key: keys(item) for key, item in value.items()}
+        return keys(value[0]) if isinstance(value, list) and value else None
+    with open('mock_data.json', encoding='utf-8') as f:
+        mock = json.load(f)
+    data = datagen.generate_user_data(transactions=10, seed=3)
+    assert keys(data) == keys(mock)
+    categories = {t['category'] for t in data['transactions']}
+    assert 'income' in categories and len(categories) > 2
+    assert data['budget']['monthly_income'] == next(
+        t['amount'] for t in data['transactions'] if t['type'] == 'income')
+    print("✓ Synthetic data matches the mock data schema")
+
+def run_test(test_name, test_func):
+    """Run one test; the first ones report a bool, the others raise on failure"""
+    try:
+        return test_func() is not False
+    except Exception as e:
+        print(f"✗ {test_name} error: {e!r}")
+        return False
+
 def main():
     """Run all tests"""
     print("Testing AI Finance Assistant Application...")
@@ -64,7 +499,27 @@ def main():
     tests = [
         ("File Structure", test_file_structure),
         ("Module Imports", test_imports),
-        ("App Creation", test_app_creation)
+        ("App Creation", test_app_creation),
+        ("Snapshot Cache", test_snapshot_cache),
+        ("Response Cache", test_response_cache_ttl),
+        ("LLM Client", test_llm_error_classification),
+        ("Circuit Breaker", test_circuit_breaker),
+        ("Prompt Budget", test_prompt_budget),
+        ("Single Flight", test_single_flight),
+        ("Incremental Summary", test_incremental_summary),
+        ("Model Stub", test_llm_stub),
+        ("Intent Matcher", test_intent_matcher),
+        ("Fallback Templates", test_fallback_templates),
+        ("Translation Catalogs", test_translation_catalogs),
+        ("Fast Path", test_fast_path),
+        ("Schema Upgrade", test_schema_upgrade),
+        ("Data Version", test_data_version),
+        ("Financial Snapshot", test_financial_snapshot),
+        ("Transaction Columns", test_transaction_columns),
+        ("Statement Import", test_statement_import_parsing),
+        ("JSON Codec", test_json_codec),
+        ("Binary Snapshot", test_binary_snapshot),
+        ("Synthetic Data", test_synthetic_data)
     ]
     
     passed = 0
@@ -72,7 +527,7 @@ def main():
     
     for test_name, test_func in tests:
         print(f"\n{test_name}:")
-        if test_func():
+        if run_test(test_name, test_func):
             passed += 1
         else:
             print(f"  Test failed: {test_name}")
@@ -0,0 +1,151 @@
+"""
+Columnar in-memory representation of a user's transactions.
+
+Transactions are stored as parallel typed arrays (amount, date ordinal, type
+code, category code) with types and categories dictionary-encoded into small
+ints. Grouped sums, counts and maxima are then a single pass over the arrays,
+vectorized with NumPy when it is installed.
+"""
+
+from array import array
+from datetime import date, datetime
+
+# NumPy is optional. Without it the same aggregations run as one pure
+# Python pass over the typed arrays.
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _date_ordinal(value):
+    if isinstance(value, date):
+        return value.toordinal()
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').toordinal()
+
+
+class TransactionColumns:
+    """Array-backed, dictionary-encoded transaction table."""
+
+    __slots__ = ('amounts', 'dates', 'types', 'categories', 'type_names', 'category_names')
+
+    def __init__(self):
+        self.amounts = array('d')
+        self.dates = array('l')
+        self.types = array('B')
+        self.categories = array('H')
+        self.type_names = []
+        self.category_names = []
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from an iterable of (date, type, amount, category) tuples."""
+        columns = cls()
+        type_codes = {}
+        category_codes = {}
+        amounts_append = columns.amounts.append
+        dates_append = columns.dates.append
+        types_append = columns.types.append
+        categories_append = columns.categories.append
+        for when, ttype, amount, category in records:
+            type_code = type_codes.get(ttype)
+            if type_code is None:
+                type_code = type_codes[ttype] = len(columns.type_names)
+                columns.type_names.append(ttype)
+            category_code = category_codes.get(category)
+            if category_code is None:
+                category_code = category_codes[category] = len(columns.category_names)
+                columns.category_names.append(category)
+            amounts_append(amount or 0)
+            dates_append(_date_ordinal(when))
+            types_append(type_code)
+            categories_append(category_code)
+        return columns
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Build from transaction dicts in the mock_data.json schema."""
+        return cls.from_records(
+            (t['date'], t.get('type'), t.get('amount', 0), t.get('category'))
+            for t in transactions
+        )
+
+    @classmethod
+    def from_buffers(cls, amounts, dates, types, categories, type_names, category_names):
+        """Wrap existing typed buffers (arrays or memoryviews) without copying.
+
+        ``amounts``, ``types`` and ``categories`` must use the 'd', 'B' and
+        'H' item formats; ``dates`` may be any integer format.
+        """
+        columns = cls.__new__(cls)
+        columns.amounts = amounts
+        columns.dates = dates
+        columns.types = types
+        columns.categories = categories
+        columns.type_names = list(type_names)
+        columns.category_names = list(category_names)
+        return columns
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def groups(self):
+        """Per (type, category) totals as (type, category, total, count, max) tuples.
+
+        Groups are ordered by total, largest first.
+        """
+        n_categories = len(self.category_names)
+        n_groups = len(self.type_names) * n_categories
+        if not n_groups:
+            return []
+        if np is not None:
+            keys = (np.frombuffer(self.types, dtype=np.uint8).astype(np.intp) * n_categories
+                    + np.frombuffer(self.categories, dtype=np.uint16))
+            amounts = np.frombuffer(self.amounts, dtype=np.float64)
+            totals = np.bincount(keys, weights=amounts, minlength=n_groups).tolist()
+            counts = np.bincount(keys, minlength=n_groups).tolist()
+            maxima = np.full(n_groups, -np.inf)
+            np.maximum.at(maxima, keys, amounts)
+            maxima = maxima.tolist()
+        else:
+            totals = [0.0] * n_groups
+            counts = [0] * n_groups
+            maxima = [float('-inf')] * n_groups
+            for type_code, category_code, amount in zip(self.types, self.categories, self.amounts):
+                key = type_code * n_categories + category_code
+                totals[key] += amount
+                counts[key] += 1
+                if amount > maxima[key]:
+                    maxima[key] = amount
+        result = []
+        for key, count in enumerate(counts):
+            if count:
+                ttype = self.type_names[key // n_categories]
+                category = self.category_names[key % n_categories]
+                result.append((ttype, category, totals[key], count, maxima[key]))
+        result.sort(key=lambda group: group[2], reverse=True)
+        return result
+
+    def monthly_groups(self):
+        """Per (month, type, category) totals as (month, type, category, total, count).
+
+        Months are 'YYYY-MM' strings; groups are ordered by month.
+        """
+        month_of_ordinal = {}
+        groups = {}
+        for ordinal, type_code, category_code, amount in zip(
+                self.dates, self.types, self.categories, self.amounts):
+            month = month_of_ordinal.get(ordinal)
+            if month is None:
+                month = month_of_ordinal[ordinal] = date.fromordinal(ordinal).strftime('%Y-%m')
+            key = (month, type_code, category_code)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [amount, 1]
+            else:
+                group[0] += amount
+                group[1] += 1
+        return [
+            (month, self.type_names[type_code], self.category_names[category_code], total, count)
+            for (month, type_code, category_code), (total, count) in sorted(groups.items())
+        ]